@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+## \file run_benchmarks.py
+#  \brief Offline benchmark of the coupling loops of SU2_preCICE_FSI.py and SU2_preCICE_CHT.py.
+#  \author Joseph Signorelli
+#
+# The run scripts are executed unchanged against the stand-in pysu2 and precice modules of the standins
+# directory, on a synthetic interface split between the ranks. Each case runs in its own process (launched with
+# mpiexec for multi-rank cases), and reports:
+#   - startup: wall time from the start of main() to the preCICE initialization (mesh extraction and setup),
+#   - per iteration: wall time of the coupling loop divided by the number of coupling iterations (max over ranks),
+#   - memory: peak resident set size of the process (max over ranks).
+#
+# The stand-in solver does no work, so the per-iteration time is the adapter overhead plus the data copies
+# that the SU2 wrapper and preCICE bindings would do.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import sys
+import os
+import csv
+import json
+import importlib
+import resource
+import subprocess
+from contextlib import redirect_stdout
+from optparse import OptionParser, SUPPRESS_HELP
+from time import perf_counter
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+STANDIN_DIR = os.path.join(BENCHMARK_DIR, "standins")
+RUN_DIR = os.path.join(os.path.dirname(BENCHMARK_DIR), "run")
+
+SCRIPTS = {"FSI": "SU2_preCICE_FSI", "CHT": "SU2_preCICE_CHT"}
+COLUMNS = ("script", "vertices", "ranks", "coupling_iterations", "startup", "iteration", "memory")
+
+# -------------------------------------------------------------------
+#  Functions
+# -------------------------------------------------------------------
+
+def run_case(options):
+    """Run one case in this process and return its results on rank 0 (None on the other ranks)."""
+
+    # The stand-ins shadow any installed pysu2/precice
+    sys.path[:0] = [STANDIN_DIR, RUN_DIR]
+    import pysu2
+    import precice
+
+    pysu2.CONFIG.update(nVertex=options.nVertex, nDim=options.nDim)
+    precice.CONFIG.update(nDim=options.nDim, nWindows=options.nWindows, nCoupling_Iter=options.nCoupling_Iter,
+                          connectivity_required=options.connectivity)
+
+    comm = None
+    if options.with_MPI == True:
+        from mpi4py import MPI
+        comm = MPI.COMM_WORLD
+
+    script = importlib.import_module(SCRIPTS[options.script])
+
+    sys.argv = [SCRIPTS[options.script] + ".py", "-f", "benchmark.cfg", "-d", str(options.nDim)]
+    if options.with_MPI == True:
+        sys.argv.append("--parallel")
+    sys.argv += options.script_args.split()
+
+    start = perf_counter()
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        script.main()
+
+    # ru_maxrss is in kB on Linux
+    stats = precice.STATS
+    result = [stats["initialized"] - start,
+              (stats["finalized"] - stats["initialized"]) / max(stats["advances"], 1),
+              resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024.0]
+    if comm is not None:
+        result = [comm.reduce(value, op=MPI.MAX, root=0) for value in result]
+        if comm.Get_rank() != 0:
+            return None
+
+    return {"script": options.script, "vertices": options.nVertex, "ranks": comm.Get_size() if comm is not None else 1,
+            "coupling_iterations": stats["advances"], "startup": result[0], "iteration": result[1], "memory": result[2]}
+
+def launch_case(options, script, nVertex, nRanks):
+    """Run one case in a new process, with mpiexec for more than one rank, and return its results."""
+    command = [sys.executable, os.path.abspath(__file__), "--case", script, "--vertices", str(nVertex),
+               "--dimension", str(options.nDim), "--windows", str(options.nWindows),
+               "--coupling-iterations", str(options.nCoupling_Iter), "--script-args", options.script_args]
+    if options.connectivity:
+        command.append("--connectivity")
+    if nRanks > 1:
+        command = options.mpiexec.split() + ["-n", str(nRanks)] + command + ["--parallel"]
+
+    completed = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if completed.returncode != 0:
+        print(completed.stderr, file=sys.stderr)
+        raise RuntimeError(script + " benchmark with " + str(nVertex) + " vertices on " + str(nRanks) + " ranks failed")
+
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def print_header():
+    """Print the header of the results table."""
+    print("{:>6} {:>10} {:>6} {:>10} {:>12} {:>14} {:>12}".format(
+        "Script", "Vertices", "Ranks", "Coupl. it.", "Startup [s]", "Iteration [s]", "Memory [MB]"))
+
+def print_result(result):
+    """Print the results of a case as a row of the table."""
+    print("{:>6} {:>10d} {:>6d} {:>10d} {:>12.4f} {:>14.6f} {:>12.1f}".format(
+        result["script"], result["vertices"], result["ranks"], result["coupling_iterations"],
+        result["startup"], result["iteration"], result["memory"] / 1.0e6), flush=True)
+
+# -------------------------------------------------------------------
+#  Main
+# -------------------------------------------------------------------
+
+def main():
+
+    # Command line options
+    parser = OptionParser()
+    parser.add_option("-s", "--scripts", dest="scripts", help="Comma-separated run scripts to benchmark: FSI, CHT", default="FSI,CHT")
+    parser.add_option("-v", "--vertices", dest="vertices", help="Comma-separated interface sizes, in vertices over all ranks", default="1000,10000,100000,1000000")
+    parser.add_option("-n", "--ranks", dest="ranks", help="Comma-separated numbers of MPI ranks", default="1")
+    parser.add_option("-d", "--dimension", dest="nDim", help="Dimension of the interface", type="int", default=3)
+    parser.add_option("-w", "--windows", dest="nWindows", help="Time windows per case", type="int", default=10)
+    parser.add_option("-i", "--coupling-iterations", dest="nCoupling_Iter", help="Implicit coupling iterations per time window (1: explicit coupling)", type="int", default=3)
+    parser.add_option("--connectivity", action="store_true", dest="connectivity", help="Register the interface connectivity with preCICE", default=False)
+    parser.add_option("--script-args", dest="script_args", help="Extra options passed to the run scripts, e.g. \"--checkpoint-storage REDUCED\"", default="")
+    parser.add_option("--mpiexec", dest="mpiexec", help="MPI launcher of the multi-rank cases", default="mpiexec")
+    parser.add_option("-o", "--output", dest="output", help="Write the results to PREFIX.csv and PREFIX.json", metavar="PREFIX", default=None)
+
+    # Single case, run by the launcher in a new process
+    parser.add_option("--case", dest="script", help=SUPPRESS_HELP, default=None)
+    parser.add_option("--parallel", action="store_true", dest="with_MPI", help=SUPPRESS_HELP, default=False)
+
+    (options, args) = parser.parse_args()
+
+    if options.script is not None:
+        options.nVertex = int(options.vertices)
+        result = run_case(options)
+        if result is not None:
+            print(json.dumps(result))
+        return
+
+    results = []
+    print_header()
+    for script in options.scripts.split(","):
+        for nVertex in [int(n) for n in options.vertices.split(",")]:
+            for nRanks in [int(n) for n in options.ranks.split(",")]:
+                results.append(launch_case(options, script.strip(), nVertex, nRanks))
+                print_result(results[-1])
+
+    if options.output is not None:
+        with open(options.output + ".csv", "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(results)
+        with open(options.output + ".json", "w") as json_file:
+            json.dump(results, json_file, indent=2)
+        print("Benchmark results written to " + options.output + ".csv and " + options.output + ".json")
+
+# -------------------------------------------------------------------
+#  Run Main Program
+# -------------------------------------------------------------------
+
+# this is only accessed if running from command prompt
+if __name__ == '__main__':
+    main()
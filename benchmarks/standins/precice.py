@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+## \file precice.py
+#  \brief Stand-in for the preCICE v2 Python bindings, to benchmark the adapter scripts offline.
+#  \author Joseph Signorelli
+#
+# Interface emulates a partner solver with a fixed number of time windows and of implicit coupling iterations
+# per window. Read data are synthetic and change slightly between coupling iterations; write data are only
+# copied. Every call made by SU2_preCICE_FSI.py and SU2_preCICE_CHT.py is provided.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+from time import perf_counter
+import numpy
+
+# Coupling of the stand-in, set by the benchmark before the interface is created
+CONFIG = {
+    "nDim": 3,
+    "nWindows": 10,
+    "window_size": 1.0e-3,
+    "nCoupling_Iter": 3,            # coupling iterations per window, 1 for explicit coupling
+    "connectivity_required": False,
+}
+
+# Events of the last interface, read by the benchmark
+STATS = {}
+
+# -------------------------------------------------------------------
+#  Actions
+# -------------------------------------------------------------------
+
+def action_write_initial_data():
+    return "write-initial-data"
+
+def action_write_iteration_checkpoint():
+    return "write-iteration-checkpoint"
+
+def action_read_iteration_checkpoint():
+    return "read-iteration-checkpoint"
+
+# -------------------------------------------------------------------
+#  Classes
+# -------------------------------------------------------------------
+
+class Interface:
+    """Coupling interface of a single mesh, with a partner that always converges in nCoupling_Iter iterations."""
+
+    def __init__(self, participant, config, rank, size, communicator=None):
+        STATS.clear()
+        STATS["created"] = perf_counter()
+        self.nDim = CONFIG["nDim"]
+        self.coords = numpy.zeros((0, self.nDim))
+        self.time_left = CONFIG["window_size"]
+        self.window = 0
+        self.iteration = 1
+        self.window_complete = False
+        self.actions = {action_write_initial_data()}
+        self.advances = 0
+
+    def get_dimensions(self):
+        return self.nDim
+
+    def get_mesh_id(self, mesh_name):
+        return 0
+
+    def get_data_id(self, data_name, mesh_id):
+        return data_name
+
+    def set_mesh_vertices(self, mesh_id, positions):
+        self.coords = numpy.asarray(positions).reshape(-1, self.nDim)
+        return numpy.arange(len(self.coords))
+
+    def is_mesh_connectivity_required(self, mesh_id):
+        return CONFIG["connectivity_required"]
+
+    def set_mesh_edge(self, mesh_id, first, second):
+        return 0
+
+    def set_mesh_triangle_with_edges(self, mesh_id, first, second, third):
+        pass
+
+    def set_mesh_quad_with_edges(self, mesh_id, first, second, third, fourth):
+        pass
+
+    def initialize(self):
+        STATS["initialized"] = perf_counter()
+        if CONFIG["nCoupling_Iter"] > 1:
+            self.actions.add(action_write_iteration_checkpoint())
+        return self.time_left
+
+    def initialize_data(self):
+        self.actions.discard(action_write_initial_data())
+
+    def is_action_required(self, action):
+        return action in self.actions
+
+    def mark_action_fulfilled(self, action):
+        self.actions.discard(action)
+
+    def is_coupling_ongoing(self):
+        return self.window < CONFIG["nWindows"]
+
+    def is_read_data_available(self):
+        return self.time_left == CONFIG["window_size"]
+
+    def is_write_data_required(self, computed_timestep_length):
+        return computed_timestep_length >= self.time_left * (1.0 - 1.0e-12)
+
+    def is_time_window_complete(self):
+        return self.window_complete
+
+    def _read(self, nValues):
+        # Converging data: the change between coupling iterations decreases by a decade per iteration
+        value = self.window + 10.0**(-self.iteration)
+        return numpy.full(nValues, value)
+
+    def read_block_vector_data(self, data_id, vertex_ids):
+        return self._read(len(vertex_ids) * self.nDim).reshape(-1, self.nDim)
+
+    def read_block_scalar_data(self, data_id, vertex_ids):
+        return self._read(len(vertex_ids))
+
+    def write_block_vector_data(self, data_id, vertex_ids, values):
+        self.written = numpy.array(values, copy=True)
+
+    def write_block_scalar_data(self, data_id, vertex_ids, values):
+        self.written = numpy.array(values, copy=True)
+
+    def advance(self, computed_timestep_length):
+        self.advances += 1
+        self.time_left -= computed_timestep_length
+        self.window_complete = False
+        if self.time_left > CONFIG["window_size"] * 1.0e-12:
+            return self.time_left
+
+        # End of the window: iterate or move on to the next window
+        self.time_left = CONFIG["window_size"]
+        if self.iteration < CONFIG["nCoupling_Iter"]:
+            self.iteration += 1
+            self.actions.add(action_read_iteration_checkpoint())
+        else:
+            self.window += 1
+            self.iteration = 1
+            self.window_complete = True
+            if CONFIG["nCoupling_Iter"] > 1:
+                self.actions.add(action_write_iteration_checkpoint())
+        return self.time_left
+
+    def finalize(self):
+        STATS["finalized"] = perf_counter()
+        STATS["advances"] = self.advances
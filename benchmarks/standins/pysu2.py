@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+
+## \file pysu2.py
+#  \brief Stand-in for the preCICE-adapted SU2 Python wrapper, to benchmark the adapter scripts offline.
+#  \author Joseph Signorelli
+#
+# CSinglezoneDriver provides every wrapper function called by SU2_preCICE_FSI.py and SU2_preCICE_CHT.py.
+# The flow solver itself does nothing, but the bulk marker functions read and write the caller-owned buffers
+# through their addresses, and the checkpoint copies a volume solution, as the C++ functions do. The adapter
+# overhead is then what remains of the coupling loop time.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import numpy
+
+# Case of the stand-in, set by the benchmark before the driver is created
+CONFIG = {
+    "nVertex": 1000,            # vertices of the interface marker, over all ranks
+    "nPoint_per_vertex": 10,    # volume points per interface vertex
+    "nVar": 5,                  # flow variables per point
+    "nDim": 3,
+    "deltaT": 1.0e-3,
+    "nInner_Iter": 10,
+}
+
+MARKER = "interface"
+
+# -------------------------------------------------------------------
+#  Functions
+# -------------------------------------------------------------------
+
+def _buffer(address, size, dtype=numpy.float64):
+    """Return a NumPy view of a caller-owned buffer, as the C++ wrapper accesses it."""
+    if size == 0:
+        return numpy.zeros(0, dtype=dtype)
+    ctype = numpy.ctypeslib.as_ctypes_type(numpy.dtype(dtype))
+    return numpy.ctypeslib.as_array((ctype * size).from_address(address))
+
+# -------------------------------------------------------------------
+#  Classes
+# -------------------------------------------------------------------
+
+class CSinglezoneDriver:
+    """Single zone driver with a synthetic interface marker, split evenly between the ranks."""
+
+    def __init__(self, filename, nZone, comm):
+        rank, size = (comm.Get_rank(), comm.Get_size()) if hasattr(comm, "Get_rank") else (0, 1)
+
+        self.nDim = CONFIG["nDim"]
+        self.nVertex = CONFIG["nVertex"] // size + (1 if rank < CONFIG["nVertex"] % size else 0)
+        self.deltaT = CONFIG["deltaT"]
+        self.nInner_Iter = CONFIG["nInner_Iter"]
+        self.TimeIter = 0
+
+        # Interface vertices on a line (2D) or a square grid (3D), shifted per rank
+        iVertex = numpy.arange(self.nVertex, dtype=numpy.float64)
+        side = max(int(numpy.sqrt(max(self.nVertex, 1))), 1)
+        self.coords = numpy.zeros((self.nVertex, self.nDim))
+        self.coords[:, 0] = (iVertex % side) / side
+        self.coords[:, 1] = (iVertex // side) / side + rank
+        self.elements = self._elements(side)
+
+        # Volume solution, boundary values and checkpoint
+        nPoint = self.nVertex * CONFIG["nPoint_per_vertex"]
+        self.solution = numpy.zeros((nPoint, CONFIG["nVar"]))
+        self.checkpoint = None
+        self.loads = numpy.ones((self.nVertex, self.nDim))
+        self.displacements = numpy.zeros((self.nVertex, self.nDim))
+        self.temperatures = numpy.full(self.nVertex, 300.0)
+        self.heat_fluxes = numpy.zeros(self.nVertex)
+
+    def _elements(self, side):
+        """Edges (2D) or quads (3D) between consecutive vertices of the grid."""
+        if self.nDim == 2:
+            first = numpy.arange(max(self.nVertex - 1, 0))
+            return numpy.stack([first, first + 1], axis=1)
+        rows = (self.nVertex // side) - 1
+        if rows <= 0 or side < 2:
+            return numpy.zeros((0, 4), dtype=int)
+        i, j = numpy.meshgrid(numpy.arange(side - 1), numpy.arange(rows), indexing="ij")
+        first = (j * side + i).ravel()
+        return numpy.stack([first, first + 1, first + side + 1, first + side], axis=1)
+
+    # Zones, markers and interface mesh
+
+    def GetnZone(self):
+        return 1
+
+    def SelectZone(self, iZone):
+        pass
+
+    def GetSelectedZone(self):
+        return 0
+
+    def GetAllBoundaryMarkers(self):
+        return {MARKER: 0} if self.nVertex > 0 else {}
+
+    def GetAllDeformMeshMarkersTag(self):
+        return [MARKER]
+
+    def GetAllCHTMarkersTag(self):
+        return [MARKER]
+
+    def GetMarkerInterfaceSizes(self, iMarker):
+        return [self.nVertex, len(self.elements), self.elements.shape[1]]
+
+    def GetMarkerInterfaceMesh(self, iMarker, vertexAddress, vertexSize, coordAddress, coordSize, elemAddress, elemSize):
+        _buffer(vertexAddress, vertexSize, numpy.dtype("L"))[:] = numpy.arange(self.nVertex)
+        _buffer(coordAddress, coordSize)[:] = self.coords.ravel()
+        _buffer(elemAddress, elemSize, numpy.dtype("l"))[:] = self.elements.ravel()
+
+    # Bulk marker data
+
+    def GetMarkerFlowLoads(self, iMarker, address, size):
+        _buffer(address, size)[:] = self.loads.ravel()
+
+    def SetMarkerMeshDisplacements(self, iMarker, address, size):
+        self.displacements.ravel()[:] = _buffer(address, size)
+
+    def GetMarkerDisplacementChange(self, iMarker, address, size):
+        change = numpy.abs(_buffer(address, size) - self.displacements.ravel())
+        return float(change.max()) if size > 0 else 0.0
+
+    def GetMarkerTemperatures(self, iMarker, address, size):
+        _buffer(address, size)[:] = self.temperatures
+
+    def SetMarkerTemperatures(self, iMarker, address, size):
+        self.temperatures[:] = _buffer(address, size)
+
+    def GetMarkerNormalHeatFluxes(self, iMarker, address, size):
+        _buffer(address, size)[:] = self.heat_fluxes
+
+    def SetMarkerNormalHeatFluxes(self, iMarker, address, size):
+        self.heat_fluxes[:] = _buffer(address, size)
+
+    def GetMarkerRobinCoefficients(self, iMarker, address, size):
+        robin = _buffer(address, size).reshape(-1, 2)
+        robin[:, 0] = 100.0
+        robin[:, 1] = self.temperatures
+
+    def SetMarkerRobinConditions(self, iMarker, address, size):
+        robin = _buffer(address, size).reshape(-1, 2)
+        self.temperatures[:] = (100.0 * self.temperatures + robin[:, 0] * robin[:, 1]) / (100.0 + robin[:, 0])
+
+    def UpdateMarkerBoundaryConditions(self, iMarker):
+        return True
+
+    # Checkpoint
+
+    def SetCheckpointStorage(self, storage, scratchDir="."):
+        self.checkpoint = None
+
+    def SaveOldState(self):
+        if self.checkpoint is None:
+            self.checkpoint = numpy.empty_like(self.solution)
+        self.checkpoint[:] = self.solution
+
+    def ReloadOldState(self, warmStart=False):
+        if not warmStart:
+            self.solution[:] = self.checkpoint
+
+    def PredictSolution(self, c_n, c_n1, c_n2, keepHistory):
+        self.solution *= c_n + c_n1 + c_n2
+
+    def ReleaseOldState(self):
+        self.checkpoint = None
+
+    def GetCheckpointBytes(self):
+        return self.checkpoint.nbytes if self.checkpoint is not None else 0
+
+    def WriteCheckpointSnapshot(self, fileName, timeIter):
+        with open(fileName, "wb") as snapshot:
+            numpy.array([timeIter], dtype=numpy.uint64).tofile(snapshot)
+            self.checkpoint.tofile(snapshot)
+
+    def LoadCheckpointSnapshot(self, fileName):
+        snapshot = numpy.memmap(fileName, dtype=numpy.float64, mode="r")
+        self.checkpoint = numpy.array(snapshot[1:]).reshape(self.solution.shape)
+        return int(snapshot[:1].view(numpy.uint64)[0])
+
+    # Time and iterations
+
+    def GetUnsteady_TimeStep(self):
+        return self.deltaT
+
+    def SetUnsteady_TimeStep(self, deltaT):
+        self.deltaT = deltaT
+
+    def GetTime_Iter(self):
+        return self.TimeIter
+
+    def GetnTimeIter(self):
+        return 2**31
+
+    def GetnInner_Iter(self):
+        return self.nInner_Iter
+
+    def SetnInner_Iter(self, nInner_Iter):
+        self.nInner_Iter = nInner_Iter
+
+    def GetInner_Iter(self):
+        return self.nInner_Iter - 1
+
+    def SetMeshDeformationWarmStart(self, warmStart):
+        pass
+
+    def GetMeshDeformationIterations(self):
+        return 0
+
+    # Solver phases, the flow solution is only touched to keep it resident
+
+    def Preprocess(self, TimeIter):
+        self.TimeIter = TimeIter
+
+    def Run(self):
+        self.solution[0] += 1.0
+
+    def Postprocess(self):
+        pass
+
+    def Update(self):
+        pass
+
+    def Monitor(self, TimeIter):
+        return False
+
+    def Output(self, TimeIter):
+        pass
+
+    def Postprocessing(self):
+        pass
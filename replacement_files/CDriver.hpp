@@ -38,9 +38,6 @@
 
 #include "../../../Common/include/geometry/CGeometry.hpp"
 
-//preCICE: include required header file for MatrixType
-#include "../../../Common/include/containers/container_decorators.hpp"
-
 using namespace std;
 
 class COutputLegacy;
@@ -106,23 +103,61 @@ protected:
   bool dry_run;                                 /*!< \brief Flag if SU2_CFD was started as dry-run via "SU2_CFD -d <config>.cfg" */
 
   // preCICE:
-  using MatrixType = C2DContainer<unsigned long, su2double, StorageType::RowMajor,    64, DynamicSize, DynamicSize>;
-  MatrixType preCICE_Solution;                  /*!< \brief FLOW Solution of the problem - for preCICE implicit coupling. */
-  MatrixType preCICE_Solution_time_n;           /*!< \brief FLOW Solution of the problem at time n for dual-time stepping technique - for preCICE implicit coupling. */
-  MatrixType preCICE_Solution_time_n1;          /*!< \brief FLOW Solution of the problem at time n-1 for dual-time stepping technique - for preCICE implicit coupling. */
-  MatrixType preCICE_TURB_Solution;             /*!< \brief TURB Solution of the problem - for preCICE implicit coupling. */
-  MatrixType preCICE_TURB_Solution_time_n;      /*!< \brief TURB Solution of the problem at time n for dual-time stepping technique - for preCICE implicit coupling. */
-  MatrixType preCICE_TURB_Solution_time_n1;     /*!< \brief TURB Solution of the problem at time n-1 for dual-time stepping technique - for preCICE implicit coupling. */
-  MatrixType preCICE_MESH_Solution;             /*!< \brief MESH Solution of the problem - for preCICE implicit coupling. */
-  MatrixType preCICE_MESH_Solution_time_n;      /*!< \brief MESH Solution of the problem at time n for dual-time stepping technique - for preCICE implicit coupling. */
-  MatrixType preCICE_MESH_Solution_time_n1;     /*!< \brief MESHSolution of the problem at time n-1 for dual-time stepping technique - for preCICE implicit coupling. */
-
-  
-  su2activematrix preCICE_Coord;                /*!< \brief vector with the coordinates of the node - for preCICE implicit coupling. */
-  su2activematrix preCICE_GridVel;              /*!< \brief Velocity of the grid for dynamic mesh cases - for preCICE implicit coupling. */
-  su2activevector preCICE_Volume;               /*!< \brief Volume or Area of the control volume in 3D and 2D - for preCICE implicit coupling. */
-  su2activevector preCICE_Volume_n;             /*!< \brief Volume at time n - for preCICE implicit coupling. */
-  su2activevector preCICE_Volume_nM1;           /*!< \brief Volume at time n-1 - for preCICE implicit coupling. */
+  /*!
+   * \brief Fields of the checkpoint for preCICE implicit coupling (points of this rank only, except for the dual grid).
+   */
+  enum CHECKPOINT_FIELD : unsigned short {
+    CKPT_FLOW, CKPT_FLOW_N, CKPT_FLOW_N1,       /*!< \brief FLOW Solution at the current time, time n and time n-1. */
+    CKPT_TURB, CKPT_TURB_N, CKPT_TURB_N1,       /*!< \brief TURB Solution at the current time, time n and time n-1. */
+    CKPT_MESH, CKPT_MESH_N, CKPT_MESH_N1,       /*!< \brief MESH Solution at the current time, time n and time n-1. */
+    CKPT_VOLUME_N, CKPT_VOLUME_NM1,             /*!< \brief Volume or Area of the control volume at time n and time n-1. */
+    CKPT_DUALGRID,                              /*!< \brief Dual grid of all multigrid levels, including halos, FULL storage only (see CopyDualGrid). */
+    CKPT_NFIELDS
+  };
+
+  /*!
+   * \brief Storage modes of the checkpoint for preCICE implicit coupling.
+   */
+  enum CHECKPOINT_STORAGE : unsigned short {
+    CKPT_STORAGE_FULL,     /*!< \brief All time levels are stored in memory. */
+    CKPT_STORAGE_REDUCED,  /*!< \brief Time levels that can be recovered from the others and the dual grid are not stored. */
+    CKPT_STORAGE_MAPPED    /*!< \brief As REDUCED, stored in a memory-mapped scratch file. */
+  };
+
+  unsigned short preCICE_CheckpointStorage = CKPT_STORAGE_FULL;  /*!< \brief Storage mode of the checkpoint - for preCICE implicit coupling. */
+  string preCICE_CheckpointDir = ".";                 /*!< \brief Directory of the scratch file of a mapped checkpoint - for preCICE implicit coupling. */
+  passivedouble* preCICE_Checkpoint = nullptr;        /*!< \brief Values of all fields of the checkpoint - for preCICE implicit coupling. */
+  unsigned long preCICE_CheckpointSize = 0;           /*!< \brief Number of values in the checkpoint - for preCICE implicit coupling. */
+  vector<passivedouble> preCICE_CheckpointHeap;       /*!< \brief Storage of an in-memory checkpoint - for preCICE implicit coupling. */
+  void* preCICE_CheckpointMap = nullptr;              /*!< \brief Storage of a memory-mapped checkpoint - for preCICE implicit coupling. */
+  vector<unsigned long> preCICE_FieldOffset;         /*!< \brief Offset of each field of each zone in the checkpoint - for preCICE implicit coupling. */
+  vector<unsigned long> preCICE_FieldSize;           /*!< \brief Number of values of each field of each zone, 0 if not stored - for preCICE implicit coupling. */
+
+  unsigned short preCICE_Zone = ZONE_0;         /*!< \brief Zone of the marker, interface and vertex functions - for preCICE. */
+  bool preCICE_MeshWarmStart = false;           /*!< \brief Keep the last mesh deformation solution as initial guess - for preCICE. */
+  vector<passivedouble> preCICE_PredictorHistory;  /*!< \brief FLOW, TURB and MESH solutions of all zones at time n-2, for the quadratic time predictor - for preCICE. */
+  vector<vector<bool> > preCICE_CustomBCModified;  /*!< \brief Custom boundary values of each marker of each zone modified since its last update - for preCICE. */
+
+  /*!
+   * \brief Wall geometry of the physical vertices of a marker and constants of the heat flux evaluation, for preCICE CHT.
+   */
+  struct HeatFluxTable_preCICE {
+    bool built = false;                   /*!< \brief Table built for the current geometry. */
+    bool compressible = false;            /*!< \brief Compressible flow (the heat flux is zero otherwise). */
+    su2double Conductivity_Factor = 0.0;  /*!< \brief Cp / Prandtl_Lam, the ratio of the thermal conductivity to the laminar viscosity. */
+    su2double Heat_Flux_Ref = 1.0;        /*!< \brief Reference heat flux, to re-dimensionalize the heat flux. */
+    su2double Temperature_Ref = 1.0;      /*!< \brief Reference temperature, to re-dimensionalize temperatures and heat transfer coefficients. */
+    vector<long> Row;                     /*!< \brief Row of each vertex of the marker in the table, -1 for halo vertices. */
+    vector<unsigned long> Point;          /*!< \brief Node of each physical vertex. */
+    vector<su2double> UnitNormal;         /*!< \brief Unit normal of each physical vertex, nDim values per vertex. */
+    vector<unsigned long> Neighbor;       /*!< \brief Normal neighbor node of each physical vertex, where the sink temperature is taken. */
+    vector<su2double> Wall_Distance;      /*!< \brief Wall normal distance of the normal neighbor of each physical vertex. */
+  };
+
+  mutable vector<vector<HeatFluxTable_preCICE> > preCICE_HeatFluxTables;  /*!< \brief Heat flux table of each marker of each zone, built on first use - for preCICE CHT. */
+
+  passivedouble preCICE_SaveTime = 0.0;         /*!< \brief Wall time of the last SaveOldState call - for preCICE implicit coupling. */
+  passivedouble preCICE_ReloadTime = 0.0;       /*!< \brief Wall time of the last ReloadOldState call - for preCICE implicit coupling. */
 
 public:
 
@@ -367,20 +402,89 @@ protected:
   /*!
    * \brief Finalize reloading FLOW_SOL, for preCICE implicit coupling
    * Precondition: SaveOldState called first
+   * \param[in] iZone - Zone identifier.
    */
-   void FinalizeFLOW_SOL();
+   void FinalizeFLOW_SOL(unsigned short iZone);
 
    /*!
    * \brief Finalize reloading TURB_SOL, for preCICE implicit coupling
    * Precondition: SaveOldState called first, RANS sim
+   * \param[in] iZone - Zone identifier.
    */
-   void FinalizeTURB_SOL();
+   void FinalizeTURB_SOL(unsigned short iZone);
 
   /*!
    * \brief Finalize reloading MESH_SOL, for preCICE implicit coupling
    * Precondition: SaveOldState called first, DEFORM_MESH= YES
+   * \param[in] iZone - Zone identifier.
    */
-   void FinalizeMESH_SOL();
+   void FinalizeMESH_SOL(unsigned short iZone);
+
+  /*!
+   * \brief Check that a caller-owned buffer matches the physical vertices of a marker, for preCICE bulk data exchange
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] nValuesPerVertex - Number of values stored per physical vertex.
+   * \param[in] bufferSize - Number of values in the buffer.
+   */
+   void CheckMarkerBufferSize(unsigned short iMarker, unsigned short nValuesPerVertex, unsigned long bufferSize) const;
+
+  /*!
+   * \brief Get the heat flux table of a marker of the selected zone, for preCICE CHT
+   * The table is built on first use. On a dynamic grid, its unit normals are only valid after a call with update.
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] update - Rebuild the table if the grid is dynamic.
+   * \return Unit normals and nodes of the physical vertices, and constants of the heat flux evaluation.
+   */
+   const HeatFluxTable_preCICE& GetHeatFluxTable(unsigned short iMarker, bool update) const;
+
+  /*!
+   * \brief Lay out and allocate the checkpoint according to the storage mode, for preCICE implicit coupling
+   */
+   void AllocateCheckpoint();
+
+  /*!
+   * \brief Get a field of the checkpoint, for preCICE implicit coupling
+   * \param[in] iZone - Zone identifier.
+   * \param[in] iField - Field identifier (CHECKPOINT_FIELD).
+   * \return Pointer to the values of the field, stored row by row for each point.
+   */
+   inline passivedouble* GetCheckpointField(unsigned short iZone, unsigned short iField) const {
+     return preCICE_Checkpoint + preCICE_FieldOffset[iZone*CKPT_NFIELDS + iField];
+   }
+
+  /*!
+   * \brief Check if a field is stored in the checkpoint, for preCICE implicit coupling
+   * \param[in] iZone - Zone identifier.
+   * \param[in] iField - Field identifier (CHECKPOINT_FIELD).
+   * \return True if the field is stored.
+   */
+   inline bool IsCheckpointField(unsigned short iZone, unsigned short iField) const {
+     return preCICE_FieldSize[iZone*CKPT_NFIELDS + iField] > 0;
+   }
+
+  /*!
+   * \brief Get the number of values of the dual grid of all multigrid levels, for preCICE implicit coupling
+   * \param[in] iZone - Zone identifier.
+   * \return Size of the CKPT_DUALGRID field.
+   */
+   unsigned long GetDualGridSize(unsigned short iZone) const;
+
+  /*!
+   * \brief Copy the dual grid between the geometry and the checkpoint, for preCICE implicit coupling
+   * For each multigrid level: coordinates, grid velocities and volumes of all points (including halos),
+   * edge normals and boundary vertex normals; and the maximum lengths of the fine grid. Reloading them
+   * replaces the geometry update, grid velocity computation and the related communications.
+   * \param[in] iZone - Zone identifier.
+   * \param[in] reload - True to restore the geometry from the checkpoint, false to save it.
+   */
+   void CopyDualGrid(unsigned short iZone, bool reload);
+
+  /*!
+   * \brief Recompute the dual grid of all multigrid levels from the reloaded mesh solution, for preCICE implicit coupling
+   * Used instead of CopyDualGrid in reduced storage, where the dual grid is not part of the checkpoint.
+   * \param[in] iZone - Zone identifier.
+   */
+   void RecomputeDualGrid(unsigned short iZone);
 
 public:
 
@@ -425,15 +529,29 @@ public:
   virtual void DynamicMeshUpdate(unsigned short val_iZone, unsigned long TimeIter) { }
 
   /*!
-   * \brief Perform a mesh deformation as initial condition.
+   * \brief Perform a mesh deformation as initial condition, of every zone with a dynamic grid.
+   */
+  virtual void SetInitialMesh();
+
+  /*!
+   * \brief Zero the grid velocities and push back the volumes and mesh solution of a zone after its initial deformation, for preCICE
+   * \param[in] iZone - Zone identifier.
    */
-  virtual void SetInitialMesh() { }
+  void PushBackInitialMesh(unsigned short iZone);
 
   /*!
    * \brief Process the boundary conditions and update the multigrid structure.
    */
   void BoundaryConditionsUpdate();
 
+  /*!
+   * \brief Update the custom boundary conditions of a single marker on the coarse multigrid levels, for preCICE
+   * Does nothing (and returns immediately) if the custom values of the marker were not modified since its last update.
+   * \param[in] iMarker - Marker identifier.
+   * \return True if the marker was updated.
+   */
+  bool UpdateMarkerBoundaryConditions(unsigned short iMarker);
+
   /*!
    * \brief Get the total drag.
    * \return Total drag.
@@ -510,6 +628,24 @@ public:
    */
   unsigned long GetTime_Iter() const;
 
+  /*!
+   * \brief Get the last inner iteration performed, for preCICE
+   * \return Index of the last inner iteration of the last time iteration (number of inner iterations - 1).
+   */
+  unsigned long GetInner_Iter() const;
+
+  /*!
+   * \brief Get the maximum number of inner iterations of a time iteration (INNER_ITER), for preCICE
+   * \return Number of inner iterations.
+   */
+  unsigned long GetnInner_Iter() const;
+
+  /*!
+   * \brief Set the maximum number of inner iterations of the next time iterations of all zones at runtime, for preCICE
+   * \param[in] nInnerIter - Number of inner iterations.
+   */
+  void SetnInner_Iter(unsigned long nInnerIter);
+
   /*!
    * \brief Get the unsteady time step.
    * \return Unsteady time step.
@@ -517,22 +653,199 @@ public:
   passivedouble GetUnsteady_TimeStep() const;
 
   /*!
-   * \brief Set the unsteady time step, for preCICE
+   * \brief Set the unsteady time step of all zones, for preCICE
    * \param[in] val_delta_unsttime - dimensional timestep to set
    */
   void SetUnsteady_TimeStep(passivedouble val_delta_unsttime);
 
   /*!
-   * \brief Reload saved old state, for preCICE implicit coupling
+   * \brief Reload saved old state of all zones, for preCICE implicit coupling
    * Precondition: SaveOldState called first
+   * \param[in] warmStart - Keep the current FLOW and TURB solutions (last iterate) and only reload their
+   *            time history, the mesh and the geometry; false to reload the complete state (default).
    */
-  void ReloadOldState();
+  void ReloadOldState(bool warmStart = false);
 
   /*!
-   * \brief Save old state, for preCICE implicit coupling
+   * \brief Save old state of all zones, for preCICE implicit coupling
+   * All zones must have a flow solver.
   */
   void SaveOldState();
 
+  /*!
+   * \brief Seed the solutions of all zones with an extrapolation in time, before the first run of a time step, for preCICE
+   * The FLOW and TURB solutions, and the MESH solution and initial guess of the mesh deformation, are set to
+   * c_n * (time n) + c_n1 * (time n-1) + c_n2 * (time n-2). Time n-2 is the time n-1 of the previous call made with keepHistory.
+   * Turbulence variables keep their value at time n where the extrapolation would change their sign.
+   * \param[in] c_n - Coefficient of the solution at time n.
+   * \param[in] c_n1 - Coefficient of the solution at time n-1.
+   * \param[in] c_n2 - Coefficient of the solution at time n-2, 0 for a linear extrapolation.
+   * \param[in] keepHistory - Keep the solutions at time n-1 as time n-2 of the next call (quadratic extrapolation).
+   */
+  void PredictSolution(passivedouble c_n, passivedouble c_n1, passivedouble c_n2, bool keepHistory);
+
+  /*!
+   * \brief Select the zone of the marker, interface mesh and vertex functions, for preCICE
+   * The checkpoint functions always cover all zones.
+   * \param[in] iZone - Zone identifier.
+   */
+  void SelectZone(unsigned short iZone);
+
+  /*!
+   * \brief Get the zone of the marker, interface mesh and vertex functions, for preCICE
+   * \return Zone identifier.
+   */
+  inline unsigned short GetSelectedZone() const { return preCICE_Zone; }
+
+  /*!
+   * \brief Get the number of zones of the problem, for preCICE
+   * \return Number of zones.
+   */
+  inline unsigned short GetnZone() const { return nZone; }
+
+  /*!
+   * \brief Get the wall time of the last SaveOldState call, for preCICE implicit coupling
+   * \return Wall time in seconds.
+   */
+  inline passivedouble GetSaveOldStateTime() const { return preCICE_SaveTime; }
+
+  /*!
+   * \brief Get the wall time of the last ReloadOldState call (including the finalization of the solvers), for preCICE implicit coupling
+   * \return Wall time in seconds.
+   */
+  inline passivedouble GetReloadOldStateTime() const { return preCICE_ReloadTime; }
+
+  /*!
+   * \brief Set how the checkpoint is stored, for preCICE implicit coupling
+   * Any existing checkpoint is released, so this must be called before SaveOldState.
+   * \param[in] storage - "FULL" (all time levels in memory), "REDUCED" (time levels that can be recovered from the
+   *                      others are not stored) or "MAPPED" (as REDUCED, in a memory-mapped scratch file).
+   * \param[in] scratchDir - Directory of the scratch file for the "MAPPED" storage.
+   */
+  void SetCheckpointStorage(string storage, string scratchDir = ".");
+
+  /*!
+   * \brief Get the size of the checkpoint on this rank, for preCICE implicit coupling
+   * \return Number of bytes held by the checkpoint.
+   */
+  inline unsigned long GetCheckpointBytes() const { return preCICE_CheckpointSize * sizeof(passivedouble); }
+
+  /*!
+   * \brief Release the checkpoint storage (memory or scratch file mapping), for preCICE implicit coupling
+   */
+  void ReleaseOldState();
+
+  /*!
+   * \brief Write the checkpoint of this rank to a binary snapshot file in one block, for preCICE coupled restarts
+   * Precondition: SaveOldState called first
+   * \param[in] fileName - Snapshot file of this rank.
+   * \param[in] timeIter - Time iteration of the checkpoint, stored in the snapshot header.
+   */
+  void WriteCheckpointSnapshot(string fileName, unsigned long timeIter) const;
+
+  /*!
+   * \brief Load the checkpoint of this rank from a snapshot file through a memory mapping, for preCICE coupled restarts
+   * The snapshot must have been written with the same mesh partition, solvers and checkpoint storage.
+   * The solver state is restored by ReloadOldState.
+   * \param[in] fileName - Snapshot file of this rank.
+   * \return Time iteration of the checkpoint.
+   */
+  unsigned long LoadCheckpointSnapshot(string fileName);
+
+  /*!
+   * \brief Get the flow loads of all physical vertices of a marker, for preCICE
+   * The buffer is filled row by row (nDim values per vertex) in increasing order of the physical vertex indices.
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] bufferAddress - Address of a caller-owned, contiguous array of passivedouble.
+   * \param[in] bufferSize - Number of passivedouble values the buffer can hold.
+   */
+  void GetMarkerFlowLoads(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const;
+
+  /*!
+   * \brief Set the mesh displacements of all physical vertices of a marker, for preCICE
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] bufferAddress - Address of a caller-owned, contiguous array of passivedouble (nDim values per vertex).
+   * \param[in] bufferSize - Number of passivedouble values in the buffer.
+   */
+  void SetMarkerMeshDisplacements(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize);
+
+  /*!
+   * \brief Get the largest change between new mesh displacements and those currently imposed on a marker, for preCICE
+   * \note With SetMeshDeformationWarmStart, the imposed displacements are those of the last coupling iterate, also after ReloadOldState.
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] bufferAddress - Address of a caller-owned, contiguous array of passivedouble (nDim values per vertex).
+   * \param[in] bufferSize - Number of passivedouble values in the buffer.
+   * \return Maximum absolute difference of any displacement component over the physical vertices of this rank.
+   */
+  passivedouble GetMarkerDisplacementChange(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const;
+
+  /*!
+   * \brief Keep the last mesh deformation solution as initial guess of the next one, and the boundary displacements it
+   *        satisfies, also after ReloadOldState, for preCICE
+   * \param[in] warmStart - True to warm-start, false to restart from the reloaded displacements (default).
+   */
+  inline void SetMeshDeformationWarmStart(bool warmStart) { preCICE_MeshWarmStart = warmStart; }
+
+  /*!
+   * \brief Get the number of linear solver iterations of the last mesh deformation of the selected zone, for preCICE
+   * \return Number of iterations (0 if the initial guess already satisfied the tolerance, or the zone has no mesh solver).
+   */
+  inline unsigned long GetMeshDeformationIterations() const {
+    const CSolver* MESH_solver = solver_container[preCICE_Zone][INST_0][MESH_0][MESH_SOL];
+    return (MESH_solver != nullptr) ? MESH_solver->GetIterLinSolver() : 0;
+  }
+
+  /*!
+   * \brief Get the temperatures of all physical vertices of a marker, for preCICE
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] bufferAddress - Address of a caller-owned, contiguous array of passivedouble.
+   * \param[in] bufferSize - Number of passivedouble values the buffer can hold.
+   */
+  void GetMarkerTemperatures(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const;
+
+  /*!
+   * \brief Set the temperatures of all physical vertices of a marker, for preCICE
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] bufferAddress - Address of a caller-owned, contiguous array of passivedouble.
+   * \param[in] bufferSize - Number of passivedouble values in the buffer.
+   */
+  void SetMarkerTemperatures(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize);
+
+  /*!
+   * \brief Get the wall normal heat fluxes of all physical vertices of a marker, for preCICE
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] bufferAddress - Address of a caller-owned, contiguous array of passivedouble.
+   * \param[in] bufferSize - Number of passivedouble values the buffer can hold.
+   */
+  void GetMarkerNormalHeatFluxes(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const;
+
+  /*!
+   * \brief Set the wall normal heat fluxes of all physical vertices of a marker, for preCICE
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] bufferAddress - Address of a caller-owned, contiguous array of passivedouble.
+   * \param[in] bufferSize - Number of passivedouble values in the buffer.
+   */
+  void SetMarkerNormalHeatFluxes(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize);
+
+  /*!
+   * \brief Get the heat transfer coefficients and sink temperatures of all physical vertices of a marker, for preCICE Robin CHT
+   * The heat transfer coefficient is the thermal conductivity over the wall distance of the normal neighbor, whose temperature is the sink temperature.
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] bufferAddress - Address of a caller-owned, contiguous array of passivedouble, heat transfer coefficient and sink temperature per vertex.
+   * \param[in] bufferSize - Number of passivedouble values the buffer can hold.
+   */
+  void GetMarkerRobinCoefficients(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const;
+
+  /*!
+   * \brief Set the Robin condition of the partner on all physical vertices of an isothermal marker, for preCICE Robin CHT
+   * The wall temperature balances the heat flux of the partner, from its heat transfer coefficient and sink temperature,
+   * with the heat flux of the flow, from GetMarkerRobinCoefficients.
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] bufferAddress - Address of a caller-owned, contiguous array of passivedouble, heat transfer coefficient and sink temperature per vertex.
+   * \param[in] bufferSize - Number of passivedouble values in the buffer.
+   */
+  void SetMarkerRobinConditions(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize);
+
   /*!
    * \brief Get the name of the output file for the surface.
    * \return File name for the surface output.
@@ -554,7 +867,32 @@ public:
    * \return x,y,z coordinates of the vertex.
    */
   vector<passivedouble> GetInitialMeshCoord(unsigned short iMarker, unsigned long iVertex) const;
-  
+
+  /*!
+   * \brief Get the sizes of the interface mesh of a marker on this rank, for preCICE
+   * Only boundary elements whose nodes are all physical vertices of this rank are part of the interface mesh.
+   * \param[in] iMarker - Marker identifier.
+   * \return Number of physical vertices, number of boundary elements, number of nodes per element row
+   *         (2 in 2D, 4 in 3D where triangles are padded with -1).
+   */
+  vector<unsigned long> GetMarkerInterfaceSizes(unsigned short iMarker) const;
+
+  /*!
+   * \brief Get the interface mesh of a marker on this rank in one pass, for preCICE
+   * All buffers are caller-owned contiguous arrays sized according to GetMarkerInterfaceSizes.
+   * \param[in] iMarker - Marker identifier.
+   * \param[in] vertexAddress - Address of the unsigned long array receiving the physical vertex indices.
+   * \param[in] vertexSize - Number of values in the vertex index array.
+   * \param[in] coordAddress - Address of the passivedouble array receiving the coordinates (nDim values per vertex).
+   * \param[in] coordSize - Number of values in the coordinate array.
+   * \param[in] elemAddress - Address of the long array receiving the element connectivity, given as positions
+   *                          in the physical vertex array.
+   * \param[in] elemSize - Number of values in the connectivity array.
+   */
+  void GetMarkerInterfaceMesh(unsigned short iMarker, unsigned long vertexAddress, unsigned long vertexSize,
+                              unsigned long coordAddress, unsigned long coordSize,
+                              unsigned long elemAddress, unsigned long elemSize) const;
+
   /*!
    * \brief Get the temperature at a vertex on a specified marker.
    * \param[in] iMarker - Marker identifier.
@@ -768,7 +1106,7 @@ public:
                                  passivedouble val_AdjointY, passivedouble val_AdjointZ);
 
   /*!
-   * \brief Set the position of the heat source.
+   * \brief Set the position of the heat source of the selected zone.
    * \param[in] alpha - Angle of rotation respect to Z axis.
    * \param[in] pos_x - Position X.
    * \param[in] pos_y - Position Y.
@@ -777,7 +1115,7 @@ public:
   void SetHeatSource_Position(passivedouble alpha, passivedouble pos_x, passivedouble pos_y, passivedouble pos_z);
 
   /*!
-   * \brief Set the direction of the inlet.
+   * \brief Set the direction of the inlet of a marker of the selected zone.
    * \param[in] iMarker - Marker index.
    * \param[in] alpha - Angle (Zpos).
    */
@@ -32,11 +32,104 @@
 #include "../include/drivers/CSinglezoneDriver.hpp"
 #include "../../Common/include/toolboxes/geometry_toolbox.hpp"
 
+#include <fstream>
+
+#if defined(__unix__) || defined(__APPLE__)
+#include <fcntl.h>
+#include <sys/mman.h>
+#include <sys/stat.h>
+#include <unistd.h>
+#endif
+
+namespace {
+
+/*!
+ * \brief preCICE: Save the first nRows rows of a row-major container into a checkpoint field.
+ *        The rows are contiguous in memory, so the copy is split in one block per OpenMP thread.
+ */
+template <class Container>
+void SaveRows_preCICE(unsigned long nRows, const Container& src, passivedouble* dst) {
+
+  const unsigned long nValues = nRows * src.cols();
+  const auto* values = src.data();
+
+  SU2_OMP_PARALLEL {
+    const unsigned long nThreads = omp_get_num_threads();
+    const unsigned long thread = omp_get_thread_num();
+    const unsigned long end = (nValues * (thread + 1)) / nThreads;
+
+    for (unsigned long i = (nValues * thread) / nThreads; i < end; i++) dst[i] = SU2_TYPE::GetValue(values[i]);
+  }
+  END_SU2_OMP_PARALLEL
+}
+
+/*!
+ * \brief preCICE: Load a checkpoint field into the first nRows rows of a row-major container.
+ *        The rows are contiguous in memory, so the copy is split in one block per OpenMP thread.
+ */
+template <class Container>
+void LoadRows_preCICE(unsigned long nRows, const passivedouble* src, Container& dst) {
+
+  const unsigned long nValues = nRows * dst.cols();
+  auto* values = dst.data();
+
+  SU2_OMP_PARALLEL {
+    const unsigned long nThreads = omp_get_num_threads();
+    const unsigned long thread = omp_get_thread_num();
+    const unsigned long end = (nValues * (thread + 1)) / nThreads;
+
+    for (unsigned long i = (nValues * thread) / nThreads; i < end; i++) values[i] = src[i];
+  }
+  END_SU2_OMP_PARALLEL
+}
+
+/*!
+ * \brief preCICE: Set the first nRows rows of a row-major container to an extrapolation in time of its time levels.
+ *        With keepSign, the values whose sign the extrapolation would change keep their value at time n.
+ */
+template <class Container>
+void ExtrapolateRows_preCICE(unsigned long nRows, const passivedouble* coefficients, const Container& time_n,
+                             const Container& time_n1, const passivedouble* time_n2, bool keepSign, Container& dst) {
+
+  const unsigned long nValues = nRows * dst.cols();
+  const auto* values_n = time_n.data();
+  const auto* values_n1 = time_n1.data();
+  auto* values = dst.data();
+
+  SU2_OMP_PARALLEL {
+    const unsigned long nThreads = omp_get_num_threads();
+    const unsigned long thread = omp_get_thread_num();
+    const unsigned long end = (nValues * (thread + 1)) / nThreads;
+
+    for (unsigned long i = (nValues * thread) / nThreads; i < end; i++) {
+      auto value = coefficients[0]*values_n[i] + coefficients[1]*values_n1[i];
+      if (time_n2 != nullptr) value += coefficients[2]*time_n2[i];
+      values[i] = (keepSign && value*values_n[i] < 0.0) ? values_n[i] : value;
+    }
+  }
+  END_SU2_OMP_PARALLEL
+}
+
+/*!
+ * \brief preCICE: Header of a checkpoint snapshot: identifier, time iteration and number of fields (of all zones),
+ *        followed by the size of each field and the values of the checkpoint.
+ */
+constexpr unsigned long SNAPSHOT_ID = 0x31544B4350325553;   // "SU2PCKT1"
+constexpr unsigned long SNAPSHOT_HEADER = 3;
+
+}
+
 void CDriver::PythonInterface_Preprocessing(CConfig **config, CGeometry ****geometry, CSolver *****solver){
 
   int rank = MASTER_NODE;
   SU2_MPI::Comm_rank(SU2_MPI::GetComm(), &rank);
 
+  // preCICE: The initial custom values still have to be transferred to the coarse levels by the first marker update
+  preCICE_CustomBCModified.resize(nZone);
+  for (iZone = 0; iZone < nZone; iZone++) {
+    preCICE_CustomBCModified[iZone].assign(config[iZone]->GetnMarker_All(), true);
+  }
+
   /* --- Initialize boundary conditions customization, this is achieve through the Python wrapper --- */
   for(iZone=0; iZone < nZone; iZone++){
 
@@ -208,7 +301,7 @@ passivedouble CDriver::Get_LiftCoeff() const {
 
 unsigned long CDriver::GetNumberVertices(unsigned short iMarker) const {
 
-  return geometry_container[ZONE_0][INST_0][MESH_0]->nVertex[iMarker];
+  return geometry_container[preCICE_Zone][INST_0][MESH_0]->nVertex[iMarker];
 
 }
 
@@ -217,9 +310,9 @@ unsigned long CDriver::GetNumberHaloVertices(unsigned short iMarker) const {
   unsigned long nHaloVertices, iVertex, iPoint;
 
   nHaloVertices = 0;
-  for(iVertex = 0; iVertex < geometry_container[ZONE_0][INST_0][MESH_0]->nVertex[iMarker]; iVertex++){
-    iPoint = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
-    if(!(geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetDomain(iPoint))) nHaloVertices += 1;
+  for(iVertex = 0; iVertex < geometry_container[preCICE_Zone][INST_0][MESH_0]->nVertex[iMarker]; iVertex++){
+    iPoint = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+    if(!(geometry_container[preCICE_Zone][INST_0][MESH_0]->nodes->GetDomain(iPoint))) nHaloVertices += 1;
   }
 
   return nHaloVertices;
@@ -230,8 +323,8 @@ unsigned long CDriver::GetVertexGlobalIndex(unsigned short iMarker, unsigned lon
 
   unsigned long iPoint, GlobalIndex;
 
-  iPoint = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
-  GlobalIndex = geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetGlobalIndex(iPoint);
+  iPoint = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+  GlobalIndex = geometry_container[preCICE_Zone][INST_0][MESH_0]->nodes->GetGlobalIndex(iPoint);
 
   return GlobalIndex;
 
@@ -241,8 +334,8 @@ bool CDriver::IsAHaloNode(unsigned short iMarker, unsigned long iVertex) const {
 
   unsigned long iPoint;
 
-  iPoint = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
-  if(geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetDomain(iPoint)) return false;
+  iPoint = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+  if(geometry_container[preCICE_Zone][INST_0][MESH_0]->nodes->GetDomain(iPoint)) return false;
   else return true;
 
 }
@@ -252,11 +345,11 @@ vector<passivedouble> CDriver::GetInitialMeshCoord(unsigned short iMarker, unsig
   vector<su2double> coord(3,0.0);
   vector<passivedouble> coord_passive(3, 0.0);
 
-  auto iPoint = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+  auto iPoint = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
   for (auto iDim = 0 ; iDim < nDim ; iDim++){
     // preCICE
-   coord[iDim] = geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetCoord(iPoint,iDim);
-                  //solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetMesh_Coord(iPoint,iDim);
+   coord[iDim] = geometry_container[preCICE_Zone][INST_0][MESH_0]->nodes->GetCoord(iPoint,iDim);
+                  //solver_container[preCICE_Zone][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetMesh_Coord(iPoint,iDim);
     // CSolver object only instantiates coordinates if DEFORM_MESH= YES. This above works regardless, which is handy for CHT
   }
 
@@ -267,6 +360,81 @@ vector<passivedouble> CDriver::GetInitialMeshCoord(unsigned short iMarker, unsig
   return coord_passive;
 }
 
+// preCICE:
+vector<unsigned long> CDriver::GetMarkerInterfaceSizes(unsigned short iMarker) const {
+
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+
+  unsigned long nVertex_Phys = 0, nElem_Interface = 0;
+
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    if (geometry->nodes->GetDomain(geometry->vertex[iMarker][iVertex]->GetNode())) nVertex_Phys++;
+  }
+
+  for (unsigned long iElem = 0; iElem < geometry->GetnElem_Bound(iMarker); iElem++) {
+    bool physical = true;
+    for (unsigned short iNode = 0; iNode < geometry->bound[iMarker][iElem]->GetnNodes(); iNode++) {
+      physical = physical && geometry->nodes->GetDomain(geometry->bound[iMarker][iElem]->GetNode(iNode));
+    }
+    if (physical) nElem_Interface++;
+  }
+
+  return {nVertex_Phys, nElem_Interface, (nDim == 2) ? 2ul : 4ul};
+}
+
+// preCICE:
+void CDriver::GetMarkerInterfaceMesh(unsigned short iMarker, unsigned long vertexAddress, unsigned long vertexSize,
+                                     unsigned long coordAddress, unsigned long coordSize,
+                                     unsigned long elemAddress, unsigned long elemSize) const {
+
+  CheckMarkerBufferSize(iMarker, 1, vertexSize);
+  CheckMarkerBufferSize(iMarker, nDim, coordSize);
+
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+  const unsigned short nNodes_Elem = (nDim == 2) ? 2 : 4;
+
+  auto *Vertices = reinterpret_cast<unsigned long*>(vertexAddress);
+  auto *Coords = reinterpret_cast<passivedouble*>(coordAddress);
+  auto *Elems = reinterpret_cast<long*>(elemAddress);
+
+  /*--- Physical vertices and their coordinates, keeping the position of each vertex in the arrays. ---*/
+  vector<long> PhysPosition(geometry->nVertex[iMarker], -1);
+
+  unsigned long iVertex_Phys = 0;
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    const auto iPoint = geometry->vertex[iMarker][iVertex]->GetNode();
+    if (!geometry->nodes->GetDomain(iPoint)) continue;
+
+    for (unsigned short iDim = 0; iDim < nDim; iDim++)
+      Coords[iVertex_Phys*nDim + iDim] = SU2_TYPE::GetValue(geometry->nodes->GetCoord(iPoint, iDim));
+
+    Vertices[iVertex_Phys] = iVertex;
+    PhysPosition[iVertex] = iVertex_Phys++;
+  }
+
+  /*--- Connectivity of the boundary elements made only of physical vertices. ---*/
+  unsigned long iBuffer = 0;
+  for (unsigned long iElem = 0; iElem < geometry->GetnElem_Bound(iMarker); iElem++) {
+    const auto nNodes = geometry->bound[iMarker][iElem]->GetnNodes();
+
+    bool physical = true;
+    for (unsigned short iNode = 0; iNode < nNodes; iNode++) {
+      physical = physical && geometry->nodes->GetDomain(geometry->bound[iMarker][iElem]->GetNode(iNode));
+    }
+    if (!physical) continue;
+
+    if (iBuffer + nNodes_Elem > elemSize) {
+      SU2_MPI::Error("Connectivity buffer too small for the interface mesh of marker " +
+                     config_container[preCICE_Zone]->GetMarker_All_TagBound(iMarker) + ".", CURRENT_FUNCTION);
+    }
+
+    for (unsigned short iNode = 0; iNode < nNodes_Elem; iNode++) {
+      Elems[iBuffer++] = (iNode < nNodes) ?
+        PhysPosition[geometry->nodes->GetVertex(geometry->bound[iMarker][iElem]->GetNode(iNode), iMarker)] : -1;
+    }
+  }
+}
+
 vector<passivedouble> CDriver::GetVertexNormal(unsigned short iMarker, unsigned long iVertex, bool unitNormal) const {
 
   su2double *Normal;
@@ -274,7 +442,7 @@ vector<passivedouble> CDriver::GetVertexNormal(unsigned short iMarker, unsigned
   vector<su2double> ret_Normal(3, 0.0);
   vector<passivedouble> ret_Normal_passive(3, 0.0);
 
-  Normal = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNormal();
+  Normal = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNormal();
 
   if (!unitNormal) {
 
@@ -304,7 +472,7 @@ vector<passivedouble> CDriver::GetVertexNormal(unsigned short iMarker, unsigned
 
 unsigned long CDriver::GetnTimeIter() const {
 
-  return config_container[ZONE_0]->GetnTime_Iter();
+  return config_container[preCICE_Zone]->GetnTime_Iter();
 }
 
 unsigned long CDriver::GetTime_Iter() const{
@@ -312,15 +480,36 @@ unsigned long CDriver::GetTime_Iter() const{
   return TimeIter;
 }
 
+// preCICE:
+unsigned long CDriver::GetInner_Iter() const {
+
+  return config_container[preCICE_Zone]->GetInnerIter();
+}
+
+// preCICE:
+unsigned long CDriver::GetnInner_Iter() const {
+
+  return config_container[preCICE_Zone]->GetnInner_Iter();
+}
+
+// preCICE:
+void CDriver::SetnInner_Iter(unsigned long nInnerIter) {
+
+  if (nInnerIter == 0) SU2_MPI::Error("The number of inner iterations must be positive.", CURRENT_FUNCTION);
+  for (unsigned short iZone = 0; iZone < nZone; iZone++) {
+    config_container[iZone]->SetnInner_Iter(nInnerIter);
+  }
+}
+
 passivedouble CDriver::GetUnsteady_TimeStep() const {
 
-  return SU2_TYPE::GetValue(config_container[ZONE_0]->GetDelta_UnstTime());
+  return SU2_TYPE::GetValue(config_container[preCICE_Zone]->GetDelta_UnstTime());
   // preCICE: Changed to GetDelta_UnstTime(), as this is not the initial time step but the ACTUAL time step that is used
 }
 
 string CDriver::GetSurfaceFileName() const {
 
-  return config_container[ZONE_0]->GetSurfCoeff_FileName();
+  return config_container[preCICE_Zone]->GetSurfCoeff_FileName();
 }
 //////////////////////////////////////////////////////////////////////////////////
 /* Functions specifically created for use with preCICE */
@@ -328,146 +517,200 @@ string CDriver::GetSurfaceFileName() const {
 
 // preCICE:
 void CDriver::SetUnsteady_TimeStep(passivedouble val_delta_unsttime) {
-    config_container[ZONE_0]->SetDelta_UnstTimeND(val_delta_unsttime / config_container[ZONE_0]->GetTime_Ref());
+  // All zones advance with the same time step
+  for (unsigned short iZone = 0; iZone < nZone; iZone++) {
+    config_container[iZone]->SetDelta_UnstTimeND(val_delta_unsttime / config_container[iZone]->GetTime_Ref());
+  }
 }
 
 // preCICE:
-void CDriver::ReloadOldState() {
+void CDriver::SelectZone(unsigned short iZone) {
 
-  // Get the number of solution variables, points, and dimension
-  const unsigned short nVar = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetnVar();
-  const unsigned long nPoint_Local = geometry_container[ZONE_0][INST_0][MESH_0]->GetnPointDomain();
-  const unsigned short nDim = geometry_container[ZONE_0][INST_0][MESH_0]->GetnDim();
-  
-  // Get if RANS
-  const bool rans = config_container[ZONE_0]->GetKind_Turb_Model() != TURB_MODEL::NONE;
-  const unsigned short TURB_nVar = (rans) ? solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->GetnVar() : 0;
+  if (iZone >= nZone) {
+    SU2_MPI::Error("Zone " + to_string(iZone) + " does not exist, the problem has " + to_string(nZone) + " zones.", CURRENT_FUNCTION);
+  }
+  preCICE_Zone = iZone;
+}
 
-  // Get if this is dynamic grid (for unsteady FSI problems)
-  const bool dynamic_grid = config_container[ZONE_0]->GetDynamic_Grid();
-  const unsigned short MESH_nVar = (dynamic_grid) ? solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetnVar() : 0;
+// preCICE:
+void CDriver::ReloadOldState(bool warmStart) {
 
-  /*--- To make this routine safe to call in parallel most of it can only be executed by one thread. ---*/
-  BEGIN_SU2_OMP_SAFE_GLOBAL_ACCESS {
+  const passivedouble StartTime_Reload = SU2_MPI::Wtime();
 
-  // Loop through everything and set all necessary variables to current state
-  for (unsigned long iPoint_Local = 0; iPoint_Local < nPoint_Local; iPoint_Local++) {
+  if (preCICE_Checkpoint == nullptr) {
+    SU2_MPI::Error("No checkpoint to reload, SaveOldState must be called first.", CURRENT_FUNCTION);
+  }
 
-    for (unsigned short iVar = 0; iVar < nVar; iVar++) {
-        solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->SetSolution(iPoint_Local, iVar, preCICE_Solution(iPoint_Local, iVar));
-        solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->Set_Solution_time_n(iPoint_Local, iVar, preCICE_Solution_time_n(iPoint_Local, iVar));
-        solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->Set_Solution_time_n1(iPoint_Local, iVar, preCICE_Solution_time_n1(iPoint_Local, iVar));
-    }
-    if (rans) {
-      for (unsigned short TURB_iVar = 0; TURB_iVar < TURB_nVar; TURB_iVar++) {
-        solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->GetNodes()->SetSolution(iPoint_Local, TURB_iVar, preCICE_TURB_Solution(iPoint_Local, TURB_iVar));
-        solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->GetNodes()->Set_Solution_time_n(iPoint_Local, TURB_iVar, preCICE_TURB_Solution_time_n(iPoint_Local, TURB_iVar));
-        solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->GetNodes()->Set_Solution_time_n1(iPoint_Local, TURB_iVar, preCICE_TURB_Solution_time_n1(iPoint_Local, TURB_iVar));
-      }
-    }    
-    if (dynamic_grid) {
+  for (unsigned short iZone = 0; iZone < nZone; iZone++) {
 
-      for (unsigned short MESH_iVar = 0; MESH_iVar < MESH_nVar; MESH_iVar++) {
-        solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->SetSolution(iPoint_Local, MESH_iVar, preCICE_MESH_Solution(iPoint_Local, MESH_iVar));
-        solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->Set_Solution_time_n(iPoint_Local, MESH_iVar, preCICE_MESH_Solution_time_n(iPoint_Local, MESH_iVar));
-        solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->Set_Solution_time_n1(iPoint_Local, MESH_iVar, preCICE_MESH_Solution_time_n1(iPoint_Local, MESH_iVar));
-      }
+    // Get the number of points
+    const unsigned long nPoint_Local = geometry_container[iZone][INST_0][MESH_0]->GetnPointDomain();
 
-      for (unsigned short iDim = 0; iDim < nDim; iDim++) {
-        geometry_container[ZONE_0][INST_0][MESH_0]->nodes->SetCoord(iPoint_Local,iDim, preCICE_Coord(iPoint_Local,iDim));
-        geometry_container[ZONE_0][INST_0][MESH_0]->nodes->SetGridVel(iPoint_Local, iDim, preCICE_GridVel(iPoint_Local, iDim));
-      }
-      
-      
-      //Temporarily must set volume and then set appropriate n, n1, then reset Volume
-      // Order may seem awkward, but look at CPoint::SetVolume_____ functions to understand why
-      geometry_container[ZONE_0][INST_0][MESH_0]->nodes->SetVolume(iPoint_Local, preCICE_Volume_nM1(iPoint_Local));
-      geometry_container[ZONE_0][INST_0][MESH_0]->nodes->SetVolume_n();
-      geometry_container[ZONE_0][INST_0][MESH_0]->nodes->SetVolume_nM1();
-
-      geometry_container[ZONE_0][INST_0][MESH_0]->nodes->SetVolume(iPoint_Local, preCICE_Volume_n(iPoint_Local));
-      geometry_container[ZONE_0][INST_0][MESH_0]->nodes->SetVolume_n();
-
-      geometry_container[ZONE_0][INST_0][MESH_0]->nodes->SetVolume(iPoint_Local, preCICE_Volume(iPoint_Local));
+    // Get if RANS
+    const bool rans = config_container[iZone]->GetKind_Turb_Model() != TURB_MODEL::NONE;
+
+    // Get if this is dynamic grid (for unsteady FSI problems)
+    const bool dynamic_grid = config_container[iZone]->GetDynamic_Grid();
+
+    // Time levels that were not stored are recovered from the next level: at a checkpoint the solution
+    // has just been pushed back in time, so Solution == Solution_time_n, and Solution_time_n1 is not used
+    // with first order time marching.
+    auto Level = [&](unsigned short iField, unsigned short iField_Next) {
+      return GetCheckpointField(iZone, IsCheckpointField(iZone, iField) ? iField : iField_Next);
+    };
+
+    // Set all necessary variables to the saved state with block copies of the solution containers.
+    // With a warm start, the FLOW and TURB solutions of the last iterate are kept as the initial guess of the next one,
+    // only their time history is reset.
+    CVariable* FLOW_nodes = solver_container[iZone][INST_0][MESH_0][FLOW_SOL]->GetNodes();
+    if (!warmStart) LoadRows_preCICE(nPoint_Local, GetCheckpointField(iZone, CKPT_FLOW), FLOW_nodes->GetSolution());
+    LoadRows_preCICE(nPoint_Local, Level(CKPT_FLOW_N, CKPT_FLOW), FLOW_nodes->GetSolution_time_n());
+    LoadRows_preCICE(nPoint_Local, Level(CKPT_FLOW_N1, CKPT_FLOW_N), FLOW_nodes->GetSolution_time_n1());
+
+    if (rans) {
+      CVariable* TURB_nodes = solver_container[iZone][INST_0][MESH_0][TURB_SOL]->GetNodes();
+      if (!warmStart) LoadRows_preCICE(nPoint_Local, GetCheckpointField(iZone, CKPT_TURB), TURB_nodes->GetSolution());
+      LoadRows_preCICE(nPoint_Local, Level(CKPT_TURB_N, CKPT_TURB), TURB_nodes->GetSolution_time_n());
+      LoadRows_preCICE(nPoint_Local, Level(CKPT_TURB_N1, CKPT_TURB_N), TURB_nodes->GetSolution_time_n1());
     }
 
-  }
+    if (dynamic_grid) {
+      CVariable* MESH_nodes = solver_container[iZone][INST_0][MESH_0][MESH_SOL]->GetNodes();
+      LoadRows_preCICE(nPoint_Local, GetCheckpointField(iZone, CKPT_MESH), MESH_nodes->GetSolution());
+      LoadRows_preCICE(nPoint_Local, Level(CKPT_MESH_N, CKPT_MESH), MESH_nodes->GetSolution_time_n());
+      LoadRows_preCICE(nPoint_Local, Level(CKPT_MESH_N1, CKPT_MESH_N), MESH_nodes->GetSolution_time_n1());
+
+      CPoint* nodes = geometry_container[iZone][INST_0][MESH_0]->nodes;
+
+      // Reduced storage: the dual grid is recomputed from the reloaded displacements. The volumes at time n are the
+      // current ones, and those at time n-1 are only stored with second order time marching.
+      if (!IsCheckpointField(iZone, CKPT_DUALGRID)) {
+        const passivedouble* Volume_nM1 = IsCheckpointField(iZone, CKPT_VOLUME_NM1) ? GetCheckpointField(iZone, CKPT_VOLUME_NM1) : nullptr;
+
+        SU2_OMP_PARALLEL {
+          if (Volume_nM1) {
+            SU2_OMP_FOR_STAT(roundUpDiv(nPoint_Local, omp_get_max_threads()))
+            for (unsigned long iPoint_Local = 0; iPoint_Local < nPoint_Local; iPoint_Local++) {
+              nodes->SetVolume(iPoint_Local, Volume_nM1[iPoint_Local]);
+            }
+            END_SU2_OMP_FOR
 
-  }  // end safe global access, pre and postprocessing are thread-safe.
-  END_SU2_OMP_SAFE_GLOBAL_ACCESS
+            BEGIN_SU2_OMP_SAFE_GLOBAL_ACCESS {
+              nodes->SetVolume_nM1();
+            }
+            END_SU2_OMP_SAFE_GLOBAL_ACCESS
+          }
+        }
+        END_SU2_OMP_PARALLEL
 
-  FinalizeFLOW_SOL();
-  if (rans) FinalizeTURB_SOL();
-  if (dynamic_grid) FinalizeMESH_SOL();
-}
+        RecomputeDualGrid(iZone);
 
-//preCICE: Finalize FLOW reloads
-void CDriver::FinalizeFLOW_SOL() {
+        nodes->SetVolume_n();
+        if (!Volume_nM1) nodes->SetVolume_nM1();
+      }
+      else {
+        const unsigned long nPoint = geometry_container[iZone][INST_0][MESH_0]->GetnPoint();
+        const unsigned short nDim = geometry_container[iZone][INST_0][MESH_0]->GetnDim();
 
-  // Get if RANS
-  const bool rans = config_container[ZONE_0]->GetKind_Turb_Model() != TURB_MODEL::NONE;
+        // The current volumes of the fine grid follow its coordinates and grid velocities in the dual grid
+        const passivedouble* Volume = GetCheckpointField(iZone, CKPT_DUALGRID) + 2*nPoint*nDim;
+        const passivedouble* Volume_n = IsCheckpointField(iZone, CKPT_VOLUME_N) ? GetCheckpointField(iZone, CKPT_VOLUME_N) : Volume;
+        const passivedouble* Volume_nM1 = IsCheckpointField(iZone, CKPT_VOLUME_NM1) ? GetCheckpointField(iZone, CKPT_VOLUME_NM1) : Volume_n;
 
-  // Get if this is dynamic grid (for unsteady FSI problems)
-  bool dynamic_grid = config_container[ZONE_0]->GetDynamic_Grid();
+        SU2_OMP_PARALLEL {
 
+          SU2_OMP_FOR_STAT(roundUpDiv(nPoint_Local, omp_get_max_threads()))
+          for (unsigned long iPoint_Local = 0; iPoint_Local < nPoint_Local; iPoint_Local++) {
+            nodes->SetVolume(iPoint_Local, Volume_nM1[iPoint_Local]);
+          }
+          END_SU2_OMP_FOR
+
+          //Temporarily must set volume and then set appropriate n, n1, then reset Volume
+          // Order may seem awkward, but look at CPoint::SetVolume_____ functions to understand why
+          // (they copy the whole volume vector, so they are called once and not per point)
+          BEGIN_SU2_OMP_SAFE_GLOBAL_ACCESS {
+            nodes->SetVolume_n();
+            nodes->SetVolume_nM1();
+          }
+          END_SU2_OMP_SAFE_GLOBAL_ACCESS
 
-  /*--- Update the geometry for flows on deforming meshes. ---*/
-  if (dynamic_grid) {
-    CGeometry::UpdateGeometry(geometry_container[ZONE_0][INST_0], config_container[ZONE_0]);
+          SU2_OMP_FOR_STAT(roundUpDiv(nPoint_Local, omp_get_max_threads()))
+          for (unsigned long iPoint_Local = 0; iPoint_Local < nPoint_Local; iPoint_Local++) {
+            nodes->SetVolume(iPoint_Local, Volume_n[iPoint_Local]);
+          }
+          END_SU2_OMP_FOR
 
-    for (auto iMesh = 0u; iMesh <= config_container[ZONE_0]->GetnMGLevels(); iMesh++) {
+          BEGIN_SU2_OMP_SAFE_GLOBAL_ACCESS {
+            nodes->SetVolume_n();
+          }
+          END_SU2_OMP_SAFE_GLOBAL_ACCESS
+        }
+        END_SU2_OMP_PARALLEL
 
-      /*--- Compute the grid velocities on the coarser levels. ---*/
-      if (iMesh) geometry_container[ZONE_0][INST_0][iMesh]->SetRestricted_GridVelocity(geometry_container[ZONE_0][INST_0][iMesh - 1]);
-      else {
-        geometry_container[ZONE_0][INST_0][MESH_0]->InitiateComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], GRID_VELOCITY);
-        geometry_container[ZONE_0][INST_0][MESH_0]->CompleteComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], GRID_VELOCITY);
+        // Restore the coordinates, grid velocities, volumes and normals of all levels as they were saved
+        CopyDualGrid(iZone, true);
       }
     }
+
+    FinalizeFLOW_SOL(iZone);
+    if (rans) FinalizeTURB_SOL(iZone);
+    if (dynamic_grid) FinalizeMESH_SOL(iZone);
   }
 
+  preCICE_ReloadTime = SU2_MPI::Wtime() - StartTime_Reload;
+}
+
+//preCICE: Finalize FLOW reloads
+void CDriver::FinalizeFLOW_SOL(unsigned short iZone) {
+
+  // Get if RANS
+  const bool rans = config_container[iZone]->GetKind_Turb_Model() != TURB_MODEL::NONE;
+
+  /*--- For flows on deforming meshes, the dual grid and the grid velocities of all levels (including halos)
+   are restored from the checkpoint, so the geometry is not updated here. ---*/
+
   /*--- Communicate the loaded solution on the fine grid before we transfer
    it down to the coarse levels. We also call the preprocessing routine
    on the fine level in order to have all necessary quantities updated,
    especially if this is a turbulent simulation (eddy viscosity). ---*/
 
-  solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->InitiateComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION);
-  solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->CompleteComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION);
+  solver_container[iZone][INST_0][MESH_0][FLOW_SOL]->InitiateComms(geometry_container[iZone][INST_0][MESH_0], config_container[iZone], SOLUTION);
+  solver_container[iZone][INST_0][MESH_0][FLOW_SOL]->CompleteComms(geometry_container[iZone][INST_0][MESH_0], config_container[iZone], SOLUTION);
 
   /*--- For turbulent/species simulations the flow preprocessing is done by the turbulence/species solver
    *    after it loads its variables (they are needed to compute flow primitives). In case turbulence and species, the
    *    species solver does all the Pre-/Postprocessing. ---*/
   if (!rans &&
-      config_container[ZONE_0]->GetKind_Species_Model() == SPECIES_MODEL::NONE) {
-    solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->Preprocessing(geometry_container[ZONE_0][INST_0][MESH_0], solver_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], MESH_0, NO_RK_ITER, RUNTIME_FLOW_SYS, false);
+      config_container[iZone]->GetKind_Species_Model() == SPECIES_MODEL::NONE) {
+    solver_container[iZone][INST_0][MESH_0][FLOW_SOL]->Preprocessing(geometry_container[iZone][INST_0][MESH_0], solver_container[iZone][INST_0][MESH_0], config_container[iZone], MESH_0, NO_RK_ITER, RUNTIME_FLOW_SYS, false);
   }
 
     /*--- Interpolate the solution down to the coarse multigrid levels ---*/
 
-  for (auto iMesh = 1u; iMesh <= config_container[ZONE_0]->GetnMGLevels(); iMesh++) {
-    CSolver::MultigridRestriction(*geometry_container[ZONE_0][INST_0][iMesh - 1], solver_container[ZONE_0][INST_0][iMesh - 1][FLOW_SOL]->GetNodes()->GetSolution(),
-                         *geometry_container[ZONE_0][INST_0][iMesh], solver_container[ZONE_0][INST_0][iMesh][FLOW_SOL]->GetNodes()->GetSolution());
-    solver_container[ZONE_0][INST_0][iMesh][FLOW_SOL]->InitiateComms(geometry_container[ZONE_0][INST_0][iMesh], config_container[ZONE_0], SOLUTION);
-    solver_container[ZONE_0][INST_0][iMesh][FLOW_SOL]->CompleteComms(geometry_container[ZONE_0][INST_0][iMesh], config_container[ZONE_0], SOLUTION);
+  for (auto iMesh = 1u; iMesh <= config_container[iZone]->GetnMGLevels(); iMesh++) {
+    CSolver::MultigridRestriction(*geometry_container[iZone][INST_0][iMesh - 1], solver_container[iZone][INST_0][iMesh - 1][FLOW_SOL]->GetNodes()->GetSolution(),
+                         *geometry_container[iZone][INST_0][iMesh], solver_container[iZone][INST_0][iMesh][FLOW_SOL]->GetNodes()->GetSolution());
+    solver_container[iZone][INST_0][iMesh][FLOW_SOL]->InitiateComms(geometry_container[iZone][INST_0][iMesh], config_container[iZone], SOLUTION);
+    solver_container[iZone][INST_0][iMesh][FLOW_SOL]->CompleteComms(geometry_container[iZone][INST_0][iMesh], config_container[iZone], SOLUTION);
 
     if (!rans &&
-        config_container[ZONE_0]->GetKind_Species_Model() == SPECIES_MODEL::NONE) {
-      solver_container[ZONE_0][INST_0][iMesh][FLOW_SOL]->Preprocessing(geometry_container[ZONE_0][INST_0][iMesh], solver_container[ZONE_0][INST_0][iMesh], config_container[ZONE_0], iMesh, NO_RK_ITER, RUNTIME_FLOW_SYS, false);
+        config_container[iZone]->GetKind_Species_Model() == SPECIES_MODEL::NONE) {
+      solver_container[iZone][INST_0][iMesh][FLOW_SOL]->Preprocessing(geometry_container[iZone][INST_0][iMesh], solver_container[iZone][INST_0][iMesh], config_container[iZone], iMesh, NO_RK_ITER, RUNTIME_FLOW_SYS, false);
     }
   }
 }
 
 // preCICE: Finalize TURB reloads
-void CDriver::FinalizeTURB_SOL() {
+void CDriver::FinalizeTURB_SOL(unsigned short iZone) {
   /*--- MPI solution and compute the eddy viscosity ---*/
-  solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->InitiateComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION);
-  solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->CompleteComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION);
+  solver_container[iZone][INST_0][MESH_0][TURB_SOL]->InitiateComms(geometry_container[iZone][INST_0][MESH_0], config_container[iZone], SOLUTION);
+  solver_container[iZone][INST_0][MESH_0][TURB_SOL]->CompleteComms(geometry_container[iZone][INST_0][MESH_0], config_container[iZone], SOLUTION);
 
   /*--- For turbulent+species simulations the solver Pre-/Postprocessing is done by the species/transition solver. ---*/
-  if (config_container[ZONE_0]->GetKind_Species_Model() == SPECIES_MODEL::NONE && config_container[ZONE_0]->GetKind_Trans_Model() == TURB_TRANS_MODEL::NONE) {
-    solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->Preprocessing(geometry_container[ZONE_0][INST_0][MESH_0], solver_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], MESH_0, NO_RK_ITER,
+  if (config_container[iZone]->GetKind_Species_Model() == SPECIES_MODEL::NONE && config_container[iZone]->GetKind_Trans_Model() == TURB_TRANS_MODEL::NONE) {
+    solver_container[iZone][INST_0][MESH_0][FLOW_SOL]->Preprocessing(geometry_container[iZone][INST_0][MESH_0], solver_container[iZone][INST_0][MESH_0], config_container[iZone], MESH_0, NO_RK_ITER,
                                             RUNTIME_FLOW_SYS, false);
-    solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->Postprocessing(geometry_container[ZONE_0][INST_0][MESH_0], solver_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], MESH_0);
+    solver_container[iZone][INST_0][MESH_0][TURB_SOL]->Postprocessing(geometry_container[iZone][INST_0][MESH_0], solver_container[iZone][INST_0][MESH_0], config_container[iZone], MESH_0);
   } else {
     SU2_MPI::Error("Invalid configuration for using implicit coupling! Species and transition models not implemented.", CURRENT_FUNCTION);
     return;
@@ -475,183 +718,823 @@ void CDriver::FinalizeTURB_SOL() {
 
   /*--- Interpolate the solution down to the coarse multigrid levels ---*/
 
-  for (auto iMesh = 1u; iMesh <= config_container[ZONE_0]->GetnMGLevels(); iMesh++) {
-    CSolver::MultigridRestriction(*geometry_container[ZONE_0][INST_0][iMesh - 1], solver_container[ZONE_0][INST_0][iMesh - 1][TURB_SOL]->GetNodes()->GetSolution(),
-                        *geometry_container[ZONE_0][INST_0][iMesh], solver_container[ZONE_0][INST_0][iMesh][TURB_SOL]->GetNodes()->GetSolution());
-    solver_container[ZONE_0][INST_0][iMesh][TURB_SOL]->InitiateComms(geometry_container[ZONE_0][INST_0][iMesh], config_container[ZONE_0], SOLUTION);
-    solver_container[ZONE_0][INST_0][iMesh][TURB_SOL]->CompleteComms(geometry_container[ZONE_0][INST_0][iMesh], config_container[ZONE_0], SOLUTION);
+  for (auto iMesh = 1u; iMesh <= config_container[iZone]->GetnMGLevels(); iMesh++) {
+    CSolver::MultigridRestriction(*geometry_container[iZone][INST_0][iMesh - 1], solver_container[iZone][INST_0][iMesh - 1][TURB_SOL]->GetNodes()->GetSolution(),
+                        *geometry_container[iZone][INST_0][iMesh], solver_container[iZone][INST_0][iMesh][TURB_SOL]->GetNodes()->GetSolution());
+    solver_container[iZone][INST_0][iMesh][TURB_SOL]->InitiateComms(geometry_container[iZone][INST_0][iMesh], config_container[iZone], SOLUTION);
+    solver_container[iZone][INST_0][iMesh][TURB_SOL]->CompleteComms(geometry_container[iZone][INST_0][iMesh], config_container[iZone], SOLUTION);
 
-    if (config_container[ZONE_0]->GetKind_Species_Model() == SPECIES_MODEL::NONE) {
-      solver_container[ZONE_0][INST_0][iMesh][FLOW_SOL]->Preprocessing(geometry_container[ZONE_0][INST_0][iMesh], solver_container[ZONE_0][INST_0][iMesh], config_container[ZONE_0], iMesh, NO_RK_ITER, RUNTIME_FLOW_SYS,
+    if (config_container[iZone]->GetKind_Species_Model() == SPECIES_MODEL::NONE) {
+      solver_container[iZone][INST_0][iMesh][FLOW_SOL]->Preprocessing(geometry_container[iZone][INST_0][iMesh], solver_container[iZone][INST_0][iMesh], config_container[iZone], iMesh, NO_RK_ITER, RUNTIME_FLOW_SYS,
                                             false);
-      solver_container[ZONE_0][INST_0][iMesh][TURB_SOL]->Postprocessing(geometry_container[ZONE_0][INST_0][iMesh], solver_container[ZONE_0][INST_0][iMesh], config_container[ZONE_0], iMesh);
+      solver_container[iZone][INST_0][iMesh][TURB_SOL]->Postprocessing(geometry_container[iZone][INST_0][iMesh], solver_container[iZone][INST_0][iMesh], config_container[iZone], iMesh);
     }
   }
 } 
 
 // preCICE: Finalize MESH reloads
-void CDriver::FinalizeMESH_SOL() {
+void CDriver::FinalizeMESH_SOL(unsigned short iZone) {
 
   // Get the number of solution points and dimension
-  const unsigned long nPoint = geometry_container[ZONE_0][INST_0][MESH_0]->GetnPoint();
-  const unsigned short nDim = geometry_container[ZONE_0][INST_0][MESH_0]->GetnDim();
-  
+  const unsigned long nPoint = geometry_container[iZone][INST_0][MESH_0]->GetnPoint();
+  const unsigned short nDim = geometry_container[iZone][INST_0][MESH_0]->GetnDim();
+
   /*--- Communicate the loaded displacements. ---*/
-  solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->InitiateComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION);
-  solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->CompleteComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION);
+  solver_container[iZone][INST_0][MESH_0][MESH_SOL]->InitiateComms(geometry_container[iZone][INST_0][MESH_0], config_container[iZone], SOLUTION);
+  solver_container[iZone][INST_0][MESH_0][MESH_SOL]->CompleteComms(geometry_container[iZone][INST_0][MESH_0], config_container[iZone], SOLUTION);
+
+  /*--- Init the linear system solution, unless the last solution is kept to warm-start the next deformation. ---*/
+  if (!preCICE_MeshWarmStart) {
+    for (unsigned long iPoint = 0; iPoint < nPoint; ++iPoint) {
+      for (unsigned short iDim = 0; iDim < nDim; ++iDim) {
+        solver_container[iZone][INST_0][MESH_0][MESH_SOL]->LinSysSol(iPoint, iDim) = solver_container[iZone][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution(iPoint, iDim);
+      }
+    }
+  }
 
-  /*--- Init the linear system solution. ---*/
-  for (unsigned long iPoint = 0; iPoint < nPoint; ++iPoint) {
-    for (unsigned short iDim = 0; iDim < nDim; ++iDim) {
-      solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->LinSysSol(iPoint, iDim) = solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution(iPoint, iDim);
+  /*--- The grid velocities of all levels are restored with the dual grid, and the displacements at time n
+   and n-1 are not modified between a checkpoint and its reload, so they are not recomputed here. ---*/
+
+  /*--- A warm-started deformation keeps the boundary displacements of the last coupling iterate, which its
+   linear system solution satisfies, so the next displacements are compared against and skipped relative to them. ---*/
+  if (preCICE_MeshWarmStart) return;
+
+  /*--- Store the boundary displacements at the Bound_Disp variable. ---*/
+  for (unsigned short iMarker = 0; iMarker < config_container[iZone]->GetnMarker_All(); iMarker++) {
+
+    if ((config_container[iZone]->GetMarker_All_Deform_Mesh(iMarker) == YES) ||
+        (config_container[iZone]->GetMarker_All_Moving(iMarker) == YES)) {
+
+      for (unsigned long iVertex = 0; iVertex < geometry_container[iZone][INST_0][MESH_0]->nVertex[iMarker]; iVertex++) {
+
+        /*--- Get node index. ---*/
+        auto iNode = geometry_container[iZone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+
+        /*--- Set boundary solution. ---*/
+        solver_container[iZone][INST_0][MESH_0][MESH_SOL]->GetNodes()->SetBound_Disp(iNode, solver_container[iZone][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution(iNode));
+      }
     }
   }
 
-  /*--- For time-domain problems, we need to compute the grid velocities. ---*/
-  
-  /*--- Update the old geometry (coordinates n and n-1) ---*/
-  //Only relevant functions from RestartOldGeometry pasted below
-  solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->InitiateComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION_TIME_N);
-  solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->CompleteComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION_TIME_N);
-  
-  solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->InitiateComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION_TIME_N1);
-  solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->CompleteComms(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0], SOLUTION_TIME_N1);
+}
+
+// preCICE:
+void CDriver::SaveOldState() {
 
+  const passivedouble StartTime_Save = SU2_MPI::Wtime();
 
-  /*--- Once Displacement_n and Displacement_n1 are filled we can compute the Grid Velocity ---*/
-  /*--- Compute the velocity of each node. ---*/
+  // Instantiate the checkpoint if it isn't already
+  if (preCICE_Checkpoint == nullptr) AllocateCheckpoint();
 
-  const bool firstOrder = config_container[ZONE_0]->GetTime_Marching() == TIME_MARCHING::DT_STEPPING_1ST;
-  const bool secondOrder = config_container[ZONE_0]->GetTime_Marching() == TIME_MARCHING::DT_STEPPING_2ND;
-  const su2double invTimeStep = 1.0 / config_container[ZONE_0]->GetDelta_UnstTimeND();
+  for (unsigned short iZone = 0; iZone < nZone; iZone++) {
 
-  //SU2_OMP_FOR_STAT(omp_chunk_size) - omp_chunk_size part of CMeshSolver
-  for (unsigned long iPoint = 0; iPoint < nPoint; iPoint++) {
+    // Only the points of this rank (nPointDomain) are saved, halos are recovered with communications on reload.
+    const unsigned long nPoint_Local = geometry_container[iZone][INST_0][MESH_0]->GetnPointDomain();
 
-    /*--- Coordinates of the current point at n+1, n, & n-1 time levels. ---*/
+    // Get if RANS
+    const bool rans = config_container[iZone]->GetKind_Turb_Model() != TURB_MODEL::NONE;
 
-    const su2double* Disp_nM1 = solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution_time_n1(iPoint);
-    const su2double* Disp_n   = solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution_time_n(iPoint);
-    const su2double* Disp_nP1 = solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution(iPoint);
+    // Get if this is dynamic grid (for unsteady FSI problems)
+    const bool dynamic_grid = config_container[iZone]->GetDynamic_Grid();
 
-    /*--- Compute mesh velocity for this point with 1st or 2nd-order approximation. ---*/
+    // Save all necessary variables to reload state with block copies of the solution containers
+    CVariable* FLOW_nodes = solver_container[iZone][INST_0][MESH_0][FLOW_SOL]->GetNodes();
+    SaveRows_preCICE(nPoint_Local, FLOW_nodes->GetSolution(), GetCheckpointField(iZone, CKPT_FLOW));
+    if (IsCheckpointField(iZone, CKPT_FLOW_N)) SaveRows_preCICE(nPoint_Local, FLOW_nodes->GetSolution_time_n(), GetCheckpointField(iZone, CKPT_FLOW_N));
+    if (IsCheckpointField(iZone, CKPT_FLOW_N1)) SaveRows_preCICE(nPoint_Local, FLOW_nodes->GetSolution_time_n1(), GetCheckpointField(iZone, CKPT_FLOW_N1));
 
-    for (unsigned short iDim = 0; iDim < nDim; iDim++) {
+    if (rans) {
+      CVariable* TURB_nodes = solver_container[iZone][INST_0][MESH_0][TURB_SOL]->GetNodes();
+      SaveRows_preCICE(nPoint_Local, TURB_nodes->GetSolution(), GetCheckpointField(iZone, CKPT_TURB));
+      if (IsCheckpointField(iZone, CKPT_TURB_N)) SaveRows_preCICE(nPoint_Local, TURB_nodes->GetSolution_time_n(), GetCheckpointField(iZone, CKPT_TURB_N));
+      if (IsCheckpointField(iZone, CKPT_TURB_N1)) SaveRows_preCICE(nPoint_Local, TURB_nodes->GetSolution_time_n1(), GetCheckpointField(iZone, CKPT_TURB_N1));
+    }
 
-      su2double GridVel = 0.0;
-      if (firstOrder)
-        GridVel = (Disp_nP1[iDim] - Disp_n[iDim]) * invTimeStep;
-      else if (secondOrder)
-        GridVel = (1.5*Disp_nP1[iDim] - 2.0*Disp_n[iDim] + 0.5*Disp_nM1[iDim]) * invTimeStep;
+    if (dynamic_grid) {
+      CVariable* MESH_nodes = solver_container[iZone][INST_0][MESH_0][MESH_SOL]->GetNodes();
+      SaveRows_preCICE(nPoint_Local, MESH_nodes->GetSolution(), GetCheckpointField(iZone, CKPT_MESH));
+      if (IsCheckpointField(iZone, CKPT_MESH_N)) SaveRows_preCICE(nPoint_Local, MESH_nodes->GetSolution_time_n(), GetCheckpointField(iZone, CKPT_MESH_N));
+      if (IsCheckpointField(iZone, CKPT_MESH_N1)) SaveRows_preCICE(nPoint_Local, MESH_nodes->GetSolution_time_n1(), GetCheckpointField(iZone, CKPT_MESH_N1));
+
+      CPoint* nodes = geometry_container[iZone][INST_0][MESH_0]->nodes;
+
+      passivedouble* Volume_n = IsCheckpointField(iZone, CKPT_VOLUME_N) ? GetCheckpointField(iZone, CKPT_VOLUME_N) : nullptr;
+      passivedouble* Volume_nM1 = IsCheckpointField(iZone, CKPT_VOLUME_NM1) ? GetCheckpointField(iZone, CKPT_VOLUME_NM1) : nullptr;
+
+      if (Volume_n || Volume_nM1) {
+        SU2_OMP_PARALLEL {
+          SU2_OMP_FOR_STAT(roundUpDiv(nPoint_Local, omp_get_max_threads()))
+          for (unsigned long iPoint_Local = 0; iPoint_Local < nPoint_Local; iPoint_Local++) {
+            if (Volume_n) Volume_n[iPoint_Local] = SU2_TYPE::GetValue(nodes->GetVolume_n(iPoint_Local));
+            if (Volume_nM1) Volume_nM1[iPoint_Local] = SU2_TYPE::GetValue(nodes->GetVolume_nM1(iPoint_Local));
+          }
+          END_SU2_OMP_FOR
+        }
+        END_SU2_OMP_PARALLEL
+      }
 
-      geometry_container[ZONE_0][INST_0][MESH_0]->nodes->SetGridVel(iPoint, iDim, GridVel);
+      // Save the derived geometry so that it does not have to be recomputed on reload (full storage only)
+      if (IsCheckpointField(iZone, CKPT_DUALGRID)) CopyDualGrid(iZone, false);
     }
   }
-  //END_SU2_OMP_FOR
 
-  for (auto iMGlevel = 1u; iMGlevel <= config_container[ZONE_0]->GetnMGLevels(); iMGlevel++)
-    geometry_container[ZONE_0][INST_0][iMGlevel]->SetRestricted_GridVelocity(geometry_container[ZONE_0][INST_0][iMGlevel-1]);
+#ifdef __linux__
+  // A mapped checkpoint is only read back on a rejected iteration, so its pages are handed to the
+  // page cache (written back to the scratch file as needed) rather than kept in the resident memory.
+  if (preCICE_CheckpointMap != nullptr) {
+    msync(preCICE_CheckpointMap, GetCheckpointBytes(), MS_ASYNC);
+    madvise(preCICE_CheckpointMap, GetCheckpointBytes(), MADV_DONTNEED);
+  }
+#endif
 
+  preCICE_SaveTime = SU2_MPI::Wtime() - StartTime_Save;
+}
 
+// preCICE:
+void CDriver::PredictSolution(passivedouble c_n, passivedouble c_n1, passivedouble c_n2, bool keepHistory) {
+
+  const passivedouble coefficients[3] = {c_n, c_n1, c_n2};
+  const bool quadratic = (c_n2 != 0.0);
+
+  // Solutions of this rank at time n-2: FLOW, TURB (RANS) and MESH (dynamic grid) of each zone after the other
+  auto nValues = [&](unsigned short iZone, unsigned short iSol) -> unsigned long {
+    return geometry_container[iZone][INST_0][MESH_0]->GetnPointDomain() * solver_container[iZone][INST_0][MESH_0][iSol]->GetnVar();
+  };
+  unsigned long historySize = 0;
+  for (unsigned short iZone = 0; iZone < nZone; iZone++) {
+    historySize += nValues(iZone, FLOW_SOL);
+    if (config_container[iZone]->GetKind_Turb_Model() != TURB_MODEL::NONE) historySize += nValues(iZone, TURB_SOL);
+    if (config_container[iZone]->GetDynamic_Grid()) historySize += nValues(iZone, MESH_SOL);
+  }
+  if (quadratic && preCICE_PredictorHistory.size() != historySize) {
+    SU2_MPI::Error("No solution at time n-2, the previous prediction must keep its history.", CURRENT_FUNCTION);
+  }
 
-  /*--- Store the boundary displacements at the Bound_Disp variable. ---*/
-  for (unsigned short iMarker = 0; iMarker < config_container[ZONE_0]->GetnMarker_All(); iMarker++) {
+  // Each field of the history is read before it is overwritten with the next one
+  if (keepHistory && preCICE_PredictorHistory.size() != historySize) preCICE_PredictorHistory.assign(historySize, 0.0);
 
-    if ((config_container[ZONE_0]->GetMarker_All_Deform_Mesh(iMarker) == YES) ||
-        (config_container[ZONE_0]->GetMarker_All_Moving(iMarker) == YES)) {
+  unsigned long offset = 0;
+  auto Predict = [&](unsigned short iZone, unsigned short iSol, bool keepSign) {
+    const unsigned long nPoint_Local = geometry_container[iZone][INST_0][MESH_0]->GetnPointDomain();
+    CVariable* nodes = solver_container[iZone][INST_0][MESH_0][iSol]->GetNodes();
 
-      for (unsigned long iVertex = 0; iVertex < geometry_container[ZONE_0][INST_0][MESH_0]->nVertex[iMarker]; iVertex++) {
+    const passivedouble* time_n2 = (quadratic) ? &preCICE_PredictorHistory[offset] : nullptr;
+    ExtrapolateRows_preCICE(nPoint_Local, coefficients, nodes->GetSolution_time_n(), nodes->GetSolution_time_n1(),
+                            time_n2, keepSign, nodes->GetSolution());
+    if (keepHistory) SaveRows_preCICE(nPoint_Local, nodes->GetSolution_time_n1(), &preCICE_PredictorHistory[offset]);
 
-        /*--- Get node index. ---*/
-        auto iNode = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+    offset += nValues(iZone, iSol);
+  };
 
-        /*--- Set boundary solution. ---*/
-        solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->SetBound_Disp(iNode, solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution(iNode));
+  for (unsigned short iZone = 0; iZone < nZone; iZone++) {
+
+    // Get if RANS
+    const bool rans = config_container[iZone]->GetKind_Turb_Model() != TURB_MODEL::NONE;
+
+    // Get if this is dynamic grid (for unsteady FSI problems)
+    const bool dynamic_grid = config_container[iZone]->GetDynamic_Grid();
+
+    Predict(iZone, FLOW_SOL, false);
+    if (rans) Predict(iZone, TURB_SOL, true);
+    if (dynamic_grid) Predict(iZone, MESH_SOL, false);
+
+    // The predicted solutions are completed as reloaded ones: communications, primitives and coarse levels
+    FinalizeFLOW_SOL(iZone);
+    if (rans) FinalizeTURB_SOL(iZone);
+
+    // The mesh deformation starts from the predicted displacements. FinalizeMESH_SOL is not used, as it would
+    // replace the boundary displacements read from preCICE.
+    if (dynamic_grid) {
+      CSolver* MESH_solver = solver_container[iZone][INST_0][MESH_0][MESH_SOL];
+      MESH_solver->InitiateComms(geometry_container[iZone][INST_0][MESH_0], config_container[iZone], SOLUTION);
+      MESH_solver->CompleteComms(geometry_container[iZone][INST_0][MESH_0], config_container[iZone], SOLUTION);
+
+      const unsigned long nPoint = geometry_container[iZone][INST_0][MESH_0]->GetnPoint();
+      const unsigned short nDim = geometry_container[iZone][INST_0][MESH_0]->GetnDim();
+      for (unsigned long iPoint = 0; iPoint < nPoint; ++iPoint) {
+        for (unsigned short iDim = 0; iDim < nDim; ++iDim) {
+          MESH_solver->LinSysSol(iPoint, iDim) = MESH_solver->GetNodes()->GetSolution(iPoint, iDim);
+        }
       }
     }
   }
 
+  if (!keepHistory) vector<passivedouble>().swap(preCICE_PredictorHistory);
 }
 
 // preCICE:
-void CDriver::SaveOldState() {
+void CDriver::SetCheckpointStorage(string storage, string scratchDir) {
 
-  // Get the number of solution variables, points, and dimension
-  // Problem: am looping through global number of points and indexing as such. Not local.
-  const unsigned short nVar = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetnVar();
-  const unsigned long nPoint_Local = geometry_container[ZONE_0][INST_0][MESH_0]->GetnPointDomain();
-  const unsigned short nDim = geometry_container[ZONE_0][INST_0][MESH_0]->GetnDim();
-  
-  // Get if RANS
-  const bool rans = config_container[ZONE_0]->GetKind_Turb_Model() != TURB_MODEL::NONE;
-  const unsigned short TURB_nVar = (rans) ? solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->GetnVar() : 0;
-
-  // Get if this is dynamic grid (for unsteady FSI problems)
-  const bool dynamic_grid = config_container[ZONE_0]->GetDynamic_Grid();
-  const unsigned short MESH_nVar = (dynamic_grid) ? solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetnVar() : 0;
-  
-  // Instantiate all required member variables if they aren't already
-  if (preCICE_Solution.empty()) preCICE_Solution.resize(nPoint_Local, nVar) = su2double(0.0);
-  if (preCICE_Solution_time_n.empty()) preCICE_Solution_time_n.resize(nPoint_Local,nVar) = su2double(0.0);
-  if (preCICE_Solution_time_n1.empty()) preCICE_Solution_time_n1.resize(nPoint_Local,nVar) = su2double(0.0);
-
-  if (rans) {
-    if (preCICE_TURB_Solution.empty()) preCICE_TURB_Solution.resize(nPoint_Local,TURB_nVar) = su2double(0.0);
-    if (preCICE_TURB_Solution_time_n.empty()) preCICE_TURB_Solution_time_n.resize(nPoint_Local,TURB_nVar) = su2double(0.0);
-    if (preCICE_TURB_Solution_time_n1.empty()) preCICE_TURB_Solution_time_n1.resize(nPoint_Local,TURB_nVar) = su2double(0.0);
-  }
-
-  if (dynamic_grid) {
-    if (preCICE_MESH_Solution.empty()) preCICE_MESH_Solution.resize(nPoint_Local,MESH_nVar) = su2double(0.0);
-    if (preCICE_MESH_Solution_time_n.empty()) preCICE_MESH_Solution_time_n.resize(nPoint_Local,MESH_nVar) = su2double(0.0);
-    if (preCICE_MESH_Solution_time_n1.empty()) preCICE_MESH_Solution_time_n1.resize(nPoint_Local,MESH_nVar) = su2double(0.0);
-  
-
-    if (preCICE_Coord.empty()) preCICE_Coord.resize(nPoint_Local, nDim) = su2double(0.0);
-    if (preCICE_GridVel.empty()) preCICE_GridVel.resize(nPoint_Local,nDim) = su2double(0.0);
-    if (preCICE_Volume.empty()) preCICE_Volume.resize(nPoint_Local) = su2double(0.0);
-    if (preCICE_Volume_n.empty()) preCICE_Volume_n.resize(nPoint_Local) = su2double(0.0);
-    if (preCICE_Volume_nM1.empty()) preCICE_Volume_nM1.resize(nPoint_Local) = su2double(0.0);
-  }
-
-
-  // Loop through everything and save all necessary variables to reload state
-  for (unsigned long iPoint_Local = 0; iPoint_Local < nPoint_Local; iPoint_Local++) {
-    
-    for (unsigned short iVar = 0; iVar < nVar; iVar++) {
-      preCICE_Solution(iPoint_Local, iVar) = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetSolution(iPoint_Local, iVar);
-      preCICE_Solution_time_n(iPoint_Local, iVar) = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetSolution_time_n(iPoint_Local, iVar);
-      preCICE_Solution_time_n1(iPoint_Local, iVar) = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetSolution_time_n1(iPoint_Local, iVar);
+  ReleaseOldState();
+
+  if (storage == "FULL") preCICE_CheckpointStorage = CKPT_STORAGE_FULL;
+  else if (storage == "REDUCED") preCICE_CheckpointStorage = CKPT_STORAGE_REDUCED;
+  else if (storage == "MAPPED") preCICE_CheckpointStorage = CKPT_STORAGE_MAPPED;
+  else SU2_MPI::Error("Unknown checkpoint storage " + storage + ", use FULL, REDUCED or MAPPED.", CURRENT_FUNCTION);
+
+  preCICE_CheckpointDir = scratchDir;
+}
+
+// preCICE:
+void CDriver::AllocateCheckpoint() {
+
+  // The fields of each zone follow those of the previous zone
+  preCICE_FieldSize.assign(nZone*CKPT_NFIELDS, 0);
+  preCICE_FieldOffset.assign(nZone*CKPT_NFIELDS, 0);
+
+  for (unsigned short iZone = 0; iZone < nZone; iZone++) {
+
+    if (solver_container[iZone][INST_0][MESH_0][FLOW_SOL] == nullptr) {
+      SU2_MPI::Error("Zone " + to_string(iZone) + " has no flow solver, only fluid zones can be checkpointed.", CURRENT_FUNCTION);
     }
 
-    if (rans) {
-      for (unsigned short TURB_iVar = 0; TURB_iVar < TURB_nVar; TURB_iVar++) {
-        preCICE_TURB_Solution(iPoint_Local, TURB_iVar) = solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->GetNodes()->GetSolution(iPoint_Local, TURB_iVar);
-        preCICE_TURB_Solution_time_n(iPoint_Local, TURB_iVar) = solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->GetNodes()->GetSolution_time_n(iPoint_Local, TURB_iVar);
-        preCICE_TURB_Solution_time_n1(iPoint_Local, TURB_iVar) = solver_container[ZONE_0][INST_0][MESH_0][TURB_SOL]->GetNodes()->GetSolution_time_n1(iPoint_Local, TURB_iVar);
-      }
+    const unsigned long nPoint_Local = geometry_container[iZone][INST_0][MESH_0]->GetnPointDomain();
+    const unsigned short nVar = solver_container[iZone][INST_0][MESH_0][FLOW_SOL]->GetnVar();
+
+    // Get if RANS
+    const bool rans = config_container[iZone]->GetKind_Turb_Model() != TURB_MODEL::NONE;
+    const unsigned short TURB_nVar = (rans) ? solver_container[iZone][INST_0][MESH_0][TURB_SOL]->GetnVar() : 0;
+
+    // Get if this is dynamic grid (for unsteady FSI problems)
+    const bool dynamic_grid = config_container[iZone]->GetDynamic_Grid();
+    const unsigned short MESH_nVar = (dynamic_grid) ? solver_container[iZone][INST_0][MESH_0][MESH_SOL]->GetnVar() : 0;
+
+    // Time level n equals the current level at a checkpoint (just pushed back in time), and time level n-1
+    // is only used with second order time marching, so in reduced storage they are recovered on reload.
+    const bool reduced = (preCICE_CheckpointStorage != CKPT_STORAGE_FULL);
+    const bool secondOrder = config_container[iZone]->GetTime_Marching() == TIME_MARCHING::DT_STEPPING_2ND;
+    const bool store_n = !reduced;
+    const bool store_n1 = !reduced || secondOrder;
+
+    unsigned long* FieldSize = &preCICE_FieldSize[iZone*CKPT_NFIELDS];
+    FieldSize[CKPT_FLOW] = nPoint_Local * nVar;
+    FieldSize[CKPT_FLOW_N] = (store_n) ? nPoint_Local * nVar : 0;
+    FieldSize[CKPT_FLOW_N1] = (store_n1) ? nPoint_Local * nVar : 0;
+    FieldSize[CKPT_TURB] = nPoint_Local * TURB_nVar;
+    FieldSize[CKPT_TURB_N] = (store_n) ? nPoint_Local * TURB_nVar : 0;
+    FieldSize[CKPT_TURB_N1] = (store_n1) ? nPoint_Local * TURB_nVar : 0;
+    FieldSize[CKPT_MESH] = nPoint_Local * MESH_nVar;
+    FieldSize[CKPT_MESH_N] = (store_n) ? nPoint_Local * MESH_nVar : 0;
+    FieldSize[CKPT_MESH_N1] = (store_n1) ? nPoint_Local * MESH_nVar : 0;
+    FieldSize[CKPT_VOLUME_N] = (dynamic_grid && store_n) ? nPoint_Local : 0;
+    FieldSize[CKPT_VOLUME_NM1] = (dynamic_grid && store_n1) ? nPoint_Local : 0;
+    // The dual grid covers all points and levels, in reduced storage it is recomputed on reload instead
+    FieldSize[CKPT_DUALGRID] = (dynamic_grid && !reduced) ? GetDualGridSize(iZone) : 0;
+  }
+
+  preCICE_CheckpointSize = 0;
+  for (unsigned long iField = 0; iField < preCICE_FieldSize.size(); iField++) {
+    preCICE_FieldOffset[iField] = preCICE_CheckpointSize;
+    preCICE_CheckpointSize += preCICE_FieldSize[iField];
+  }
+
+  if (preCICE_CheckpointStorage != CKPT_STORAGE_MAPPED || preCICE_CheckpointSize == 0) {
+    preCICE_CheckpointHeap.assign(preCICE_CheckpointSize, 0.0);
+    preCICE_Checkpoint = preCICE_CheckpointHeap.data();
+    return;
+  }
+
+#if defined(__unix__) || defined(__APPLE__)
+  // The scratch file is unlinked right after being mapped, it is removed by the system when the mapping is released.
+  string fileName = preCICE_CheckpointDir + "/SU2_preCICE_checkpoint_XXXXXX";
+  const int fd = mkstemp(&fileName[0]);
+  if (fd < 0 || ftruncate(fd, GetCheckpointBytes()) != 0) {
+    SU2_MPI::Error("Could not create the checkpoint scratch file in " + preCICE_CheckpointDir + ".", CURRENT_FUNCTION);
+  }
+
+  void* map = mmap(nullptr, GetCheckpointBytes(), PROT_READ | PROT_WRITE, MAP_SHARED, fd, 0);
+  unlink(fileName.c_str());
+  close(fd);
+
+  if (map == MAP_FAILED) {
+    SU2_MPI::Error("Could not map the checkpoint scratch file in " + preCICE_CheckpointDir + ".", CURRENT_FUNCTION);
+  }
+  preCICE_CheckpointMap = map;
+  preCICE_Checkpoint = static_cast<passivedouble*>(map);
+#else
+  SU2_MPI::Error("MAPPED checkpoint storage is not available on this platform.", CURRENT_FUNCTION);
+#endif
+}
+
+// preCICE:
+unsigned long CDriver::GetDualGridSize(unsigned short iZone) const {
+
+  const unsigned short nDim = geometry_container[iZone][INST_0][MESH_0]->GetnDim();
+
+  // Maximum lengths of the fine grid
+  unsigned long nValues = geometry_container[iZone][INST_0][MESH_0]->GetnPoint();
+
+  for (auto iMesh = 0u; iMesh <= config_container[iZone]->GetnMGLevels(); iMesh++) {
+    const CGeometry* geometry = geometry_container[iZone][INST_0][iMesh];
+
+    // Coordinates, grid velocities and volumes, edge normals, and boundary vertex normals
+    nValues += geometry->GetnPoint() * (2*nDim + 1) + geometry->GetnEdge() * nDim;
+    for (unsigned short iMarker = 0; iMarker < geometry->GetnMarker(); iMarker++) {
+      nValues += geometry->nVertex[iMarker] * nDim;
     }
+  }
+  return nValues;
+}
 
-    if (dynamic_grid) {
-      for (unsigned short MESH_iVar = 0; MESH_iVar < MESH_nVar; MESH_iVar++) {
-        preCICE_MESH_Solution(iPoint_Local, MESH_iVar) = solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution(iPoint_Local, MESH_iVar);
-        preCICE_MESH_Solution_time_n(iPoint_Local, MESH_iVar) = solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution_time_n(iPoint_Local, MESH_iVar);
-        preCICE_MESH_Solution_time_n1(iPoint_Local, MESH_iVar) = solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->GetSolution_time_n1(iPoint_Local, MESH_iVar);
+// preCICE:
+void CDriver::CopyDualGrid(unsigned short iZone, bool reload) {
+
+  const unsigned short nDim = geometry_container[iZone][INST_0][MESH_0]->GetnDim();
+  passivedouble* DualGrid = GetCheckpointField(iZone, CKPT_DUALGRID);
+
+  // Copy nRows rows of nCols values between the geometry and the next block of the dual grid,
+  // with Save(iRow, row) and Load(iRow, row) moving one row (point, edge or vertex).
+  auto Copy = [&](unsigned long nRows, unsigned short nCols, const auto& Save, const auto& Load) {
+    if (nRows == 0) return;
+    SU2_OMP_PARALLEL {
+      SU2_OMP_FOR_STAT(roundUpDiv(nRows, omp_get_max_threads()))
+      for (unsigned long iRow = 0; iRow < nRows; iRow++) {
+        if (reload) Load(iRow, DualGrid + iRow*nCols);
+        else Save(iRow, DualGrid + iRow*nCols);
       }
+      END_SU2_OMP_FOR
+    }
+    END_SU2_OMP_PARALLEL
+    DualGrid += nRows*nCols;
+  };
+
+  for (auto iMesh = 0u; iMesh <= config_container[iZone]->GetnMGLevels(); iMesh++) {
+    CGeometry* geometry = geometry_container[iZone][INST_0][iMesh];
+    CPoint* nodes = geometry->nodes;
+    const unsigned long nPoint = geometry->GetnPoint();
+
+    Copy(nPoint, nDim,
+      [&](unsigned long iPoint, passivedouble* row) {
+        for (unsigned short iDim = 0; iDim < nDim; iDim++) row[iDim] = SU2_TYPE::GetValue(nodes->GetCoord(iPoint, iDim));
+      },
+      [&](unsigned long iPoint, const passivedouble* row) {
+        for (unsigned short iDim = 0; iDim < nDim; iDim++) nodes->SetCoord(iPoint, iDim, row[iDim]);
+      });
+
+    Copy(nPoint, nDim,
+      [&](unsigned long iPoint, passivedouble* row) {
+        for (unsigned short iDim = 0; iDim < nDim; iDim++) row[iDim] = SU2_TYPE::GetValue(nodes->GetGridVel(iPoint)[iDim]);
+      },
+      [&](unsigned long iPoint, const passivedouble* row) {
+        for (unsigned short iDim = 0; iDim < nDim; iDim++) nodes->SetGridVel(iPoint, iDim, row[iDim]);
+      });
+
+    Copy(nPoint, 1,
+      [&](unsigned long iPoint, passivedouble* row) { row[0] = SU2_TYPE::GetValue(nodes->GetVolume(iPoint)); },
+      [&](unsigned long iPoint, const passivedouble* row) { nodes->SetVolume(iPoint, row[0]); });
+
+    Copy(geometry->GetnEdge(), nDim,
+      [&](unsigned long iEdge, passivedouble* row) {
+        for (unsigned short iDim = 0; iDim < nDim; iDim++) row[iDim] = SU2_TYPE::GetValue(geometry->edges->GetNormal(iEdge)[iDim]);
+      },
+      [&](unsigned long iEdge, const passivedouble* row) { geometry->edges->SetNormal(iEdge, row); });
+
+    for (unsigned short iMarker = 0; iMarker < geometry->GetnMarker(); iMarker++) {
+      Copy(geometry->nVertex[iMarker], nDim,
+        [&](unsigned long iVertex, passivedouble* row) {
+          for (unsigned short iDim = 0; iDim < nDim; iDim++) row[iDim] = SU2_TYPE::GetValue(geometry->vertex[iMarker][iVertex]->GetNormal(iDim));
+        },
+        [&](unsigned long iVertex, const passivedouble* row) {
+          su2double* Normal = geometry->vertex[iMarker][iVertex]->GetNormal();
+          for (unsigned short iDim = 0; iDim < nDim; iDim++) Normal[iDim] = row[iDim];
+        });
+    }
 
+    if (iMesh == MESH_0) {
+      Copy(nPoint, 1,
+        [&](unsigned long iPoint, passivedouble* row) { row[0] = SU2_TYPE::GetValue(nodes->GetMaxLength(iPoint)); },
+        [&](unsigned long iPoint, const passivedouble* row) { nodes->SetMaxLength(iPoint, row[0]); });
+    }
+  }
+}
+
+// preCICE:
+void CDriver::RecomputeDualGrid(unsigned short iZone) {
 
+  CGeometry** geometry = geometry_container[iZone][INST_0];
+  CPoint* nodes = geometry[MESH_0]->nodes;
+  const CVariable* MESH_nodes = solver_container[iZone][INST_0][MESH_0][MESH_SOL]->GetNodes();
+
+  const unsigned long nPoint_Local = geometry[MESH_0]->GetnPointDomain();
+  const unsigned short nDim = geometry[MESH_0]->GetnDim();
+
+  /*--- The coordinates are the reference ones displaced by the reloaded mesh solution (halos are communicated). ---*/
+  SU2_OMP_PARALLEL {
+    SU2_OMP_FOR_STAT(roundUpDiv(nPoint_Local, omp_get_max_threads()))
+    for (unsigned long iPoint = 0; iPoint < nPoint_Local; iPoint++) {
       for (unsigned short iDim = 0; iDim < nDim; iDim++) {
-        preCICE_Coord(iPoint_Local,iDim) = geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetCoord(iPoint_Local,iDim);
-        preCICE_GridVel(iPoint_Local, iDim) = geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetGridVel(iPoint_Local)[iDim];
+        nodes->SetCoord(iPoint, iDim, MESH_nodes->GetMesh_Coord(iPoint, iDim) + MESH_nodes->GetSolution(iPoint, iDim));
       }
-      
-      preCICE_Volume(iPoint_Local) = geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetVolume(iPoint_Local);
-      preCICE_Volume_n(iPoint_Local) = geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetVolume_n(iPoint_Local);
-      preCICE_Volume_nM1(iPoint_Local) = geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetVolume_nM1(iPoint_Local);
     }
+    END_SU2_OMP_FOR
+  }
+  END_SU2_OMP_PARALLEL
+
+  /*--- Volumes, normals and maximum lengths of all levels, and the coordinates of the coarse levels. The grid
+   velocities are not recomputed, the mesh deformation of the next time iteration sets them before they are used. ---*/
+  CGeometry::UpdateGeometry(geometry, config_container[iZone]);
+}
+
+// preCICE:
+void CDriver::ReleaseOldState() {
+
+#if defined(__unix__) || defined(__APPLE__)
+  if (preCICE_CheckpointMap != nullptr) munmap(preCICE_CheckpointMap, GetCheckpointBytes());
+#endif
+  preCICE_CheckpointMap = nullptr;
+
+  vector<passivedouble>().swap(preCICE_CheckpointHeap);
+  preCICE_Checkpoint = nullptr;
+  preCICE_CheckpointSize = 0;
+}
+
+// preCICE:
+void CDriver::WriteCheckpointSnapshot(string fileName, unsigned long timeIter) const {
+
+  if (preCICE_Checkpoint == nullptr) {
+    SU2_MPI::Error("No checkpoint to write, SaveOldState must be called first.", CURRENT_FUNCTION);
+  }
+
+  ofstream snapshot(fileName, ios::binary | ios::trunc);
+  const unsigned long header[SNAPSHOT_HEADER] = {SNAPSHOT_ID, timeIter, preCICE_FieldSize.size()};
+  snapshot.write(reinterpret_cast<const char*>(header), sizeof(header));
+  snapshot.write(reinterpret_cast<const char*>(preCICE_FieldSize.data()), preCICE_FieldSize.size() * sizeof(unsigned long));
+  snapshot.write(reinterpret_cast<const char*>(preCICE_Checkpoint), GetCheckpointBytes());
+
+  if (!snapshot) {
+    SU2_MPI::Error("Could not write the checkpoint snapshot " + fileName + ".", CURRENT_FUNCTION);
   }
 }
 
+// preCICE:
+unsigned long CDriver::LoadCheckpointSnapshot(string fileName) {
+
+#if defined(__unix__) || defined(__APPLE__)
+  // Lay out the checkpoint of this rank, the snapshot must match it field by field
+  ReleaseOldState();
+  AllocateCheckpoint();
+
+  const unsigned long nFields = preCICE_FieldSize.size();
+  const unsigned long headerBytes = (SNAPSHOT_HEADER + nFields) * sizeof(unsigned long);
+
+  const int fd = open(fileName.c_str(), O_RDONLY);
+  struct stat fileStat;
+  if (fd < 0 || fstat(fd, &fileStat) != 0) {
+    SU2_MPI::Error("Could not open the checkpoint snapshot " + fileName + ".", CURRENT_FUNCTION);
+  }
+  const unsigned long fileBytes = fileStat.st_size;
+
+  void* map = (fileBytes >= headerBytes) ? mmap(nullptr, fileBytes, PROT_READ, MAP_PRIVATE, fd, 0) : MAP_FAILED;
+  close(fd);
+  if (map == MAP_FAILED) {
+    SU2_MPI::Error("Could not map the checkpoint snapshot " + fileName + ".", CURRENT_FUNCTION);
+  }
+
+  const auto* header = static_cast<const unsigned long*>(map);
+  const unsigned long timeIter = header[1];
+  bool match = (header[0] == SNAPSHOT_ID) && (header[2] == nFields) && (fileBytes == headerBytes + GetCheckpointBytes());
+  for (unsigned long iField = 0; match && iField < nFields; iField++) {
+    match = (header[SNAPSHOT_HEADER + iField] == preCICE_FieldSize[iField]);
+  }
+  if (!match) {
+    munmap(map, fileBytes);
+    SU2_MPI::Error("The checkpoint snapshot " + fileName + " does not match the zones, mesh partition, solvers or "
+                   "checkpoint storage of this run.", CURRENT_FUNCTION);
+  }
+
+  // The pages of the snapshot are read on demand by the block copy, one block per OpenMP thread
+  const auto* values = reinterpret_cast<const passivedouble*>(static_cast<const char*>(map) + headerBytes);
+  passivedouble* checkpoint = preCICE_Checkpoint;
+  const unsigned long nValues = preCICE_CheckpointSize;
+
+  SU2_OMP_PARALLEL {
+    const unsigned long nThreads = omp_get_num_threads();
+    const unsigned long thread = omp_get_thread_num();
+    const unsigned long end = (nValues * (thread + 1)) / nThreads;
+
+    for (unsigned long i = (nValues * thread) / nThreads; i < end; i++) checkpoint[i] = values[i];
+  }
+  END_SU2_OMP_PARALLEL
+
+  munmap(map, fileBytes);
+  return timeIter;
+#else
+  SU2_MPI::Error("Checkpoint snapshots are not available on this platform.", CURRENT_FUNCTION);
+  return 0;
+#endif
+}
+
+///////////////////////////////////////////////////////////////////////////////
+/* Bulk marker data exchange for preCICE                                     */
+/* Buffers are caller-owned, contiguous NumPy arrays passed by address, and  */
+/* hold the physical vertices of the marker in increasing vertex order.      */
+///////////////////////////////////////////////////////////////////////////////
+
+// preCICE:
+void CDriver::CheckMarkerBufferSize(unsigned short iMarker, unsigned short nValuesPerVertex, unsigned long bufferSize) const {
+
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+
+  unsigned long nVertex_Phys = 0;
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    if (geometry->nodes->GetDomain(geometry->vertex[iMarker][iVertex]->GetNode())) nVertex_Phys++;
+  }
+
+  if (nVertex_Phys * nValuesPerVertex != bufferSize) {
+    SU2_MPI::Error("Buffer size does not match the number of physical vertices on marker " +
+                   config_container[preCICE_Zone]->GetMarker_All_TagBound(iMarker) + ".", CURRENT_FUNCTION);
+  }
+}
+
+// preCICE:
+const CDriver::HeatFluxTable_preCICE& CDriver::GetHeatFluxTable(unsigned short iMarker, bool update) const {
+
+  const CConfig *config = config_container[preCICE_Zone];
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+
+  if (preCICE_HeatFluxTables.size() != nZone) preCICE_HeatFluxTables.resize(nZone);
+  auto& Tables = preCICE_HeatFluxTables[preCICE_Zone];
+  if (Tables.size() != config->GetnMarker_All()) Tables.resize(config->GetnMarker_All());
+  auto& Table = Tables[iMarker];
+
+  // The wall of a static grid never moves, so its table is only built once
+  if (Table.built && !(update && config->GetDynamic_Grid())) return Table;
+
+  const su2double Gamma = config->GetGamma();
+  const su2double Cp = (Gamma / (Gamma - 1.0)) * config->GetGas_ConstantND();
+
+  Table.compressible = (config->GetKind_Regime() == ENUM_REGIME::COMPRESSIBLE);
+  Table.Conductivity_Factor = Cp / config->GetPrandtl_Lam();
+  Table.Heat_Flux_Ref = config->GetHeat_Flux_Ref();
+  Table.Temperature_Ref = config->GetTemperature_Ref();
+
+  Table.Row.assign(geometry->nVertex[iMarker], -1);
+  Table.Point.clear();
+  Table.UnitNormal.clear();
+  Table.Neighbor.clear();
+  Table.Wall_Distance.clear();
+
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    const auto iPoint = geometry->vertex[iMarker][iVertex]->GetNode();
+    if (!geometry->nodes->GetDomain(iPoint)) continue;
+
+    const su2double *Normal = geometry->vertex[iMarker][iVertex]->GetNormal();
+    const su2double Area = GeometryToolbox::Norm(nDim, Normal);
+
+    Table.Row[iVertex] = Table.Point.size();
+    Table.Point.push_back(iPoint);
+    for (unsigned short iDim = 0; iDim < nDim; iDim++) Table.UnitNormal.push_back(Normal[iDim]/Area);
+
+    // Distance of the normal neighbor along the unit normal (the straight distance if the cell is degenerate)
+    const auto jPoint = geometry->vertex[iMarker][iVertex]->GetNormal_Neighbor();
+    const su2double *Coord_i = geometry->nodes->GetCoord(iPoint);
+    const su2double *Coord_j = geometry->nodes->GetCoord(jPoint);
+    su2double Distance = 0.0;
+    for (unsigned short iDim = 0; iDim < nDim; iDim++) Distance += (Coord_j[iDim] - Coord_i[iDim])*Normal[iDim]/Area;
+    Distance = fabs(Distance);
+    if (Distance <= 0.0) Distance = GeometryToolbox::Distance(nDim, Coord_i, Coord_j);
+
+    Table.Neighbor.push_back(jPoint);
+    Table.Wall_Distance.push_back(Distance);
+  }
+
+  Table.built = true;
+  return Table;
+}
+
+// preCICE:
+void CDriver::GetMarkerFlowLoads(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const {
+
+  CheckMarkerBufferSize(iMarker, nDim, bufferSize);
+
+  CSolver *solver = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL];
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+  const bool solid_wall = config_container[preCICE_Zone]->GetSolid_Wall(iMarker);
+
+  auto *FlowLoad = reinterpret_cast<passivedouble*>(bufferAddress);
+
+  unsigned long iBuffer = 0;
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    if (!geometry->nodes->GetDomain(geometry->vertex[iMarker][iVertex]->GetNode())) continue;
+
+    for (unsigned short iDim = 0; iDim < nDim; iDim++) {
+      FlowLoad[iBuffer++] = (solid_wall) ? SU2_TYPE::GetValue(solver->GetVertexTractions(iMarker, iVertex, iDim)) : 0.0;
+    }
+  }
+}
+
+// preCICE:
+void CDriver::SetMarkerMeshDisplacements(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) {
+
+  CheckMarkerBufferSize(iMarker, nDim, bufferSize);
+
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+  CVariable *nodes = solver_container[preCICE_Zone][INST_0][MESH_0][MESH_SOL]->GetNodes();
+
+  const auto *MeshDispl = reinterpret_cast<const passivedouble*>(bufferAddress);
+  su2double Displ[3] = {0.0, 0.0, 0.0};
+
+  unsigned long iBuffer = 0;
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    const auto iPoint = geometry->vertex[iMarker][iVertex]->GetNode();
+    if (!geometry->nodes->GetDomain(iPoint)) continue;
+
+    for (unsigned short iDim = 0; iDim < nDim; iDim++) Displ[iDim] = MeshDispl[iBuffer++];
+
+    nodes->SetBound_Disp(iPoint, Displ);
+  }
+}
+
+// preCICE:
+passivedouble CDriver::GetMarkerDisplacementChange(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const {
+
+  CheckMarkerBufferSize(iMarker, nDim, bufferSize);
+
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+  CVariable *nodes = solver_container[preCICE_Zone][INST_0][MESH_0][MESH_SOL]->GetNodes();
+
+  const auto *MeshDispl = reinterpret_cast<const passivedouble*>(bufferAddress);
+
+  passivedouble maxChange = 0.0;
+  unsigned long iBuffer = 0;
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    const auto iPoint = geometry->vertex[iMarker][iVertex]->GetNode();
+    if (!geometry->nodes->GetDomain(iPoint)) continue;
+
+    for (unsigned short iDim = 0; iDim < nDim; iDim++) {
+      const passivedouble change = fabs(MeshDispl[iBuffer++] - SU2_TYPE::GetValue(nodes->GetBound_Disp(iPoint, iDim)));
+      maxChange = max(maxChange, change);
+    }
+  }
+  return maxChange;
+}
+
+// preCICE:
+void CDriver::GetMarkerTemperatures(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const {
+
+  CheckMarkerBufferSize(iMarker, 1, bufferSize);
+
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+  CVariable *nodes = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->GetNodes();
+
+  const bool compressible = (config_container[preCICE_Zone]->GetKind_Regime() == ENUM_REGIME::COMPRESSIBLE);
+  const su2double Temperature_Ref = config_container[preCICE_Zone]->GetTemperature_Ref();
+
+  auto *WallTemp = reinterpret_cast<passivedouble*>(bufferAddress);
+
+  unsigned long iBuffer = 0;
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    const auto iPoint = geometry->vertex[iMarker][iVertex]->GetNode();
+    if (!geometry->nodes->GetDomain(iPoint)) continue;
+
+    //preCICE: re-dimensionalize before returning
+    WallTemp[iBuffer++] = (compressible) ? SU2_TYPE::GetValue(nodes->GetTemperature(iPoint) * Temperature_Ref) : 0.0;
+  }
+}
+
+// preCICE:
+void CDriver::SetMarkerTemperatures(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) {
+
+  CheckMarkerBufferSize(iMarker, 1, bufferSize);
+
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+  const su2double Temperature_Ref = config_container[preCICE_Zone]->GetTemperature_Ref();
+
+  const auto *WallTemp = reinterpret_cast<const passivedouble*>(bufferAddress);
+
+  bool modified = false;
+  unsigned long iBuffer = 0;
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    if (!geometry->nodes->GetDomain(geometry->vertex[iMarker][iVertex]->GetNode())) continue;
+
+    // preCICE: non-dimensionalize before setting
+    const su2double WallTempND = WallTemp[iBuffer++] / Temperature_Ref;
+    modified = modified || (WallTempND != geometry->GetCustomBoundaryTemperature(iMarker, iVertex));
+    geometry->SetCustomBoundaryTemperature(iMarker, iVertex, WallTempND);
+  }
+  if (modified) preCICE_CustomBCModified[preCICE_Zone][iMarker] = true;
+}
+
+// preCICE:
+void CDriver::GetMarkerNormalHeatFluxes(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const {
+
+  CheckMarkerBufferSize(iMarker, 1, bufferSize);
+
+  const auto& Table = GetHeatFluxTable(iMarker, true);
+  CVariable *nodes = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->GetNodes();
+
+  auto *WallHeatFlux = reinterpret_cast<passivedouble*>(bufferAddress);
+  const unsigned long nVertex_Phys = Table.Point.size();
+
+  if (!Table.compressible) {
+    for (unsigned long iRow = 0; iRow < nVertex_Phys; iRow++) WallHeatFlux[iRow] = 0.0;
+    return;
+  }
+
+  for (unsigned long iRow = 0; iRow < nVertex_Phys; iRow++) {
+    const auto iPoint = Table.Point[iRow];
+    const su2double *UnitNormal = &Table.UnitNormal[iRow*nDim];
+
+    /*Compute wall heat flux (normal to the wall) based on computed temperature gradient*/
+    su2double dTdn = 0.0;
+    for (unsigned short iDim = 0; iDim < nDim; iDim++)
+      dTdn += nodes->GetGradient_Primitive(iPoint, 0, iDim)*UnitNormal[iDim];
+
+    const su2double thermal_conductivity = Table.Conductivity_Factor * nodes->GetLaminarViscosity(iPoint);
+
+    //preCICE: re-dimensionalize before returning
+    WallHeatFlux[iRow] = SU2_TYPE::GetValue(-thermal_conductivity*dTdn * Table.Heat_Flux_Ref);
+  }
+}
+
+// preCICE:
+void CDriver::SetMarkerNormalHeatFluxes(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) {
+
+  CheckMarkerBufferSize(iMarker, 1, bufferSize);
+
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+  const su2double Heat_Flux_Ref = config_container[preCICE_Zone]->GetHeat_Flux_Ref();
+
+  const auto *WallHeatFlux = reinterpret_cast<const passivedouble*>(bufferAddress);
+
+  bool modified = false;
+  unsigned long iBuffer = 0;
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    if (!geometry->nodes->GetDomain(geometry->vertex[iMarker][iVertex]->GetNode())) continue;
+
+    // preCICE: non-dimensionalize before setting
+    const su2double WallHeatFluxND = WallHeatFlux[iBuffer++] / Heat_Flux_Ref;
+    modified = modified || (WallHeatFluxND != geometry->GetCustomBoundaryHeatFlux(iMarker, iVertex));
+    geometry->SetCustomBoundaryHeatFlux(iMarker, iVertex, WallHeatFluxND);
+  }
+  if (modified) preCICE_CustomBCModified[preCICE_Zone][iMarker] = true;
+}
+
+// preCICE:
+void CDriver::GetMarkerRobinCoefficients(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) const {
+
+  CheckMarkerBufferSize(iMarker, 2, bufferSize);
+
+  const auto& Table = GetHeatFluxTable(iMarker, true);
+  CVariable *nodes = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->GetNodes();
+
+  auto *Robin = reinterpret_cast<passivedouble*>(bufferAddress);
+  const unsigned long nVertex_Phys = Table.Point.size();
+
+  if (!Table.compressible) {
+    for (unsigned long iBuffer = 0; iBuffer < 2*nVertex_Phys; iBuffer++) Robin[iBuffer] = 0.0;
+    return;
+  }
+
+  for (unsigned long iRow = 0; iRow < nVertex_Phys; iRow++) {
+    const su2double thermal_conductivity = Table.Conductivity_Factor * nodes->GetLaminarViscosity(Table.Point[iRow]);
+
+    //preCICE: re-dimensionalize before returning
+    Robin[2*iRow] = SU2_TYPE::GetValue(thermal_conductivity / Table.Wall_Distance[iRow] * Table.Heat_Flux_Ref / Table.Temperature_Ref);
+    Robin[2*iRow+1] = SU2_TYPE::GetValue(nodes->GetTemperature(Table.Neighbor[iRow]) * Table.Temperature_Ref);
+  }
+}
+
+// preCICE:
+void CDriver::SetMarkerRobinConditions(unsigned short iMarker, unsigned long bufferAddress, unsigned long bufferSize) {
+
+  CheckMarkerBufferSize(iMarker, 2, bufferSize);
+
+  if (config_container[preCICE_Zone]->GetMarker_All_KindBC(iMarker) != ISOTHERMAL) {
+    SU2_MPI::Error("Robin coupling sets the wall temperature, marker " + config_container[preCICE_Zone]->GetMarker_All_TagBound(iMarker) +
+                   " must be isothermal.", CURRENT_FUNCTION);
+  }
+
+  const auto& Table = GetHeatFluxTable(iMarker, true);
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
+  CVariable *nodes = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->GetNodes();
+
+  const auto *Robin = reinterpret_cast<const passivedouble*>(bufferAddress);
+
+  bool modified = false;
+  for (unsigned long iVertex = 0; iVertex < geometry->nVertex[iMarker]; iVertex++) {
+    const long iRow = Table.Row[iVertex];
+    if (iRow < 0) continue;
+
+    // preCICE: non-dimensionalize the condition of the partner
+    const su2double HTC_Partner = Robin[2*iRow] * Table.Temperature_Ref / Table.Heat_Flux_Ref;
+    const su2double Sink_Partner = Robin[2*iRow+1] / Table.Temperature_Ref;
+
+    su2double HTC_Flow = 0.0, Sink_Flow = 0.0;
+    if (Table.compressible) {
+      HTC_Flow = Table.Conductivity_Factor * nodes->GetLaminarViscosity(Table.Point[iRow]) / Table.Wall_Distance[iRow];
+      Sink_Flow = nodes->GetTemperature(Table.Neighbor[iRow]);
+    }
+    if (HTC_Flow + HTC_Partner <= 0.0) continue;
+
+    // Wall temperature at which the heat flux into the flow equals the heat flux out of the partner
+    const su2double WallTempND = (HTC_Flow*Sink_Flow + HTC_Partner*Sink_Partner) / (HTC_Flow + HTC_Partner);
+    modified = modified || (WallTempND != geometry->GetCustomBoundaryTemperature(iMarker, iVertex));
+    geometry->SetCustomBoundaryTemperature(iMarker, iVertex, WallTempND);
+  }
+  if (modified) preCICE_CustomBCModified[preCICE_Zone][iMarker] = true;
+}
+
 ///////////////////////////////////////////////////////////////////////////////
 /* Functions related to CHT solver                                           */
 ///////////////////////////////////////////////////////////////////////////////
@@ -661,125 +1544,96 @@ passivedouble CDriver::GetVertexTemperature(unsigned short iMarker, unsigned lon
   unsigned long iPoint;
   su2double vertexWallTemp(0.0);
 
-  bool compressible = (config_container[ZONE_0]->GetKind_Regime() == ENUM_REGIME::COMPRESSIBLE);
+  bool compressible = (config_container[preCICE_Zone]->GetKind_Regime() == ENUM_REGIME::COMPRESSIBLE);
 
-  iPoint = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+  iPoint = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
 
-  if(geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetDomain(iPoint) && compressible){
-    vertexWallTemp = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetTemperature(iPoint);
+  if(geometry_container[preCICE_Zone][INST_0][MESH_0]->nodes->GetDomain(iPoint) && compressible){
+    vertexWallTemp = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetTemperature(iPoint);
   }
 
   //preCICE: re-dimensionalize before returning
-  return SU2_TYPE::GetValue(vertexWallTemp * config_container[ZONE_0]->GetTemperature_Ref());
+  return SU2_TYPE::GetValue(vertexWallTemp * config_container[preCICE_Zone]->GetTemperature_Ref());
 
 }
 
 void CDriver::SetVertexTemperature(unsigned short iMarker, unsigned long iVertex, passivedouble val_WallTemp){
 
   // preCICE: non-dimensionalize before setting
-  geometry_container[ZONE_0][INST_0][MESH_0]->SetCustomBoundaryTemperature(iMarker, iVertex, val_WallTemp / config_container[ZONE_0]->GetTemperature_Ref());
+  geometry_container[preCICE_Zone][INST_0][MESH_0]->SetCustomBoundaryTemperature(iMarker, iVertex, val_WallTemp / config_container[preCICE_Zone]->GetTemperature_Ref());
+  preCICE_CustomBCModified[preCICE_Zone][iMarker] = true;
 }
 
 vector<passivedouble> CDriver::GetVertexHeatFluxes(unsigned short iMarker, unsigned long iVertex) const {
 
-  unsigned long iPoint;
-  unsigned short iDim;
-  su2double Prandtl_Lam  = config_container[ZONE_0]->GetPrandtl_Lam();
-  su2double Gas_Constant = config_container[ZONE_0]->GetGas_ConstantND();
-  su2double Gamma = config_container[ZONE_0]->GetGamma();
-  su2double Gamma_Minus_One = Gamma - 1.0;
-  su2double Cp = (Gamma / Gamma_Minus_One) * Gas_Constant;
-  su2double laminar_viscosity, thermal_conductivity;
-  vector<su2double> GradT (3,0.0);
-  vector<su2double> HeatFlux (3,0.0);
+  // preCICE: constants of the heat flux from the table of the marker
+  const auto& Table = GetHeatFluxTable(iMarker, false);
   vector<passivedouble> HeatFluxPassive (3,0.0);
 
-  bool compressible = (config_container[ZONE_0]->GetKind_Regime() == ENUM_REGIME::COMPRESSIBLE);
+  if(Table.compressible){
+    CVariable *nodes = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->GetNodes();
+    const auto iPoint = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+    const su2double thermal_conductivity = Table.Conductivity_Factor * nodes->GetLaminarViscosity(iPoint);
 
-  iPoint = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
-
-  if(compressible){
-    laminar_viscosity    = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetLaminarViscosity(iPoint);
-    thermal_conductivity = Cp * (laminar_viscosity/Prandtl_Lam);
-    for(iDim=0; iDim < nDim; iDim++){
-      GradT[iDim] = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetGradient_Primitive(iPoint, 0, iDim);
-      HeatFlux[iDim] = -thermal_conductivity*GradT[iDim];
+    //preCICE: re-dimensionalize before returning
+    for(unsigned short iDim=0; iDim < nDim; iDim++){
+      HeatFluxPassive[iDim] = SU2_TYPE::GetValue(-thermal_conductivity*nodes->GetGradient_Primitive(iPoint, 0, iDim) * Table.Heat_Flux_Ref);
     }
   }
 
-  //preCICE: re-dimensionalize before returning
-  HeatFluxPassive[0] = SU2_TYPE::GetValue(HeatFlux[0] * config_container[ZONE_0]->GetHeat_Flux_Ref());
-  HeatFluxPassive[1] = SU2_TYPE::GetValue(HeatFlux[1] * config_container[ZONE_0]->GetHeat_Flux_Ref());
-  HeatFluxPassive[2] = SU2_TYPE::GetValue(HeatFlux[2] * config_container[ZONE_0]->GetHeat_Flux_Ref());
-
   return HeatFluxPassive;
 }
 
 passivedouble CDriver::GetVertexNormalHeatFlux(unsigned short iMarker, unsigned long iVertex) const{
 
-  unsigned long iPoint;
-  unsigned short iDim;
-  su2double vertexWallHeatFlux;
-  su2double Prandtl_Lam  = config_container[ZONE_0]->GetPrandtl_Lam();
-  su2double Gas_Constant = config_container[ZONE_0]->GetGas_ConstantND();
-  su2double Gamma = config_container[ZONE_0]->GetGamma();
-  su2double Gamma_Minus_One = Gamma - 1.0;
-  su2double Cp = (Gamma / Gamma_Minus_One) * Gas_Constant;
-  su2double Area;
-  su2double laminar_viscosity, thermal_conductivity, dTdn;
-  su2double *Normal, GradT[3] = {0.0,0.0,0.0}, UnitNormal[3] = {0.0,0.0,0.0};
-
-  bool compressible = (config_container[ZONE_0]->GetKind_Regime() == ENUM_REGIME::COMPRESSIBLE);
-
-  vertexWallHeatFlux = 0.0;
-  dTdn = 0.0;
-
-  iPoint = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
-
-  if(geometry_container[ZONE_0][INST_0][MESH_0]->nodes->GetDomain(iPoint) && compressible){
-    Normal = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNormal();
-
-    Area = GeometryToolbox::Norm(nDim, Normal);
-
-    for (iDim = 0; iDim < nDim; iDim++)
-      UnitNormal[iDim] = Normal[iDim]/Area;
+  // preCICE: unit normal and constants of the heat flux from the table of the marker, halo vertices have no row.
+  // A single vertex does not justify rebuilding the table of a dynamic grid, its unit normal is computed instead.
+  const auto& Table = GetHeatFluxTable(iMarker, false);
+  const long iRow = Table.Row[iVertex];
+  su2double vertexWallHeatFlux = 0.0;
+
+  if(iRow >= 0 && Table.compressible){
+    CVariable *nodes = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->GetNodes();
+    const auto iPoint = Table.Point[iRow];
+    const su2double *UnitNormal = &Table.UnitNormal[iRow*nDim];
+
+    su2double MovedUnitNormal[3] = {0.0,0.0,0.0};
+    if (config_container[preCICE_Zone]->GetDynamic_Grid()) {
+      const su2double *Normal = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNormal();
+      const su2double Area = GeometryToolbox::Norm(nDim, Normal);
+      for(unsigned short iDim=0; iDim < nDim; iDim++) MovedUnitNormal[iDim] = Normal[iDim]/Area;
+      UnitNormal = MovedUnitNormal;
+    }
 
-    laminar_viscosity    = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetLaminarViscosity(iPoint);
-    thermal_conductivity = Cp * (laminar_viscosity/Prandtl_Lam);
     /*Compute wall heat flux (normal to the wall) based on computed temperature gradient*/
-    for(iDim=0; iDim < nDim; iDim++){
-      GradT[iDim] = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetGradient_Primitive(iPoint, 0, iDim);
-      dTdn += GradT[iDim]*UnitNormal[iDim];
+    su2double dTdn = 0.0;
+    for(unsigned short iDim=0; iDim < nDim; iDim++){
+      dTdn += nodes->GetGradient_Primitive(iPoint, 0, iDim)*UnitNormal[iDim];
     }
 
-    vertexWallHeatFlux = -thermal_conductivity*dTdn;
+    vertexWallHeatFlux = -Table.Conductivity_Factor * nodes->GetLaminarViscosity(iPoint) * dTdn;
   }
 
    //preCICE: re-dimensionalize before returning
-  return SU2_TYPE::GetValue(vertexWallHeatFlux * config_container[ZONE_0]->GetHeat_Flux_Ref());
+  return SU2_TYPE::GetValue(vertexWallHeatFlux * Table.Heat_Flux_Ref);
 }
 
 void CDriver::SetVertexNormalHeatFlux(unsigned short iMarker, unsigned long iVertex, passivedouble val_WallHeatFlux){
 
   // preCICE: non-dimensionalize before setting
-  geometry_container[ZONE_0][INST_0][MESH_0]->SetCustomBoundaryHeatFlux(iMarker, iVertex, val_WallHeatFlux / config_container[ZONE_0]->GetHeat_Flux_Ref());
+  geometry_container[preCICE_Zone][INST_0][MESH_0]->SetCustomBoundaryHeatFlux(iMarker, iVertex, val_WallHeatFlux / config_container[preCICE_Zone]->GetHeat_Flux_Ref());
+  preCICE_CustomBCModified[preCICE_Zone][iMarker] = true;
 }
 
 passivedouble CDriver::GetThermalConductivity(unsigned short iMarker, unsigned long iVertex) const {
 
-  unsigned long iPoint;
-  su2double Prandtl_Lam  = config_container[ZONE_0]->GetPrandtl_Lam();
-  su2double Gas_Constant = config_container[ZONE_0]->GetGas_ConstantND();
-  su2double Gamma = config_container[ZONE_0]->GetGamma();
-  su2double Gamma_Minus_One = Gamma - 1.0;
-  su2double Cp = (Gamma / Gamma_Minus_One) * Gas_Constant;
-  su2double laminar_viscosity, thermal_conductivity;
+  // preCICE: Cp / Prandtl_Lam from the heat flux table of the marker
+  const auto& Table = GetHeatFluxTable(iMarker, false);
 
-  iPoint = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
-  laminar_viscosity    = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetLaminarViscosity(iPoint);
-  thermal_conductivity = Cp * (laminar_viscosity/Prandtl_Lam);
+  const auto iPoint = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+  const su2double laminar_viscosity = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->GetNodes()->GetLaminarViscosity(iPoint);
 
-  return SU2_TYPE::GetValue(thermal_conductivity);
+  return SU2_TYPE::GetValue(Table.Conductivity_Factor * laminar_viscosity);
 
 }
 
@@ -793,11 +1647,11 @@ vector<string> CDriver::GetAllBoundaryMarkersTag() const {
   unsigned short iMarker,nBoundariesMarkers;
   string Marker_Tag;
 
-  nBoundariesMarkers = config_container[ZONE_0]->GetnMarker_All();
+  nBoundariesMarkers = config_container[preCICE_Zone]->GetnMarker_All();
   boundariesTagList.resize(nBoundariesMarkers);
 
   for(iMarker=0; iMarker < nBoundariesMarkers; iMarker++){
-    Marker_Tag = config_container[ZONE_0]->GetMarker_All_TagBound(iMarker);
+    Marker_Tag = config_container[preCICE_Zone]->GetMarker_All_TagBound(iMarker);
     boundariesTagList[iMarker] = Marker_Tag;
   }
 
@@ -810,11 +1664,11 @@ vector<string> CDriver::GetAllDeformMeshMarkersTag() const {
   unsigned short iMarker, nBoundariesMarker;
   string Marker_Tag;
 
-  nBoundariesMarker = config_container[ZONE_0]->GetnMarker_Deform_Mesh();
+  nBoundariesMarker = config_container[preCICE_Zone]->GetnMarker_Deform_Mesh();
   interfaceBoundariesTagList.resize(nBoundariesMarker);
 
   for(iMarker=0; iMarker < nBoundariesMarker; iMarker++){
-    Marker_Tag = config_container[ZONE_0]->GetMarker_Deform_Mesh_TagBound(iMarker);
+    Marker_Tag = config_container[preCICE_Zone]->GetMarker_Deform_Mesh_TagBound(iMarker);
     interfaceBoundariesTagList[iMarker] = Marker_Tag;
   }
 
@@ -827,12 +1681,12 @@ vector<string> CDriver::GetAllCHTMarkersTag() const {
   unsigned short iMarker, nBoundariesMarker;
   string Marker_Tag;
 
-  nBoundariesMarker = config_container[ZONE_0]->GetnMarker_All();
+  nBoundariesMarker = config_container[preCICE_Zone]->GetnMarker_All();
 
   //The CHT markers can be identified as the markers that are customizable with a BC type HEAT_FLUX or ISOTHERMAL.
   for(iMarker=0; iMarker<nBoundariesMarker; iMarker++){
-    if((config_container[ZONE_0]->GetMarker_All_KindBC(iMarker) == HEAT_FLUX || config_container[ZONE_0]->GetMarker_All_KindBC(iMarker) == ISOTHERMAL) && config_container[ZONE_0]->GetMarker_All_PyCustom(iMarker)){
-      Marker_Tag = config_container[ZONE_0]->GetMarker_All_TagBound(iMarker);
+    if((config_container[preCICE_Zone]->GetMarker_All_KindBC(iMarker) == HEAT_FLUX || config_container[preCICE_Zone]->GetMarker_All_KindBC(iMarker) == ISOTHERMAL) && config_container[preCICE_Zone]->GetMarker_All_PyCustom(iMarker)){
+      Marker_Tag = config_container[preCICE_Zone]->GetMarker_All_TagBound(iMarker);
       CHTBoundariesTagList.push_back(Marker_Tag);
     }
   }
@@ -846,13 +1700,13 @@ vector<string> CDriver::GetAllInletMarkersTag() const {
   unsigned short iMarker, nBoundariesMarker;
   string Marker_Tag;
 
-  nBoundariesMarker = config_container[ZONE_0]->GetnMarker_All();
+  nBoundariesMarker = config_container[preCICE_Zone]->GetnMarker_All();
 
   for(iMarker=0; iMarker<nBoundariesMarker; iMarker++){
-    bool isCustomizable = config_container[ZONE_0]->GetMarker_All_PyCustom(iMarker);
-    bool isInlet = (config_container[ZONE_0]->GetMarker_All_KindBC(iMarker) == INLET_FLOW);
+    bool isCustomizable = config_container[preCICE_Zone]->GetMarker_All_PyCustom(iMarker);
+    bool isInlet = (config_container[preCICE_Zone]->GetMarker_All_KindBC(iMarker) == INLET_FLOW);
     if(isCustomizable && isInlet) {
-      Marker_Tag = config_container[ZONE_0]->GetMarker_All_TagBound(iMarker);
+      Marker_Tag = config_container[preCICE_Zone]->GetMarker_All_TagBound(iMarker);
       BoundariesTagList.push_back(Marker_Tag);
     }
   }
@@ -866,10 +1720,10 @@ map<string, int> CDriver::GetAllBoundaryMarkers() const {
   unsigned short iMarker, nBoundaryMarkers;
   string Marker_Tag;
 
-  nBoundaryMarkers = config_container[ZONE_0]->GetnMarker_All();
+  nBoundaryMarkers = config_container[preCICE_Zone]->GetnMarker_All();
 
   for(iMarker=0; iMarker < nBoundaryMarkers; iMarker++){
-    Marker_Tag = config_container[ZONE_0]->GetMarker_All_TagBound(iMarker);
+    Marker_Tag = config_container[preCICE_Zone]->GetMarker_All_TagBound(iMarker);
     allBoundariesMap[Marker_Tag] = iMarker;
   }
 
@@ -882,9 +1736,9 @@ map<string, string> CDriver::GetAllBoundaryMarkersType() const {
   unsigned short iMarker, KindBC;
   string Marker_Tag, Marker_Type;
 
-  for(iMarker=0; iMarker < config_container[ZONE_0]->GetnMarker_All(); iMarker++){
-    Marker_Tag = config_container[ZONE_0]->GetMarker_All_TagBound(iMarker);
-    KindBC = config_container[ZONE_0]->GetMarker_All_KindBC(iMarker);
+  for(iMarker=0; iMarker < config_container[preCICE_Zone]->GetnMarker_All(); iMarker++){
+    Marker_Tag = config_container[preCICE_Zone]->GetMarker_All_TagBound(iMarker);
+    KindBC = config_container[preCICE_Zone]->GetMarker_All_KindBC(iMarker);
     switch(KindBC){
       case EULER_WALL:
         Marker_Type = "EULER_WALL";
@@ -921,12 +1775,12 @@ map<string, string> CDriver::GetAllBoundaryMarkersType() const {
 
 void CDriver::SetHeatSource_Position(passivedouble alpha, passivedouble pos_x, passivedouble pos_y, passivedouble pos_z){
 
-  CSolver *solver = solver_container[ZONE_0][INST_0][MESH_0][RAD_SOL];
+  CSolver *solver = solver_container[preCICE_Zone][INST_0][MESH_0][RAD_SOL];
 
-  config_container[ZONE_0]->SetHeatSource_Rot_Z(alpha);
-  config_container[ZONE_0]->SetHeatSource_Center(pos_x, pos_y, pos_z);
+  config_container[preCICE_Zone]->SetHeatSource_Rot_Z(alpha);
+  config_container[preCICE_Zone]->SetHeatSource_Center(pos_x, pos_y, pos_z);
 
-  solver->SetVolumetricHeatSource(geometry_container[ZONE_0][INST_0][MESH_0], config_container[ZONE_0]);
+  solver->SetVolumetricHeatSource(geometry_container[preCICE_Zone][INST_0][MESH_0], config_container[preCICE_Zone]);
 
 }
 
@@ -936,9 +1790,9 @@ void CDriver::SetInlet_Angle(unsigned short iMarker, passivedouble alpha){
 
   unsigned long iVertex;
 
-  for (iVertex = 0; iVertex < geometry_container[ZONE_0][INST_0][MESH_0]->nVertex[iMarker]; iVertex++){
-    solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->SetInlet_FlowDir(iMarker, iVertex, 0, cos(alpha_rad));
-    solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL]->SetInlet_FlowDir(iMarker, iVertex, 1, sin(alpha_rad));
+  for (iVertex = 0; iVertex < geometry_container[preCICE_Zone][INST_0][MESH_0]->nVertex[iMarker]; iVertex++){
+    solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->SetInlet_FlowDir(iMarker, iVertex, 0, cos(alpha_rad));
+    solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL]->SetInlet_FlowDir(iMarker, iVertex, 1, sin(alpha_rad));
   }
 
 }
@@ -977,30 +1831,46 @@ void CDriver::ResetConvergence() {
 
 }
 
+// preCICE: the multizone driver does not override SetInitialMesh, every zone with a dynamic grid is deformed here
+void CDriver::SetInitialMesh() {
+
+  for (unsigned short iZone = 0; iZone < nZone; iZone++) {
+    if (!config_container[iZone]->GetDynamic_Grid() || solver_container[iZone][INST_0][MESH_0][MESH_SOL] == nullptr) continue;
+
+    DynamicMeshUpdate(iZone, 0);
+    PushBackInitialMesh(iZone);
+  }
+}
+
 void CSinglezoneDriver::SetInitialMesh() {
 
   DynamicMeshUpdate(0);
+  PushBackInitialMesh(ZONE_0);
+}
+
+// preCICE: shared by the single zone and multizone initial mesh deformations
+void CDriver::PushBackInitialMesh(unsigned short iZone) {
 
   SU2_OMP_PARALLEL {
     // Overwrite fictious velocities
-    for (iMesh = 0u; iMesh <= config_container[ZONE_0]->GetnMGLevels(); iMesh++) {
-      SU2_OMP_FOR_STAT(roundUpDiv(geometry_container[ZONE_0][INST_0][iMesh]->GetnPoint(),omp_get_max_threads()))
-      for (unsigned long iPoint = 0; iPoint < geometry_container[ZONE_0][INST_0][iMesh]->GetnPoint(); iPoint++) {
+    for (auto iMesh = 0u; iMesh <= config_container[iZone]->GetnMGLevels(); iMesh++) {
+      SU2_OMP_FOR_STAT(roundUpDiv(geometry_container[iZone][INST_0][iMesh]->GetnPoint(),omp_get_max_threads()))
+      for (unsigned long iPoint = 0; iPoint < geometry_container[iZone][INST_0][iMesh]->GetnPoint(); iPoint++) {
 
         /*--- Overwrite fictitious velocities ---*/
         su2double Grid_Vel[3] = {0.0, 0.0, 0.0};
 
         /*--- Set the grid velocity for this coarse node. ---*/
-        geometry_container[ZONE_0][INST_0][iMesh]->nodes->SetGridVel(iPoint, Grid_Vel);
+        geometry_container[iZone][INST_0][iMesh]->nodes->SetGridVel(iPoint, Grid_Vel);
       }
       END_SU2_OMP_FOR
       /*--- Push back the volume. ---*/
-      geometry_container[ZONE_0][INST_0][iMesh]->nodes->SetVolume_n();
-      geometry_container[ZONE_0][INST_0][iMesh]->nodes->SetVolume_nM1();
+      geometry_container[iZone][INST_0][iMesh]->nodes->SetVolume_n();
+      geometry_container[iZone][INST_0][iMesh]->nodes->SetVolume_nM1();
     }
     /*--- Push back the solution so that there is no fictious velocity at the next step. ---*/
-    solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->Set_Solution_time_n();
-    solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->Set_Solution_time_n1();
+    solver_container[iZone][INST_0][MESH_0][MESH_SOL]->GetNodes()->Set_Solution_time_n();
+    solver_container[iZone][INST_0][MESH_0][MESH_SOL]->GetNodes()->Set_Solution_time_n1();
   }
   END_SU2_OMP_PARALLEL
 }
@@ -1018,6 +1888,31 @@ void CDriver::BoundaryConditionsUpdate(){
   }
 }
 
+// preCICE:
+bool CDriver::UpdateMarkerBoundaryConditions(unsigned short iMarker) {
+
+  // Nothing to do if the custom values of the marker were not modified since the last update
+  if (!preCICE_CustomBCModified[preCICE_Zone][iMarker]) return false;
+  preCICE_CustomBCModified[preCICE_Zone][iMarker] = false;
+
+  if (!config_container[preCICE_Zone]->GetMarker_All_PyCustom(iMarker)) return false;
+
+  // The fine grid values are used directly, only the coarse multigrid levels need the values transferred
+  for (auto iMGlevel = 1u; iMGlevel <= config_container[preCICE_Zone]->GetnMGLevels(); iMGlevel++) {
+    switch (config_container[preCICE_Zone]->GetMarker_All_KindBC(iMarker)) {
+      case HEAT_FLUX:
+        geometry_container[preCICE_Zone][INST_0][iMGlevel]->SetMultiGridWallHeatFlux(geometry_container[preCICE_Zone][INST_0][iMGlevel-1], iMarker);
+        break;
+      case ISOTHERMAL:
+        geometry_container[preCICE_Zone][INST_0][iMGlevel]->SetMultiGridWallTemperature(geometry_container[preCICE_Zone][INST_0][iMGlevel-1], iMarker);
+        break;
+      default:
+        break;
+    }
+  }
+  return true;
+}
+
 ////////////////////////////////////////////////////////////////////////////////
 /* Functions related to finite elements                                       */
 ////////////////////////////////////////////////////////////////////////////////
@@ -1224,18 +2119,18 @@ void CDriver::SetMeshDisplacement(unsigned short iMarker, unsigned long iVertex,
   MeshDispl[1] = DispY;
   MeshDispl[2] = DispZ;
 
-  iPoint = geometry_container[ZONE_0][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
+  iPoint = geometry_container[preCICE_Zone][INST_0][MESH_0]->vertex[iMarker][iVertex]->GetNode();
 
-  solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->GetNodes()->SetBound_Disp(iPoint,MeshDispl);
+  solver_container[preCICE_Zone][INST_0][MESH_0][MESH_SOL]->GetNodes()->SetBound_Disp(iPoint,MeshDispl);
 
 }
 
 void CDriver::CommunicateMeshDisplacement(void) {
 
-  solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->InitiateComms(geometry_container[ZONE_0][INST_0][MESH_0],
-                                                                    config_container[ZONE_0], MESH_DISPLACEMENTS);
-  solver_container[ZONE_0][INST_0][MESH_0][MESH_SOL]->CompleteComms(geometry_container[ZONE_0][INST_0][MESH_0],
-                                                                    config_container[ZONE_0], MESH_DISPLACEMENTS);
+  solver_container[preCICE_Zone][INST_0][MESH_0][MESH_SOL]->InitiateComms(geometry_container[preCICE_Zone][INST_0][MESH_0],
+                                                                    config_container[preCICE_Zone], MESH_DISPLACEMENTS);
+  solver_container[preCICE_Zone][INST_0][MESH_0][MESH_SOL]->CompleteComms(geometry_container[preCICE_Zone][INST_0][MESH_0],
+                                                                    config_container[preCICE_Zone], MESH_DISPLACEMENTS);
 
 }
 
@@ -1248,10 +2143,10 @@ vector<passivedouble> CDriver::GetFlowLoad(unsigned short iMarker, unsigned long
   vector<su2double> FlowLoad(3, 0.0);
   vector<passivedouble> FlowLoad_passive(3, 0.0);
 
-  CSolver *solver = solver_container[ZONE_0][INST_0][MESH_0][FLOW_SOL];
-  CGeometry *geometry = geometry_container[ZONE_0][INST_0][MESH_0];
+  CSolver *solver = solver_container[preCICE_Zone][INST_0][MESH_0][FLOW_SOL];
+  CGeometry *geometry = geometry_container[preCICE_Zone][INST_0][MESH_0];
 
-  if (config_container[ZONE_0]->GetSolid_Wall(iMarker)) {
+  if (config_container[preCICE_Zone]->GetSolid_Wall(iMarker)) {
     FlowLoad[0] = solver->GetVertexTractions(iMarker, iVertex, 0);
     FlowLoad[1] = solver->GetVertexTractions(iMarker, iVertex, 1);
     if (geometry->GetnDim() == 3)
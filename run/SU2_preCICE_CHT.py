@@ -35,9 +35,17 @@ import sys
 from optparse import OptionParser	# use a parser for configuration
 import pysu2			            # imports the SU2 wrapped module
 from math import *
-import precice #import precice
+try:
+  import precice #import precice
+except ImportError:
+  # Replays of coupling traces run without preCICE, the trace module provides the action names
+  import SU2_preCICE_trace as precice
 import numpy
-from time import sleep
+from SU2_preCICE_buffers import buffer_args, read_buffer, select_markers, set_mesh_connectivity, InterfaceMarkers
+from SU2_preCICE_coupling import CouplingLoop
+from SU2_preCICE_recorder import InterfaceRecorder
+from SU2_preCICE_exchange import create_interface, report_interface_vertices
+from SU2_preCICE_trace import TracingInterface, ReplayInterface
 # -------------------------------------------------------------------
 #  Main
 # -------------------------------------------------------------------
@@ -54,13 +62,49 @@ def main():
   parser.add_option("-p", "--precice-participant", dest="precice_name", help="Specify preCICE participant name", default="Fluid" )
   parser.add_option("-c", "--precice-config", dest="precice_config", help="Specify preCICE config file", default="../precice-config.xml")
   parser.add_option("-m", "--precice-mesh", dest="precice_mesh", help="Specify the preCICE mesh name", default="Fluid-Mesh")
+  parser.add_option("--exchange-ranks", dest="exchange_ranks", help="Aggregate the interface data on this number of ranks, which alone talk to preCICE (0: every rank)", type="int", default=0)
+  parser.add_option("--exchange-report", action="store_true", dest="exchange_report", help="Report the time each rank spends exchanging data with preCICE in every time window", default=False)
+  parser.add_option("--markers", dest="markers", help="Comma-separated CHT markers coupled through the preCICE mesh, or ALL", default="interface")
   parser.add_option("-r", "--precice-reverse", action="store_true", dest="precice_reverse", help="Include flag to have SU2 write temperature, read heat flux", default=False)
+  parser.add_option("--robin", action="store_true", dest="robin", help="Robin coupling: SU2 writes a heat transfer coefficient and sink temperature, and reads those of the partner (isothermal markers)", default=False)
+  parser.add_option("--robin-partner", dest="robin_partner", help="Suffix of the data names of the partner in Robin coupling, the suffix of SU2 being the participant name", default="Solid")
   
   # Dimension
   parser.add_option("-d", "--dimension", dest="nDim", help="Dimension of fluid domain", type="int", default=3)
+  parser.add_option("-z", "--zones", dest="nZone", help="Number of zones of the SU2 configuration, more than one runs the multizone driver and couples the markers of all zones", type="int", default=1)
+
+  # Implicit coupling checkpoint storage
+  parser.add_option("--checkpoint-storage", dest="checkpoint_storage", help="Storage of the implicit coupling checkpoint: FULL, REDUCED (skips recoverable time levels and the dual grid of a deforming mesh, which is recomputed on each reload: less memory, slower reloads) or MAPPED (REDUCED, in a memory-mapped scratch file)", default="FULL")
+  parser.add_option("--checkpoint-dir", dest="checkpoint_dir", help="Directory of the scratch file for MAPPED checkpoint storage", default=".")
+  parser.add_option("--reload-mode", dest="reload_mode", help="State reloaded when preCICE rejects an iteration: FULL, or WARM (keeps the last iterate as initial guess of the flow, only resets its time history)", default="FULL")
+
+  # Time predictor
+  parser.add_option("--predictor", dest="predictor", help="Initial guess of the first run of each time window: NONE (last time step), LINEAR or QUADRATIC extrapolation in time of the flow, turbulence and mesh solutions", default="NONE")
+
+  # Coupled restarts
+  parser.add_option("--snapshot", dest="snapshot", help="Write the checkpoint, coupling time and last interface data to per-rank snapshots PREFIX_RANK.ckpt/.npz for coupled restarts", metavar="PREFIX", default=None)
+  parser.add_option("--snapshot-interval", dest="snapshot_interval", help="Time windows between snapshots", type="int", default=10)
+  parser.add_option("--resume", dest="resume", help="Resume from the snapshots PREFIX_RANK.ckpt/.npz of a previous run, with the same mesh partition and checkpoint storage", metavar="PREFIX", default=None)
+
+  # Inexact implicit coupling
+  parser.add_option("--inexact-coupling", dest="inner_iter_min", help="Minimum inner iterations of a coupling iteration, rising to INNER_ITER as the interface data converge (0: always INNER_ITER)", type="int", default=0)
+  parser.add_option("--inexact-tolerance", dest="inexact_tol", help="Interface data residual at or below which INNER_ITER is run, at or above the limit of the preCICE relative convergence measures", type="float", default=1e-3)
+
+  # Subcycling
+  parser.add_option("--subcycling", action="store_true", dest="subcycling", help="Take steps of the SU2 time step within each preCICE time window, with the read data interpolated in time", default=False)
+
+  # Instrumentation
+  parser.add_option("--timing", dest="timing", help="Write the wall time of each phase of the coupling loop, per coupling iteration and reduced over the ranks, to PREFIX.csv and PREFIX.json", metavar="PREFIX", default=None)
+  parser.add_option("--record", dest="record", help="Record the interface data at each accepted time window to per-rank files PREFIX_RANK.dat/.npy/.json, written in the background", metavar="PREFIX", default=None)
+  parser.add_option("--record-iterations", action="store_true", dest="record_iterations", help="Also record the interface data of each coupling iteration and substep", default=False)
+  parser.add_option("--trace", dest="trace", help="Record the values returned by preCICE (read data, time window sizes, checkpoint and convergence actions) to per-rank binary traces PREFIX_RANK.trace", metavar="PREFIX", default=None)
+  parser.add_option("--replay", dest="replay", help="Run without preCICE and the partner solver, from the traces PREFIX_RANK.trace of a previous run with the same options and mesh partition", metavar="PREFIX", default=None)
   
   (options, args) = parser.parse_args()
-  options.nZone = int(1) # Specify number of zones here (1)
+
+  if options.robin and options.precice_reverse:
+    print("Robin coupling reads and writes both temperature and heat transfer coefficient, -r does not apply! Exiting")
+    return
 
   # Import mpi4py for parallel run
   if options.with_MPI == True:
@@ -73,7 +117,10 @@ def main():
 
   # Initialize the corresponding driver of SU2, this includes solver preprocessing
   try:
-      SU2Driver = pysu2.CSinglezoneDriver(options.filename, options.nZone, comm);
+    if options.nZone > 1:
+      SU2Driver = pysu2.CMultizoneDriver(options.filename, options.nZone, comm)
+    else:
+      SU2Driver = pysu2.CSinglezoneDriver(options.filename, options.nZone, comm)
   except TypeError as exception:
     print('A TypeError occured in pysu2.CDriver : ',exception)
     if options.with_MPI == True:
@@ -83,201 +130,141 @@ def main():
     return
 
 
-  # Configure preCICE:
-  size = comm.Get_size()
+  # Set how the implicit coupling checkpoint is stored
+  SU2Driver.SetCheckpointStorage(options.checkpoint_storage, options.checkpoint_dir)
+
+  # Zones and indices on this rank of the specified markers that have a CHT option, in all zones
+  CHTMarkerIDs = select_markers(SU2Driver, options.markers, SU2Driver.GetAllCHTMarkersTag)
+
+  # Physical vertices of the CHT markers on this rank, concatenated into one interface, their initial
+  # coordinates and the surface connectivity (edges in 2D, triangles/quads in 3D), all obtained in a single pass
+  markers = InterfaceMarkers(SU2Driver, CHTMarkerIDs, options.nDim)
+  coords = markers.coords
+  nVertex_CHTMarker_PHYS = len(markers)    #number of physical vertices
+
+  # Configure preCICE, with the exchange aggregated on a subset of the ranks if requested, or replay a trace instead:
   try:
-    interface = precice.Interface(options.precice_name, options.precice_config, rank, size)
-  except:
-    print("There was an error configuring preCICE")
+    if options.replay is not None:
+      interface = ReplayInterface(options.replay, rank)
+    else:
+      interface = create_interface(options.precice_name, options.precice_config, comm if options.with_MPI == True else None, options.exchange_ranks, nVertex_CHTMarker_PHYS)
+  except Exception as exception:
+    print("There was an error configuring preCICE: " + str(exception))
+    # The other ranks may be waiting for this one in a collective call, so the run is aborted on every rank
+    if options.with_MPI == True:
+      comm.Abort(1)
     return
-  
+
+  # Record what preCICE returns to this rank, for a later replay
+  if options.trace is not None:
+    interface = TracingInterface(interface, options.trace, rank)
+
   # Check preCICE + SU2 dimensions
   if options.nDim != interface.get_dimensions():
     print("SU2 and preCICE dimensions are not the same! Exiting")
     return
 
-
-  CHTMarkerID = None
-  CHTMarker = 'interface' # Name of CHT marker to couple
-
-  # Get all the tags with the CHT option
-  CHTMarkerList =  SU2Driver.GetAllCHTMarkersTag()
-
-  # Get all the markers defined on this rank and their associated indices.
-  allMarkerIDs = SU2Driver.GetAllBoundaryMarkers() # Returns all markers defined on this rank
-
-  #Check if the specified marker has a CHT option and if it exists on this rank.
-  if CHTMarker in CHTMarkerList and CHTMarker in allMarkerIDs.keys():
-    CHTMarkerID = allMarkerIDs[CHTMarker] # So: if CHTMarkerID != None, then it exists on this rank
-  
-  # Number of vertices on the specified marker (per rank)
-  nVertex_CHTMarker = 0         #total number of vertices (physical + halo) on this rank
-  nVertex_CHTMarker_HALO = 0    #number of halo vertices
-  nVertex_CHTMarker_PHYS = 0    #number of physical vertices
-  iVertices_CHTMarker_PHYS = [] #indices of vertices this rank is working on
-  # Note: Datatypes must be primitive as input to SU2 wrapper code, not numpy.int8, numpy.int64, etc.. So a list is used
-
-  # If the CHT marker is defined on this rank:
-  if CHTMarkerID != None:
-    nVertex_CHTMarker = SU2Driver.GetNumberVertices(CHTMarkerID) #Total number of vertices on the marker
-    nVertex_CHTMarker_HALO = SU2Driver.GetNumberHaloVertices(CHTMarkerID)
-    nVertex_CHTMarker_PHYS = nVertex_CHTMarker - nVertex_CHTMarker_HALO
-
-    # Obtain indices of all vertices that are being worked on on this rank
-    for iVertex in range(nVertex_CHTMarker):
-      if not SU2Driver.IsAHaloNode(CHTMarkerID, iVertex):
-        iVertices_CHTMarker_PHYS.append(int(iVertex))
+  # Report the interface vertices of the ranks (SU2 partitions the volume mesh, not the interface)
+  report_interface_vertices(comm if options.with_MPI == True else None, nVertex_CHTMarker_PHYS, interface)
 
   # Get preCICE mesh ID
   try:
     mesh_id = interface.get_mesh_id(options.precice_mesh)
-  except:
+  except Exception:
     print("Invalid or no preCICE mesh name provided")
+    if options.with_MPI == True:
+      comm.Abort(1)
     return
 
-  # Get coords of vertices
-  coords = numpy.zeros((nVertex_CHTMarker_PHYS, options.nDim))
-  for i, iVertex in enumerate(iVertices_CHTMarker_PHYS):
-    coord_passive = SU2Driver.GetInitialMeshCoord(CHTMarkerID, iVertex)
-    for iDim in range(options.nDim):
-      coords[i, iDim] = coord_passive[iDim]
-
   # Set mesh vertices in preCICE:
   vertex_ids = interface.set_mesh_vertices(mesh_id, coords)
 
+  # Set mesh connectivity in preCICE (only if required, e.g. for nearest-projection mapping):
+  set_mesh_connectivity(interface, mesh_id, vertex_ids, markers.connectivity)
+
   # Get read and write data IDs
-  precice_read = "Temperature"
-  precice_write = "Heat-Flux"
-  GetFxn = SU2Driver.GetVertexNormalHeatFlux
-  SetFxn = SU2Driver.SetVertexTemperature
-  GetInitialFxn = SU2Driver.GetVertexTemperature
+  precice_read = ["Temperature"]
+  precice_write = ["Heat-Flux"]
+  GetFxn = SU2Driver.GetMarkerNormalHeatFluxes
+  SetFxn = SU2Driver.SetMarkerTemperatures
+  GetInitialFxn = SU2Driver.GetMarkerTemperatures
   # Reverse coupling data read/write if -r flag included
   if options.precice_reverse:
-    precice_read = "Heat-Flux"
-    precice_write = "Temperature"
-    GetFxn = SU2Driver.GetVertexTemperature
-    SetFxn = SU2Driver.SetVertexNormalHeatFlux
-    GetInitialFxn = SU2Driver.GetVertexNormalHeatFlux
-
-  read_data_id = interface.get_data_id(precice_read, mesh_id)
-  write_data_id = interface.get_data_id(precice_write, mesh_id)
-
-  # Instantiate arrays to hold temperature + heat flux info
-  read_data = numpy.zeros(nVertex_CHTMarker_PHYS)
-  write_data = numpy.zeros(nVertex_CHTMarker_PHYS)
-
-  # Retrieve some control parameters from the driver
-  deltaT = SU2Driver.GetUnsteady_TimeStep()
-  TimeIter = SU2Driver.GetTime_Iter()
-  nTimeIter = SU2Driver.GetnTimeIter()
-  time = TimeIter*deltaT
-
-  # Setup preCICE dt:
-  precice_deltaT = interface.initialize()
-
-  # Set up initial data for preCICE
-  if (interface.is_action_required(precice.action_write_initial_data())):
-
-    for i, iVertex in enumerate(iVertices_CHTMarker_PHYS):
-      write_data[i] = GetInitialFxn(CHTMarkerID, iVertex)
+    precice_read = ["Heat-Flux"]
+    precice_write = ["Temperature"]
+    GetFxn = SU2Driver.GetMarkerTemperatures
+    SetFxn = SU2Driver.SetMarkerNormalHeatFluxes
+    GetInitialFxn = SU2Driver.GetMarkerNormalHeatFluxes
+  # Robin coupling: heat transfer coefficient and sink temperature each way, one column each in the data arrays
+  if options.robin:
+    precice_read = ["Heat-Transfer-Coefficient-" + options.robin_partner, "Sink-Temperature-" + options.robin_partner]
+    precice_write = ["Heat-Transfer-Coefficient-" + options.precice_name, "Sink-Temperature-" + options.precice_name]
+    GetFxn = SU2Driver.GetMarkerRobinCoefficients
+    SetFxn = SU2Driver.SetMarkerRobinConditions
+    GetInitialFxn = SU2Driver.GetMarkerRobinCoefficients
+
+  read_data_ids = [interface.get_data_id(name, mesh_id) for name in precice_read]
+  write_data_ids = [interface.get_data_id(name, mesh_id) for name in precice_write]
+
+  # Instantiate array to hold the write data (the read data are read into arrays returned by preCICE)
+  write_data = numpy.zeros((nVertex_CHTMarker_PHYS, 2)) if options.robin else numpy.zeros(nVertex_CHTMarker_PHYS)
+
+  # Optional recording of the interface data, shared with the FSI script
+  recorder = None
+  if options.record is not None:
+    recorder = InterfaceRecorder(options.record, rank, coords, ",".join(precice_read), ",".join(precice_write), options.record_iterations)
+
+  def write_scalar_data(data):
+    # One preCICE write per data name, from the columns of the data array in Robin coupling
+    if data.ndim == 1:
+      interface.write_block_scalar_data(write_data_ids[0], vertex_ids, data)
+    else:
+      for i, write_data_id in enumerate(write_data_ids):
+        interface.write_block_scalar_data(write_data_id, vertex_ids, data[:, i])
 
-    interface.write_block_scalar_data(write_data_id, vertex_ids, write_data)
-    interface.mark_action_fulfilled(precice.action_write_initial_data())
+  # Coupling loop, shared with the FSI script
+  loop = CouplingLoop(SU2Driver, interface, options, comm if options.with_MPI == True else None, recorder)
 
-  interface.initialize_data()
+  def write_initial_data(data=None):
+    # Initial values of the markers, unless given (last write data of a previous run, when resuming)
+    if data is None:
+      data = write_data
+      markers.apply(GetInitialFxn, data)
 
-  # Sleep briefly to allow for data initialization to be processed
-  sleep(3)
+    write_scalar_data(data)
 
-  # Time loop is defined in Python so that we have access to SU2 functionalities at each time step
-  if rank == 0:
-    print("\n------------------------------ Begin Solver -----------------------------\n")
-  sys.stdout.flush()
-  if options.with_MPI == True:
-    comm.Barrier()
+  def read_values():
+    # Retrieve data from preCICE
+    if not options.robin:
+      return read_buffer(interface.read_block_scalar_data(read_data_ids[0], vertex_ids))
+    return numpy.stack([interface.read_block_scalar_data(read_data_id, vertex_ids) for read_data_id in read_data_ids], axis=1)
 
-  precice_saved_time = 0
-  precice_saved_iter = 0
-  while (interface.is_coupling_ongoing()):
+  def set_values(read_data):
+    # Set the updated values of each whole marker at once, and update the boundary conditions of the coupled markers only
+    for CHTMarkerID, marker_data in markers.parts(read_data):
+      SetFxn(CHTMarkerID, *buffer_args(marker_data))
+      SU2Driver.UpdateMarkerBoundaryConditions(CHTMarkerID)
 
-    # Implicit coupling
-    if (interface.is_action_required(precice.action_write_iteration_checkpoint())):
-      # Save the state
-      SU2Driver.SaveOldState()
-      precice_saved_time = time
-      precice_saved_iter = TimeIter
-      interface.mark_action_fulfilled(precice.action_write_iteration_checkpoint())
+  def write_values():
+    # Get the write data of each whole marker, written in place into its rows of the write_data array
+    markers.apply(GetFxn, write_data)
 
-    if (interface.is_read_data_available()):
-      # Retrieve data from preCICE
-      read_data = interface.read_block_scalar_data(read_data_id, vertex_ids) 
+    # Write data to preCICE
+    write_scalar_data(write_data)
+    return write_data
 
-      # Set the updated values
-      for i, iVertex in enumerate(iVertices_CHTMarker_PHYS):
-          SetFxn(CHTMarkerID, iVertex, read_data[i])
+  # Restore the state of a previous run, whose last write data are the initial data
+  if options.resume is not None:
+    loop.resume(options.resume)
 
-      # Tell the SU2 drive to update the boundary conditions
-      SU2Driver.BoundaryConditionsUpdate()
+  # Setup preCICE dt and initial data (initialize_data returns once they are exchanged, no wait is needed)
+  loop.initialize(write_initial_data)
 
-    if options.with_MPI == True:
-      comm.Barrier()
-
-    # Update timestep based on preCICE
-    deltaT = SU2Driver.GetUnsteady_TimeStep()
-    deltaT = min(precice_deltaT, deltaT)
-    SU2Driver.SetUnsteady_TimeStep(deltaT)
-
-    # Time iteration preprocessing
-    SU2Driver.Preprocess(TimeIter)
-
-    # Run one time iteration (e.g. dual-time)
-    SU2Driver.Run()
-
-    # Postprocess the solver and exit cleanly
-    SU2Driver.Postprocess()
-
-    # Update the solver for the next time iteration
-    SU2Driver.Update()
-    
-    # Monitor the solver
-    stopCalc = SU2Driver.Monitor(TimeIter)
-    
-    if (interface.is_write_data_required(deltaT)):
-      # Loop over the vertices
-      for i, iVertex in enumerate(iVertices_CHTMarker_PHYS):
-        # Get heat fluxes at each vertex
-        write_data[i] = GetFxn(CHTMarkerID, iVertex)
-        
-      # Write data to preCICE
-      interface.write_block_scalar_data(write_data_id, vertex_ids, write_data)
-
-    # Advance preCICE
-    precice_deltaT = interface.advance(deltaT)
-
-    # Implicit coupling:
-    if (interface.is_action_required(precice.action_read_iteration_checkpoint())):
-      # Reload old state
-      SU2Driver.ReloadOldState()
-      time = precice_saved_time
-      TimeIter = precice_saved_iter
-      interface.mark_action_fulfilled(precice.action_read_iteration_checkpoint())
-    else: # Output and increment as usual
-      SU2Driver.Output(TimeIter)
-      if (stopCalc == True):
-        break
-      # Update control parameters
-      TimeIter += 1
-      time += deltaT
+  loop.run(read_values, set_values, write_values)
 
+  # Write the timing of the coupling loop, release the checkpoint, postprocess the solver and exit cleanly
+  loop.finalize()
 
-    if options.with_MPI == True:
-      comm.Barrier()
-      
-  # Postprocess the solver and exit cleanly
-  SU2Driver.Postprocessing()
-  
-  interface.finalize()
-  
   if SU2Driver != None:
     del SU2Driver
 
@@ -36,8 +36,16 @@ from optparse import OptionParser	# use a parser for configuration
 import pysu2			            # imports the SU2 wrapped module
 from math import *
 import numpy
-import precice
-from time import sleep
+try:
+    import precice
+except ImportError:
+    # Replays of coupling traces run without preCICE, the trace module provides the action names
+    import SU2_preCICE_trace as precice
+from SU2_preCICE_buffers import buffer_args, read_buffer, select_markers, set_mesh_connectivity, InterfaceMarkers
+from SU2_preCICE_coupling import CouplingLoop
+from SU2_preCICE_recorder import InterfaceRecorder
+from SU2_preCICE_exchange import create_interface, report_interface_vertices
+from SU2_preCICE_trace import TracingInterface, ReplayInterface
 # -------------------------------------------------------------------
 #  Main
 # -------------------------------------------------------------------
@@ -54,12 +62,45 @@ def main():
     parser.add_option("-p", "--precice-participant", dest="precice_name", help="Specify preCICE participant name", default="Fluid" )
     parser.add_option("-c", "--precice-config", dest="precice_config", help="Specify preCICE config file", default="../precice-config.xml")
     parser.add_option("-m", "--precice-mesh", dest="precice_mesh", help="Specify the preCICE mesh name", default="Fluid-Mesh")
+    parser.add_option("--exchange-ranks", dest="exchange_ranks", help="Aggregate the interface data on this number of ranks, which alone talk to preCICE (0: every rank)", type="int", default=0)
+    parser.add_option("--exchange-report", action="store_true", dest="exchange_report", help="Report the time each rank spends exchanging data with preCICE in every time window", default=False)
+    parser.add_option("--markers", dest="markers", help="Comma-separated deforming markers coupled through the preCICE mesh, or ALL", default="interface")
 
     # Dimension
     parser.add_option("-d", "--dimension", dest="nDim", help="Dimension of fluid domain", type="int", default=3)
+    parser.add_option("-z", "--zones", dest="nZone", help="Number of zones of the SU2 configuration, more than one runs the multizone driver and couples the markers of all zones", type="int", default=1)
+
+    # Implicit coupling checkpoint storage
+    parser.add_option("--checkpoint-storage", dest="checkpoint_storage", help="Storage of the implicit coupling checkpoint: FULL, REDUCED (skips recoverable time levels and the dual grid of a deforming mesh, which is recomputed on each reload: less memory, slower reloads) or MAPPED (REDUCED, in a memory-mapped scratch file)", default="FULL")
+    parser.add_option("--checkpoint-dir", dest="checkpoint_dir", help="Directory of the scratch file for MAPPED checkpoint storage", default=".")
+    parser.add_option("--reload-mode", dest="reload_mode", help="State reloaded when preCICE rejects an iteration: FULL, or WARM (keeps the last iterate as initial guess of the flow, only resets its time history)", default="FULL")
+
+    # Time predictor
+    parser.add_option("--predictor", dest="predictor", help="Initial guess of the first run of each time window: NONE (last time step), LINEAR or QUADRATIC extrapolation in time of the flow, turbulence and mesh solutions", default="NONE")
+
+    # Coupled restarts
+    parser.add_option("--snapshot", dest="snapshot", help="Write the checkpoint, coupling time and last interface data to per-rank snapshots PREFIX_RANK.ckpt/.npz for coupled restarts", metavar="PREFIX", default=None)
+    parser.add_option("--snapshot-interval", dest="snapshot_interval", help="Time windows between snapshots", type="int", default=10)
+    parser.add_option("--resume", dest="resume", help="Resume from the snapshots PREFIX_RANK.ckpt/.npz of a previous run, with the same mesh partition and checkpoint storage", metavar="PREFIX", default=None)
+
+    # Inexact implicit coupling
+    parser.add_option("--inexact-coupling", dest="inner_iter_min", help="Minimum inner iterations of a coupling iteration, rising to INNER_ITER as the interface data converge (0: always INNER_ITER)", type="int", default=0)
+    parser.add_option("--inexact-tolerance", dest="inexact_tol", help="Interface data residual at or below which INNER_ITER is run, at or above the limit of the preCICE relative convergence measures", type="float", default=1e-3)
+
+    # Subcycling
+    parser.add_option("--subcycling", action="store_true", dest="subcycling", help="Take steps of the SU2 time step within each preCICE time window, with the read data interpolated in time", default=False)
+
+    # Instrumentation
+    parser.add_option("--timing", dest="timing", help="Write the wall time of each phase of the coupling loop, per coupling iteration and reduced over the ranks, to PREFIX.csv and PREFIX.json", metavar="PREFIX", default=None)
+    parser.add_option("--record", dest="record", help="Record the interface data at each accepted time window to per-rank files PREFIX_RANK.dat/.npy/.json, written in the background", metavar="PREFIX", default=None)
+    parser.add_option("--record-iterations", action="store_true", dest="record_iterations", help="Also record the interface data of each coupling iteration and substep", default=False)
+    parser.add_option("--trace", dest="trace", help="Record the values returned by preCICE (read data, time window sizes, checkpoint and convergence actions) to per-rank binary traces PREFIX_RANK.trace", metavar="PREFIX", default=None)
+    parser.add_option("--replay", dest="replay", help="Run without preCICE and the partner solver, from the traces PREFIX_RANK.trace of a previous run with the same options and mesh partition", metavar="PREFIX", default=None)
+
+    # Mesh deformation
+    parser.add_option("--deformation-tolerance", dest="deformation_tolerance", help="Skip the mesh deformation when the displacements change by less than this fraction of the interface size, and warm-start it otherwise (0: always deform from the reloaded state)", type="float", default=0.0)
   
     (options, args) = parser.parse_args()
-    options.nZone = int(1)
 
     # Import mpi4py for parallel run
     if options.with_MPI == True:
@@ -72,7 +113,10 @@ def main():
 
     # Initialize the corresponding driver of SU2, this includes solver preprocessing
     try:
-        SU2Driver = pysu2.CSinglezoneDriver(options.filename, options.nZone, comm);
+        if options.nZone > 1:
+            SU2Driver = pysu2.CMultizoneDriver(options.filename, options.nZone, comm)
+        else:
+            SU2Driver = pysu2.CSinglezoneDriver(options.filename, options.nZone, comm)
     except TypeError as exception:
         print('A TypeError occured in pysu2.CDriver : ',exception)
         if options.with_MPI == True:
@@ -81,66 +125,68 @@ def main():
             print('ERROR : You are trying to launch a computation without initializing MPI but the wrapper has been built in parallel. Please add the --parallel option in order to initialize MPI for the wrapper.')
         return
 
-    # Configure preCICE:
-    size = comm.Get_size()
+    # Set how the implicit coupling checkpoint is stored
+    SU2Driver.SetCheckpointStorage(options.checkpoint_storage, options.checkpoint_dir)
+
+    # Zones and indices on this rank of the specified markers that have a moving option, in all zones
+    MovingMarkerIDs = select_markers(SU2Driver, options.markers, SU2Driver.GetAllDeformMeshMarkersTag)
+
+    # Physical vertices of the specified markers on this rank, concatenated into one interface, their initial
+    # coordinates and the surface connectivity (edges in 2D, triangles/quads in 3D), all obtained in a single pass
+    markers = InterfaceMarkers(SU2Driver, MovingMarkerIDs, options.nDim)
+    coords = markers.coords
+    nVertex_MovingMarker_PHYS = len(markers)    #number of physical vertices
+
+    # Configure preCICE, with the exchange aggregated on a subset of the ranks if requested, or replay a trace instead:
     try:
-        interface = precice.Interface(options.precice_name, options.precice_config, rank, size)#, comm)
-    except:
-        print("There was an error configuring preCICE")
+        if options.replay is not None:
+            interface = ReplayInterface(options.replay, rank)
+        else:
+            interface = create_interface(options.precice_name, options.precice_config, comm if options.with_MPI == True else None, options.exchange_ranks, nVertex_MovingMarker_PHYS)
+    except Exception as exception:
+        print("There was an error configuring preCICE: " + str(exception))
+        # The other ranks may be waiting for this one in a collective call, so the run is aborted on every rank
+        if options.with_MPI == True:
+            comm.Abort(1)
         return
 
+    # Record what preCICE returns to this rank, for a later replay
+    if options.trace is not None:
+        interface = TracingInterface(interface, options.trace, rank)
+
     # Check preCICE + SU2 dimensions
     if options.nDim != interface.get_dimensions():
         print("SU2 and preCICE dimensions are not the same! Exiting")
         return
 
-    MovingMarkerID = None
-    MovingMarker = 'interface'       #specified by the user
-
-    # Get all the tags with the moving option
-    MovingMarkerList =  SU2Driver.GetAllDeformMeshMarkersTag()
-
-    # Get all the markers defined on this rank and their associated indices.
-    allMarkerIDs = SU2Driver.GetAllBoundaryMarkers()
-
-    # Check if the specified marker has a moving option and if it exists on this rank.
-    if MovingMarker in MovingMarkerList and MovingMarker in allMarkerIDs.keys():
-        MovingMarkerID = allMarkerIDs[MovingMarker]
-
-    # Number of vertices on the specified marker (per rank)
-    nVertex_MovingMarker = 0         #total number of vertices (physical + halo)
-    nVertex_MovingMarker_HALO = 0    #number of halo vertices
-    nVertex_MovingMarker_PHYS = 0    #number of physical vertices
-    iVertices_MovingMarker_PHYS = [] # indices of vertices this rank is working on
-    # Datatypes must be primitive as input to SU2 wrapper code, not numpy.int8, numpy.int64, etc.. So a list is used
-    
-    if MovingMarkerID != None:
-        nVertex_MovingMarker = SU2Driver.GetNumberVertices(MovingMarkerID)
-        nVertex_MovingMarker_HALO = SU2Driver.GetNumberHaloVertices(MovingMarkerID)
-        nVertex_MovingMarker_PHYS = nVertex_MovingMarker - nVertex_MovingMarker_HALO
-        
-        # Obtain indices of all vertices that are being worked on on this rank
-        for iVertex in range(nVertex_MovingMarker):
-            if not SU2Driver.IsAHaloNode(MovingMarkerID, iVertex):
-                iVertices_MovingMarker_PHYS.append(int(iVertex))
+    # Report the interface vertices of the ranks (SU2 partitions the volume mesh, not the interface)
+    report_interface_vertices(comm if options.with_MPI == True else None, nVertex_MovingMarker_PHYS, interface)
 
     # Get preCICE mesh ID
     try:
         mesh_id = interface.get_mesh_id(options.precice_mesh)
-    except:
+    except Exception:
         print("Invalid or no preCICE mesh name provided")
+        if options.with_MPI == True:
+            comm.Abort(1)
         return
-    
-    # Get coords of vertices
-    coords = numpy.zeros((nVertex_MovingMarker_PHYS, options.nDim))
-    for i, iVertex in enumerate(iVertices_MovingMarker_PHYS):
-        coord_passive = SU2Driver.GetInitialMeshCoord(MovingMarkerID, iVertex)
-        for iDim in range(options.nDim):
-            coords[i, iDim] = coord_passive[iDim]
 
     # Set mesh vertices in preCICE:
     vertex_ids = interface.set_mesh_vertices(mesh_id, coords)
 
+    # Set mesh connectivity in preCICE (only if required, e.g. for nearest-projection mapping):
+    set_mesh_connectivity(interface, mesh_id, vertex_ids, markers.connectivity)
+
+    # Mesh deformation is skipped below an absolute tolerance, relative to the interface size (bounding box diagonal)
+    deformation_tol = 0.0
+    if options.deformation_tolerance > 0.0:
+        coords_min = coords.min(axis=0) if nVertex_MovingMarker_PHYS > 0 else numpy.full(options.nDim, numpy.inf)
+        coords_max = coords.max(axis=0) if nVertex_MovingMarker_PHYS > 0 else numpy.full(options.nDim, -numpy.inf)
+        if options.with_MPI == True:
+            comm.Allreduce(MPI.IN_PLACE, coords_min, op=MPI.MIN)
+            comm.Allreduce(MPI.IN_PLACE, coords_max, op=MPI.MAX)
+        deformation_tol = options.deformation_tolerance * numpy.linalg.norm(coords_max - coords_min)
+
     # Get read and write data IDs
     # By default:
     precice_read = "Displacement"
@@ -148,122 +194,91 @@ def main():
     read_data_id = interface.get_data_id(precice_read, mesh_id)
     write_data_id = interface.get_data_id(precice_write, mesh_id)
 
-    # Instantiate arrays to hold displacements + forces info
-    displacements = numpy.zeros((nVertex_MovingMarker_PHYS,options.nDim))
+    # Instantiate array to hold forces info (the displacements are read into arrays returned by preCICE)
     forces = numpy.zeros((nVertex_MovingMarker_PHYS,options.nDim))
 
-    # Retrieve some control parameters from the driver
-    deltaT = SU2Driver.GetUnsteady_TimeStep()
-    TimeIter = SU2Driver.GetTime_Iter()
-    nTimeIter = SU2Driver.GetnTimeIter()
-    time = TimeIter*deltaT
-
-    # Setup preCICE dt:
-    precice_deltaT = interface.initialize()
-
-    # Set up initial data for preCICE
-    if (interface.is_action_required(precice.action_write_initial_data())):
-
-        for i, iVertex in enumerate(iVertices_MovingMarker_PHYS):
-            forces[i] = SU2Driver.GetFlowLoad(MovingMarkerID, iVertex)[:-1]
-
-        interface.write_block_vector_data(write_data_id, vertex_ids, forces)
-        interface.mark_action_fulfilled(precice.action_write_initial_data())
-
-    interface.initialize_data()
-
-    # Sleep briefly to allow for data initialization to be processed
-    sleep(3)
-
-    # Time loop is defined in Python so that we have acces to SU2 functionalities at each time step
-    if rank == 0:
-        print("\n------------------------------ Begin Solver -----------------------------\n")
-    sys.stdout.flush()
-    if options.with_MPI == True:
-        comm.Barrier()
-
-    precice_saved_time = 0
-    precice_saved_iter = 0
-    while (interface.is_coupling_ongoing()):#(TimeIter < nTimeIter):
-        
-        # Implicit coupling
-        if (interface.is_action_required(precice.action_write_iteration_checkpoint())):
-            # Save the state
-            SU2Driver.SaveOldState()
-            precice_saved_time = time
-            precice_saved_iter = TimeIter
-            interface.mark_action_fulfilled(precice.action_write_iteration_checkpoint())
-
-        if (interface.is_read_data_available()):
-            # Retreive data from preCICE
-            displacements = interface.read_block_vector_data(read_data_id, vertex_ids)
-            
-            # Set the updated displacements
-            for i, iVertex in enumerate(iVertices_MovingMarker_PHYS):
-                DisplX = displacements[i][0]
-                DisplY = displacements[i][1]
-                DisplZ = 0 if options.nDim == 2 else displacements[i][2]
-
-                SU2Driver.SetMeshDisplacement(MovingMarkerID, iVertex, DisplX, DisplY, DisplZ)
-        
-        if options.with_MPI == True:
-            comm.Barrier()
-            
-        # Update timestep based on preCICE
-        deltaT = SU2Driver.GetUnsteady_TimeStep()
-        deltaT = min(precice_deltaT, deltaT)
-        SU2Driver.SetUnsteady_TimeStep(deltaT)
-        
-        # Time iteration preprocessing (mesh is deformed here)
-        SU2Driver.Preprocess(TimeIter)
-
-        # Run one time iteration (e.g. dual-time)
-        SU2Driver.Run()
-
-        # Postprocess the solver
-        SU2Driver.Postprocess()
-
-        # Update the solver for the next time iteration
-        SU2Driver.Update()
-
-        # Monitor the solver
-        stopCalc = SU2Driver.Monitor(TimeIter)
-
-
-        if (interface.is_write_data_required(deltaT)):
-            # Loop over the vertices
-            for i, iVertex in enumerate(iVertices_MovingMarker_PHYS):
-                # Get forces at each vertex
-                forces[i] = SU2Driver.GetFlowLoad(MovingMarkerID, iVertex)[:-1]
-
-            # Write data to preCICE
-            interface.write_block_vector_data(write_data_id, vertex_ids, forces)
-
-        # Advance preCICE
-        precice_deltaT = interface.advance(deltaT)
-
-
-        # Implicit coupling:
-        if (interface.is_action_required(precice.action_read_iteration_checkpoint())):
-            # Reload old state
-            SU2Driver.ReloadOldState()
-            time = precice_saved_time
-            TimeIter = precice_saved_iter
-            interface.mark_action_fulfilled(precice.action_read_iteration_checkpoint())
-        else: # Output and increment as usual
-            SU2Driver.Output(TimeIter)
-            if (stopCalc == True):
-                break
-            # Update control parameters
-            TimeIter += 1
-            time += deltaT
-        
-        if options.with_MPI == True:
-            comm.Barrier()
-    # Postprocess the solver and exit cleanly
-    SU2Driver.Postprocessing()
-
-    interface.finalize()
+    # Optional recording of the interface data, shared with the CHT script
+    recorder = None
+    if options.record is not None:
+        recorder = InterfaceRecorder(options.record, rank, coords, precice_read, precice_write, options.record_iterations)
+
+    # Coupling loop, shared with the CHT script
+    loop = CouplingLoop(SU2Driver, interface, options, comm if options.with_MPI == True else None, recorder)
+
+    def read_displacements():
+        # Retrieve data from preCICE
+        return read_buffer(interface.read_block_vector_data(read_data_id, vertex_ids))
+
+    # Mesh deformations skipped and warm-started, per coupling iteration
+    deformations_skipped = 0
+    deformations_warm = 0
+
+    def set_displacements(displacements):
+        nonlocal deformations_skipped, deformations_warm
+
+        # Largest change of the displacements over all ranks, to skip the mesh deformation if negligible
+        skip_deformation = False
+        if deformation_tol > 0.0:
+            displacement_change = 0.0
+            for MovingMarkerID, marker_displacements in markers.parts(displacements):
+                displacement_change = max(displacement_change, SU2Driver.GetMarkerDisplacementChange(MovingMarkerID, *buffer_args(marker_displacements)))
+            if options.with_MPI == True:
+                displacement_change = comm.allreduce(displacement_change, op=MPI.MAX)
+            skip_deformation = displacement_change < deformation_tol
+            if skip_deformation:
+                deformations_skipped += 1
+            else:
+                deformations_warm += 1
+
+        # Set the updated displacements of each whole marker at once. When skipped, the imposed displacements
+        # are kept and the deformation solve already satisfies them (no linear solver iteration).
+        if not skip_deformation:
+            markers.apply(SU2Driver.SetMarkerMeshDisplacements, displacements)
+
+    def write_forces(data=None):
+        # Get forces of each whole marker, written in place into its rows of the forces array (unless given, when resuming)
+        if data is None:
+            data = forces
+            markers.apply(SU2Driver.GetMarkerFlowLoads, data)
+
+        # Write data to preCICE
+        interface.write_block_vector_data(write_data_id, vertex_ids, data)
+        return data
+
+    def report_deformations(TimeIter, coupling_iter):
+        # Called after the mesh deformation of each coupling iteration
+        nonlocal deformations_skipped, deformations_warm
+        if deformation_tol > 0.0:
+            # Zones without mesh deformation count no iterations, the selected zone is restored
+            deformation_iterations = 0
+            selected_zone = SU2Driver.GetSelectedZone()
+            for iZone in range(options.nZone):
+                SU2Driver.SelectZone(iZone)
+                deformation_iterations += SU2Driver.GetMeshDeformationIterations()
+            SU2Driver.SelectZone(selected_zone)
+
+            if rank == 0:
+                print("Mesh deformation (time iteration " + str(TimeIter) + ", coupling iteration " + str(coupling_iter) + "): " +
+                      str(deformations_skipped) + " skipped, " + str(deformations_warm) + " warm-started, " +
+                      str(deformation_iterations) + " linear solver iterations")
+            deformations_skipped = 0
+            deformations_warm = 0
+
+    # Restore the state of a previous run, whose last forces are the initial data
+    if options.resume is not None:
+        loop.resume(options.resume)
+
+    # The warm start keeps the imposed displacements across reloads, so it only starts once a resumed state is restored
+    if deformation_tol > 0.0:
+        SU2Driver.SetMeshDeformationWarmStart(True)
+
+    # Setup preCICE dt and initial data (initialize_data returns once they are exchanged, no wait is needed)
+    loop.initialize(write_forces)
+
+    loop.run(read_displacements, set_displacements, write_forces, report_deformations)
+
+    # Write the timing of the coupling loop, release the checkpoint, postprocess the solver and exit cleanly
+    loop.finalize()
 
     if SU2Driver != None:
         del SU2Driver
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+
+## \file SU2_preCICE_buffers.py
+#  \brief Helpers to hand NumPy arrays to the bulk marker functions of the preCICE-adapted SU2 Python wrapper.
+#  \author Joseph Signorelli
+#
+# The bulk functions (GetMarkerFlowLoads, SetMarkerMeshDisplacements, GetMarkerTemperatures, ...) take the
+# address and size of a caller-owned, contiguous array of doubles. SU2 reads from or writes into that memory
+# directly, so no per-vertex SWIG call or allocation is made. The arrays must stay referenced by the caller
+# for the duration of the call.
+#
+# Several markers can be coupled through a single preCICE mesh: InterfaceMarkers concatenates their physical
+# vertices, and scatters the rows of an interface array to the bulk functions of each marker as in-place views.
+# The markers may belong to different zones of a multizone case: the marker functions of the wrapper act on the
+# zone selected with SelectZone, which InterfaceMarkers selects before handing out the rows of each marker.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import numpy
+
+# Element types matching the C++ types of the SU2 wrapper buffers
+VERTEX_DTYPE = numpy.dtype("L")         # unsigned long, vertex indices
+CONNECTIVITY_DTYPE = numpy.dtype("l")   # long, element connectivity (-1 pads triangles in 3D)
+
+# -------------------------------------------------------------------
+#  Functions
+# -------------------------------------------------------------------
+
+def buffer_args(array, dtype=numpy.float64):
+    """Return the (address, size) pair expected by the bulk SU2 marker functions for a NumPy array.
+
+    The array is used in place: it must be C-contiguous and of the given type (float64, i.e. passivedouble, by default).
+    """
+    if array.dtype != dtype:
+        raise TypeError("SU2 marker buffers must be of type " + str(numpy.dtype(dtype)) + ", got " + str(array.dtype))
+    if not array.flags["C_CONTIGUOUS"]:
+        raise ValueError("SU2 marker buffers must be C-contiguous")
+
+    address = array.__array_interface__["data"][0]
+    return address, array.size
+
+def read_buffer(array):
+    """Return a C-contiguous float64 view of data received from preCICE, copying only if required.
+
+    The result must be kept referenced by the caller while it is passed to SU2 through buffer_args.
+    """
+    return numpy.ascontiguousarray(array, dtype=numpy.float64)
+
+def get_interface_mesh(driver, marker_id, nDim):
+    """Return the physical vertex indices, their coordinates and the surface connectivity of a marker on this rank.
+
+    Connectivity rows hold positions in the vertex array: edges in 2D, triangles/quads in 3D (triangles padded with -1).
+    """
+    nVertex_PHYS, nElem, nNodes_Elem = driver.GetMarkerInterfaceSizes(marker_id)
+
+    vertices = numpy.zeros(nVertex_PHYS, dtype=VERTEX_DTYPE)
+    coords = numpy.zeros((nVertex_PHYS, nDim))
+    connectivity = numpy.zeros((nElem, nNodes_Elem), dtype=CONNECTIVITY_DTYPE)
+
+    driver.GetMarkerInterfaceMesh(marker_id, *buffer_args(vertices, VERTEX_DTYPE), *buffer_args(coords),
+                                  *buffer_args(connectivity, CONNECTIVITY_DTYPE))
+
+    return vertices, coords, connectivity
+
+def set_mesh_elements(interface, mesh_id, kind, ids):
+    """Register the edges, triangles or quads (kind) given as rows of preCICE vertex IDs.
+
+    Interfaces with the bulk calls (set_mesh_edges, set_mesh_triangles, set_mesh_quads) get one call; the preCICE v2
+    bindings only have the per-element calls (set_mesh_edge, set_mesh_triangle_with_edges, set_mesh_quad_with_edges).
+    """
+    if hasattr(interface, "set_mesh_" + kind):
+        getattr(interface, "set_mesh_" + kind)(mesh_id, ids)
+        return
+
+    for element in ids.tolist():
+        if kind == "edges":
+            interface.set_mesh_edge(mesh_id, element[0], element[1])
+        elif kind == "triangles":
+            interface.set_mesh_triangle_with_edges(mesh_id, element[0], element[1], element[2])
+        else:
+            interface.set_mesh_quad_with_edges(mesh_id, element[0], element[1], element[2], element[3])
+
+def set_mesh_connectivity(interface, mesh_id, vertex_ids, connectivity):
+    """Register the interface edges (2D) or triangles/quads (3D) with preCICE, if the mappings require them.
+
+    Each element type is registered with set_mesh_elements. Returns the number of elements registered.
+    """
+    if not interface.is_mesh_connectivity_required(mesh_id):
+        return 0
+
+    vertex_ids = numpy.asarray(vertex_ids)
+    if connectivity.shape[1] == 2:
+        elements = {"edges": connectivity}
+    else:
+        is_triangle = connectivity[:, 3] < 0
+        elements = {"triangles": connectivity[is_triangle, :3], "quads": connectivity[~is_triangle]}
+
+    for kind, positions in elements.items():
+        if len(positions) > 0:
+            set_mesh_elements(interface, mesh_id, kind, vertex_ids[positions])
+
+    return len(connectivity)
+
+def select_markers(driver, names, coupled_tags):
+    """Return the (zone, marker index) pairs on this rank of the coupled markers of all zones.
+
+    coupled_tags returns the coupled tags of the selected zone (e.g. driver.GetAllCHTMarkersTag), and the markers
+    are given zone by zone in its order. names is a comma-separated list of marker tags, matched in every zone, or
+    ALL for every coupled tag. Markers that are not coupled or not on this rank are skipped.
+    """
+    selected = [name.strip() for name in names.split(",")]
+
+    markers = []
+    for iZone in range(driver.GetnZone()):
+        driver.SelectZone(iZone)
+        allMarkerIDs = driver.GetAllBoundaryMarkers()   # All markers of the zone defined on this rank
+        markers += [(iZone, allMarkerIDs[tag]) for tag in coupled_tags()
+                    if (names == "ALL" or tag in selected) and tag in allMarkerIDs.keys()]
+    driver.SelectZone(0)
+
+    return markers
+
+# -------------------------------------------------------------------
+#  Classes
+# -------------------------------------------------------------------
+
+class InterfaceMarkers:
+    """Markers of this rank coupled through one preCICE mesh, their physical vertices concatenated in marker order.
+
+    markers holds the (zone, marker index) pairs of select_markers. The rows offsets[i]:offsets[i+1] of an
+    interface array belong to markers[i]. This scatter map is computed once, and the row slices of a C-contiguous
+    array are C-contiguous views, so each marker is read or written in place and each coupling iteration needs one
+    preCICE read and one write whatever the number of markers and zones.
+    """
+
+    def __init__(self, driver, markers, nDim):
+        self.driver = driver
+        self.markers = list(markers)
+        nNodes_Elem = 2 if nDim == 2 else 4
+
+        vertices, coords, connectivity = [], [], []
+        self.offsets = [0]
+        for iZone, marker_id in self.markers:
+            driver.SelectZone(iZone)
+            marker_vertices, marker_coords, marker_connectivity = get_interface_mesh(driver, marker_id, nDim)
+
+            # Connectivity rows hold positions in the concatenated vertex array (the -1 padding is kept)
+            marker_connectivity = marker_connectivity.reshape(-1, nNodes_Elem)
+            marker_connectivity = numpy.where(marker_connectivity >= 0, marker_connectivity + self.offsets[-1], -1)
+
+            vertices.append(marker_vertices)
+            coords.append(marker_coords)
+            connectivity.append(marker_connectivity.astype(CONNECTIVITY_DTYPE))
+            self.offsets.append(self.offsets[-1] + len(marker_vertices))
+
+        self.vertices = numpy.concatenate(vertices) if vertices else numpy.zeros(0, dtype=VERTEX_DTYPE)
+        self.coords = numpy.concatenate(coords) if coords else numpy.zeros((0, nDim))
+        self.connectivity = (numpy.concatenate(connectivity) if connectivity
+                             else numpy.zeros((0, nNodes_Elem), dtype=CONNECTIVITY_DTYPE))
+
+    def __len__(self):
+        """Number of physical vertices of all the markers."""
+        return self.offsets[-1]
+
+    def parts(self, array):
+        """Yield the (marker index, row view) pairs of an interface array, with the zone of the marker selected."""
+        for i, (iZone, marker_id) in enumerate(self.markers):
+            self.driver.SelectZone(iZone)
+            yield marker_id, array[self.offsets[i]:self.offsets[i+1]]
+
+    def apply(self, function, array):
+        """Call a bulk marker function, e.g. driver.GetMarkerFlowLoads, on the rows of each marker of an interface array."""
+        for marker_id, part in self.parts(array):
+            function(marker_id, *buffer_args(part))
@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+
+## \file SU2_preCICE_coupling.py
+#  \brief Coupling loop and helpers shared by the SU2 preCICE run scripts.
+#  \author Joseph Signorelli
+#
+# Coupling loop: CouplingLoop runs the time and coupling iterations of an SU2 participant, the scripts only
+# provide the exchange of their interface data. The ranks are synchronized by preCICE (initialize_data and
+# advance) and by the communication of SU2 itself, never by sleeps or barriers.
+#
+# Phase timing: the wall time of each phase of the coupling loop is recorded per coupling iteration on each
+# rank, and written reduced over the ranks at the end of the run.
+#
+# Inexact coupling: in an implicit coupling window, the first coupling iterations are far from the coupled
+# solution, so the flow does not need to be converged as tightly as for the accepted iterate. The inner
+# iterations of each coupling iteration are scaled with the change of the interface data between iterations.
+#
+# Coupled restarts: every few time windows, the checkpoint of each rank is written in one block to a binary
+# snapshot, with the coupling time and the last interface data. A run resumed from the snapshots reloads them
+# through a memory mapping and sends the saved interface data as its initial data.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import sys
+import os
+import csv
+import json
+from math import log
+from time import perf_counter
+import numpy
+try:
+    import precice
+except ImportError:
+    # Without preCICE, when replaying a coupling trace, the action names come from the trace module
+    import SU2_preCICE_trace as precice
+from SU2_preCICE_exchange import report_exchange_time
+
+# Phases of the coupling loop timed by PhaseTimer
+PHASES = ("SaveOldState", "Snapshot", "Read", "Predict", "Preprocess", "Run", "Postprocess", "Update", "Monitor",
+          "Write", "Advance", "Record", "ReloadOldState", "Output")
+PHASE_INDEX = {phase: iPhase for iPhase, phase in enumerate(PHASES)}
+
+# -------------------------------------------------------------------
+#  Functions
+# -------------------------------------------------------------------
+
+def interface_residual(new_data, old_data, comm=None):
+    """Return the relative change ||new - old|| / ||new|| of the interface data, over all ranks if comm is given."""
+    sums = numpy.array([numpy.sum((new_data - old_data)**2), numpy.sum(new_data**2)])
+    if comm is not None:
+        sums = comm.allreduce(sums)
+
+    if sums[1] == 0.0:
+        return 0.0 if sums[0] == 0.0 else 1.0
+    return float(numpy.sqrt(sums[0] / sums[1]))
+
+def inner_iteration_budget(residual, target, nInner_min, nInner_max):
+    """Return the inner iterations for an interface residual.
+
+    The budget rises log-linearly from nInner_min for a residual of 1 (or more) to nInner_max at the target residual.
+    The target must be at or above the limit of the preCICE relative convergence measures of the read data: an iterate
+    that preCICE can accept then has a residual at or below the target, and runs the full nInner_max.
+    """
+    if residual <= target:
+        return nInner_max
+    if residual >= 1.0:
+        return nInner_min
+
+    fraction = log(residual) / log(target)
+    return nInner_min + int(round(fraction * (nInner_max - nInner_min)))
+
+def predictor_coefficients(time, time_n, time_n1, time_n2=None):
+    """Return the coefficients of the solutions at times n, n-1 and n-2 extrapolated to a new time.
+
+    The extrapolation is linear in time, or quadratic if time_n2 is given. The time levels need not be equally spaced.
+    """
+    if time_n2 is None:
+        ratio = (time - time_n) / (time_n - time_n1)
+        return 1.0 + ratio, -ratio, 0.0
+
+    # Lagrange polynomials of the three time levels
+    return ((time - time_n1)*(time - time_n2) / ((time_n - time_n1)*(time_n - time_n2)),
+            (time - time_n)*(time - time_n2) / ((time_n1 - time_n)*(time_n1 - time_n2)),
+            (time - time_n)*(time - time_n1) / ((time_n2 - time_n)*(time_n2 - time_n1)))
+
+def write_snapshot(driver, prefix, rank, time, TimeIter, read_data, write_data):
+    """Write the checkpoint of a rank (PREFIX_RANK.ckpt) and its coupling state (PREFIX_RANK.npz).
+
+    Both files are written under temporary names and then renamed, so a run stopped while writing keeps the
+    previous snapshot; the time iteration is stored in both to detect a mismatched pair.
+    """
+    filename = prefix + "_" + str(rank)
+    driver.WriteCheckpointSnapshot(filename + ".ckpt.tmp", TimeIter)
+    numpy.savez(filename + ".tmp.npz", time=time, TimeIter=TimeIter, read=read_data, write=write_data)
+
+    os.replace(filename + ".ckpt.tmp", filename + ".ckpt")
+    os.replace(filename + ".tmp.npz", filename + ".npz")
+
+def load_snapshot(driver, prefix, rank):
+    """Restore the solver state of a rank from its snapshot, return the time, time iteration, and read and write data."""
+    filename = prefix + "_" + str(rank)
+    with numpy.load(filename + ".npz") as state:
+        time, TimeIter = float(state["time"]), int(state["TimeIter"])
+        read_data, write_data = state["read"], state["write"]
+
+    if driver.LoadCheckpointSnapshot(filename + ".ckpt") != TimeIter:
+        raise RuntimeError("The snapshot files " + filename + ".ckpt and " + filename + ".npz are not from the same time iteration")
+    driver.ReloadOldState()
+
+    return time, TimeIter, read_data, write_data
+
+# -------------------------------------------------------------------
+#  Classes
+# -------------------------------------------------------------------
+
+class WindowData:
+    """Data read from preCICE, interpolated linearly in time over the substeps of a time window (subcycling).
+
+    The data read in a window are the values at its end, and the last data read in the previous window the values at its start.
+    """
+
+    def __init__(self):
+        self.start = None
+        self.end = None
+        self.window_start = 0.0
+        self.window_size = 0.0
+
+    def begin_window(self, time, window_size):
+        """Start a new time window. Not called when a window is repeated after a checkpoint reload."""
+        self.window_start = time
+        self.window_size = window_size
+        self.start = self.end
+
+    def read(self, data):
+        """Store the data read from preCICE as the values at the end of the current window."""
+        self.end = data.copy()
+        if self.start is None:
+            self.start = self.end
+
+    def at(self, time):
+        """Return the data interpolated at a time of the current window, as a new contiguous array."""
+        fraction = 1.0
+        if self.window_size > 0.0:
+            fraction = min(max((time - self.window_start) / self.window_size, 0.0), 1.0)
+        return self.start + fraction * (self.end - self.start)
+
+class PhaseTimer:
+    """Wall time spent in each phase of the coupling loop, per coupling iteration and rank.
+
+    Each call to lap(phase) adds the time elapsed since the previous call to that phase, so the whole loop is
+    accounted for at the cost of one clock read per phase. When disabled, all methods return immediately.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.iterations = []        # (time iteration, coupling iteration) of each recorded coupling iteration
+        self.times = []             # wall time of each phase of each recorded coupling iteration
+        self.window_iterations = [] # coupling iterations of each completed time window
+        self.current = numpy.zeros(len(PHASES))
+        self.label = (0, 0)
+        self.last = perf_counter()
+
+    def begin_iteration(self, time_iter, coupling_iter):
+        """Label the coupling iteration being timed, whose first lap starts now."""
+        if self.enabled:
+            self.label = (time_iter, coupling_iter)
+            self.last = perf_counter()
+
+    def lap(self, phase):
+        """Add the time elapsed since the last lap to a phase."""
+        if self.enabled:
+            now = perf_counter()
+            self.current[PHASE_INDEX[phase]] += now - self.last
+            self.last = now
+
+    def end_iteration(self):
+        """Record the phase times of the coupling iteration."""
+        if self.enabled:
+            self.iterations.append(self.label)
+            self.times.append(self.current)
+            self.current = numpy.zeros(len(PHASES))
+
+    def end_window(self, coupling_iters):
+        """Record the number of coupling iterations of a completed time window."""
+        if self.enabled:
+            self.window_iterations.append(coupling_iters)
+
+    def write(self, prefix, comm=None):
+        """Write the phase times reduced over the ranks (min/max/mean) from rank 0.
+
+        prefix.csv holds one row per coupling iteration, prefix.json the totals per phase and the coupling
+        iterations per time window. Returns True on the rank that wrote the files.
+        """
+        if not self.enabled:
+            return False
+
+        times = numpy.array(self.times).reshape(-1, len(PHASES))
+        rank_times = comm.gather(times, root=0) if comm is not None else [times]
+        if rank_times is None:
+            return False
+        rank_times = numpy.stack(rank_times)    # ranks x coupling iterations x phases
+
+        t_min, t_max, t_mean = rank_times.min(axis=0), rank_times.max(axis=0), rank_times.mean(axis=0)
+        with open(prefix + ".csv", "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["time_iter", "coupling_iter"] +
+                            [phase + "_" + stat for phase in PHASES for stat in ("min", "max", "mean")])
+            for iRow, (time_iter, coupling_iter) in enumerate(self.iterations):
+                writer.writerow([time_iter, coupling_iter] +
+                                [value for iPhase in range(len(PHASES))
+                                 for value in (t_min[iRow, iPhase], t_max[iRow, iPhase], t_mean[iRow, iPhase])])
+
+        totals = rank_times.sum(axis=1)         # ranks x phases
+        summary = {
+            "ranks": int(rank_times.shape[0]),
+            "coupling_iterations": len(self.iterations),
+            "total": {stat: float(getattr(totals.sum(axis=1), stat)()) for stat in ("min", "max", "mean")},
+            "phases": {phase: {stat: float(getattr(totals[:, iPhase], stat)()) for stat in ("min", "max", "mean")}
+                       for iPhase, phase in enumerate(PHASES)},
+            "window_iterations": self.window_iterations,
+        }
+        with open(prefix + ".json", "w") as json_file:
+            json.dump(summary, json_file, indent=2)
+
+        return True
+
+class CouplingLoop:
+    """Coupling loop of an SU2 participant, shared by the run scripts.
+
+    The script provides the exchange of its interface data through callbacks:
+      read()                    returns the data read from preCICE, as a C-contiguous float64 array,
+      apply(data)               sets the data on the SU2 marker,
+      write()                   gets the data of the SU2 marker, writes them to preCICE and returns them,
+      after_preprocess(TimeIter, coupling_iter)
+                                optional, called after the time iteration preprocessing of each coupling iteration.
+
+    The exchange time with preCICE (reads, writes and advances) is reported over the ranks at startup, and for
+    every time window with options.exchange_report.
+
+    No rank waits for the others outside preCICE and SU2: initialize_data() returns once the initial data are
+    exchanged, advance() once the data of the coupling iteration are, and each rank saves and reloads its own
+    part of the checkpoint.
+
+    With options.predictor LINEAR or QUADRATIC, the first run of each time window starts from the solutions
+    extrapolated in time from the previous time steps, instead of the solution of the last one. The inner iterations
+    per time window are reported at the end, for the windows started with and without the predictor.
+
+    With options.snapshot, the state at the start of every options.snapshot_interval-th time window is written
+    to snapshots that resume() restores in a new run, before initialize().
+
+    An InterfaceRecorder, if given, records the data set on and written from the markers at each accepted
+    time window, and at each coupling iteration and substep if it records every iteration.
+    """
+
+    def __init__(self, driver, interface, options, comm=None, recorder=None):
+        self.driver = driver
+        self.interface = interface
+        self.options = options
+        self.comm = comm
+        self.recorder = recorder
+        self.rank = comm.Get_rank() if comm is not None else 0
+        self.timer = PhaseTimer(options.timing is not None)
+        self.precice_deltaT = 0.0
+        self.resumed = None
+        self.inner_iterations = {True: [], False: []}   # inner iterations of each time window, with and without the predictor
+
+    def resume(self, prefix):
+        """Restore the solver state and the coupling state from the snapshots of a previous run."""
+        self.resumed = load_snapshot(self.driver, prefix, self.rank)
+
+        # Snapshots of different windows (a run stopped while writing them) cannot be combined
+        TimeIter = self.resumed[1]
+        if self.comm is not None and len(set(self.comm.allgather(TimeIter))) > 1:
+            raise RuntimeError("The snapshots " + prefix + "_RANK are not from the same time iteration on all ranks")
+        if self.rank == 0:
+            print("Resumed from the snapshots " + prefix + " at time iteration " + str(TimeIter) + ", time " + str(self.resumed[0]))
+
+    def initialize(self, write_initial):
+        """Initialize preCICE and exchange the initial data if preCICE requires them.
+
+        write_initial(data) writes the given data, or the initial data of the markers if data is None. After resume(),
+        the data written last before the snapshot are given.
+        """
+        start = perf_counter()
+        self.precice_deltaT = self.interface.initialize()
+
+        if self.interface.is_action_required(precice.action_write_initial_data()):
+            write_initial(self.resumed[3] if self.resumed is not None else None)
+            self.interface.mark_action_fulfilled(precice.action_write_initial_data())
+
+        self.interface.initialize_data()
+        report_exchange_time(self.comm, "Startup", perf_counter() - start)
+
+    def run(self, read, apply, write, after_preprocess=None):
+        """Run the time loop until preCICE ends the coupling or SU2 stops the computation."""
+        driver, interface, options, comm, timer = self.driver, self.interface, self.options, self.comm, self.timer
+
+        # Retrieve some control parameters from the driver, or from the snapshots
+        deltaT = driver.GetUnsteady_TimeStep()
+        TimeIter = driver.GetTime_Iter()
+        time = TimeIter*deltaT
+        if self.resumed is not None:
+            time, TimeIter = self.resumed[0], self.resumed[1]
+        fluid_deltaT = deltaT
+        nInner_Iter = driver.GetnInner_Iter()
+
+        # Time loop is defined in Python so that we have access to SU2 functionalities at each time step
+        if self.rank == 0:
+            print("\n------------------------------ Begin Solver -----------------------------\n")
+        sys.stdout.flush()
+
+        precice_deltaT = self.precice_deltaT
+        precice_saved_time = 0
+        precice_saved_iter = 0
+        checkpoint_reported = False
+        coupling_iter = 1
+        previous_data = None
+        applied_data = None
+        written_data = None
+        window_data = WindowData()
+        new_window = True
+        nWindows = 0
+        exchange_time = 0.0
+        previous_deltaT = None      # time step of the last time step taken
+        history_time = None         # time of the solutions kept by the quadratic predictor
+        window_predicted = False
+        window_inner = 0
+        if self.resumed is not None:
+            applied_data, written_data = self.resumed[2], self.resumed[3]
+            window_data.end = applied_data
+        while (interface.is_coupling_ongoing()):
+
+            # Subcycling: the read data are interpolated from the start to the end of each new time window
+            if options.subcycling and new_window:
+                window_data.begin_window(time, precice_deltaT)
+
+            # Inexact coupling: each window starts with the full inner iterations, the reduced budget of the last
+            # coupling iteration of the previous window does not carry over
+            if options.inner_iter_min > 0 and new_window:
+                driver.SetnInner_Iter(nInner_Iter)
+
+            # Time the phases of this coupling iteration
+            timer.begin_iteration(TimeIter, coupling_iter)
+
+            # Implicit coupling
+            if (interface.is_action_required(precice.action_write_iteration_checkpoint())):
+                # Save the state
+                driver.SaveOldState()
+                if not checkpoint_reported:
+                    # Report the checkpoint size once, as the largest over all ranks
+                    checkpoint_bytes = driver.GetCheckpointBytes()
+                    if comm is not None:
+                        from mpi4py import MPI
+                        checkpoint_bytes = comm.allreduce(checkpoint_bytes, op=MPI.MAX)
+                    if self.rank == 0:
+                        print("Checkpoint storage (" + options.checkpoint_storage + "): " + str(round(checkpoint_bytes/2**20, 1)) + " MB per rank (max.)")
+                    checkpoint_reported = True
+                precice_saved_time = time
+                precice_saved_iter = TimeIter
+                # Inexact coupling: the residual is measured between the iterates of this window only
+                previous_data = None
+                interface.mark_action_fulfilled(precice.action_write_iteration_checkpoint())
+                timer.lap("SaveOldState")
+                state_saved = True
+            else:
+                state_saved = False
+
+            # Coupled restart: snapshot of the state at the start of the window, with the data written last
+            if (options.snapshot is not None and new_window and nWindows > 0 and nWindows % options.snapshot_interval == 0
+                    and written_data is not None):
+                if not state_saved:
+                    driver.SaveOldState()
+                write_snapshot(driver, options.snapshot, self.rank, time, TimeIter, applied_data, written_data)
+                timer.lap("Snapshot")
+
+            if (interface.is_read_data_available()):
+                # Retrieve data from preCICE
+                start = perf_counter()
+                data = read()
+                exchange_time += perf_counter() - start
+
+                # Inexact coupling: scale the inner iterations with the change of the interface data
+                if options.inner_iter_min > 0 and checkpoint_reported and previous_data is not None:
+                    residual = interface_residual(data, previous_data, comm)
+                    driver.SetnInner_Iter(inner_iteration_budget(residual, options.inexact_tol, options.inner_iter_min, nInner_Iter))
+                previous_data = data.copy()
+                if options.subcycling:
+                    window_data.read(data)
+                data_updated = True
+            else:
+                data_updated = False
+
+            # Update timestep based on preCICE (the SU2 time step is kept when subcycling, the last substep of a window may be shorter)
+            if options.subcycling:
+                deltaT = min(precice_deltaT, fluid_deltaT)
+            else:
+                deltaT = driver.GetUnsteady_TimeStep()
+                deltaT = min(precice_deltaT, deltaT)
+            driver.SetUnsteady_TimeStep(deltaT)
+
+            # Subcycling: data at the end of this substep
+            if options.subcycling and window_data.end is not None:
+                data = window_data.at(time + deltaT)
+                data_updated = True
+
+            # Set the updated data of the whole marker at once
+            if data_updated:
+                apply(data)
+                applied_data = data
+            timer.lap("Read")
+
+            # Time predictor: the first run of a new window starts from the solutions extrapolated in time, the mesh
+            # deformation from the extrapolated displacements (the history of the first time step is not known)
+            if new_window:
+                window_predicted = (options.predictor in ("LINEAR", "QUADRATIC") and previous_deltaT is not None)
+                if window_predicted:
+                    coefficients = predictor_coefficients(time + deltaT, time, time - previous_deltaT, history_time)
+                    driver.PredictSolution(*coefficients, options.predictor == "QUADRATIC")
+                    history_time = time - previous_deltaT if options.predictor == "QUADRATIC" else None
+            timer.lap("Predict")
+
+            # Time iteration preprocessing (the mesh is deformed here)
+            driver.Preprocess(TimeIter)
+            if after_preprocess is not None:
+                after_preprocess(TimeIter, coupling_iter)
+            timer.lap("Preprocess")
+
+            # Run one time iteration (e.g. dual-time)
+            driver.Run()
+            window_inner += driver.GetInner_Iter() + 1
+            if checkpoint_reported and self.rank == 0:
+                # Implicit coupling: log the inner iterations of each coupling iteration
+                print("Time iteration " + str(TimeIter) + ", coupling iteration " + str(coupling_iter) + ": " + str(driver.GetInner_Iter() + 1) + " inner iterations")
+            timer.lap("Run")
+
+            # Postprocess the solver (the multizone driver has no separate postprocessing step)
+            if options.nZone == 1:
+                driver.Postprocess()
+            timer.lap("Postprocess")
+
+            # Update the solver for the next time iteration
+            driver.Update()
+            timer.lap("Update")
+
+            # Monitor the solver
+            stopCalc = driver.Monitor(TimeIter)
+            timer.lap("Monitor")
+
+            # Write data to preCICE and advance preCICE
+            start = perf_counter()
+            if (interface.is_write_data_required(deltaT)):
+                written_data = write()
+            timer.lap("Write")
+
+            precice_deltaT = interface.advance(deltaT)
+            new_window = interface.is_time_window_complete()
+            exchange_time += perf_counter() - start
+            timer.lap("Advance")
+
+            # Record the interface data of this iteration (accepted at the end of a time window)
+            if self.recorder is not None and applied_data is not None and written_data is not None:
+                self.recorder.record(time + deltaT, TimeIter, coupling_iter, new_window, applied_data, written_data)
+                timer.lap("Record")
+
+            # Implicit coupling:
+            if (interface.is_action_required(precice.action_read_iteration_checkpoint())):
+                # Reload old state
+                driver.ReloadOldState(options.reload_mode == "WARM")
+                time = precice_saved_time
+                TimeIter = precice_saved_iter
+                coupling_iter += 1
+                interface.mark_action_fulfilled(precice.action_read_iteration_checkpoint())
+                timer.lap("ReloadOldState")
+            else: # Output and increment as usual
+                driver.Output(TimeIter)
+                timer.lap("Output")
+                if new_window:
+                    timer.end_window(coupling_iter)
+                    self.inner_iterations[window_predicted].append(window_inner)
+                    window_inner = 0
+                    coupling_iter = 1
+                    nWindows += 1
+                    if options.exchange_report:
+                        report_exchange_time(comm, "Time window " + str(nWindows), exchange_time)
+                    exchange_time = 0.0
+                if (stopCalc == True):
+                    timer.end_iteration()
+                    break
+                # Update control parameters
+                TimeIter += 1
+                time += deltaT
+                previous_deltaT = deltaT
+
+            timer.end_iteration()
+
+    def finalize(self):
+        """Write the timing of the coupling loop and the recorded data, release the checkpoint, postprocess the solver and finalize preCICE."""
+        if self.options.timing is not None and self.timer.write(self.options.timing, self.comm):
+            print("Coupling loop timing written to " + self.options.timing + ".csv and " + self.options.timing + ".json")
+
+        if self.recorder is not None:
+            records = self.recorder.close()
+            if self.rank == 0:
+                print(str(records) + " interface data records written to " + self.recorder.filename + ".dat (rank 0)")
+
+        # Inner iterations per time window, to measure the effect of the time predictor
+        if self.rank == 0:
+            for predicted, label in ((True, "with"), (False, "without")):
+                windows = self.inner_iterations[predicted]
+                if windows:
+                    print("Inner iterations per time window " + label + " the predictor: " + str(round(numpy.mean(windows), 1)) +
+                          " (" + str(len(windows)) + " windows)")
+
+        self.driver.ReleaseOldState()
+        self.driver.Postprocessing()
+        self.interface.finalize()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+
+## \file SU2_preCICE_exchange.py
+#  \brief Interface load-balance diagnostics and aggregation of the preCICE exchange on a subset of the ranks.
+#  \author Joseph Signorelli
+#
+# The partitioner of SU2 ignores the coupled markers, so a few ranks may own most of the interface vertices
+# while most ranks own none. The reports below give the interface vertices of the ranks at startup and the
+# time each rank spends exchanging data with preCICE.
+#
+# With AggregatedInterface, the ranks are split into groups and only one rank per group (the exchange rank)
+# talks to preCICE, on behalf of its group: fewer ranks take part in the preCICE communication and mapping,
+# and the exchange rank of each group is the one with the fewest interface vertices of its own.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import numpy
+try:
+    import precice
+except ImportError:
+    # precice.Interface is not needed to replay a coupling trace
+    import SU2_preCICE_trace as precice
+from SU2_preCICE_buffers import set_mesh_elements
+
+# -------------------------------------------------------------------
+#  Functions
+# -------------------------------------------------------------------
+
+def report_interface_vertices(comm, nVertex, interface=None):
+    """Print on rank 0 the physical interface vertices per rank, and per exchange rank for an AggregatedInterface."""
+    counts = numpy.array(comm.gather(nVertex, root=0) if comm is not None else [nVertex])
+    exchange_counts = None
+    if hasattr(interface, "nVertex_exchange"):    # AggregatedInterface, possibly traced
+        exchange_counts = comm.gather(interface.nVertex_exchange if interface.is_exchange else None, root=0)
+    if comm is not None and comm.Get_rank() != 0:
+        return
+
+    mean = counts.mean()
+    print("Interface vertices: " + str(counts.sum()) + " on " + str(len(counts)) + " ranks, min/mean/max per rank " +
+          str(counts.min()) + "/" + str(round(mean, 1)) + "/" + str(counts.max()) +
+          " (max/mean " + (str(round(counts.max()/mean, 2)) if mean > 0 else "-") + "), " +
+          str(int((counts == 0).sum())) + " ranks without interface vertices")
+    largest = numpy.argsort(-counts, kind="stable")[:min(3, len(counts))]
+    print("Ranks with the most interface vertices: " + ", ".join(str(r) + " (" + str(counts[r]) + ")" for r in largest))
+
+    if exchange_counts is not None:
+        exchange_counts = {r: n for r, n in enumerate(exchange_counts) if n is not None}
+        print("preCICE exchange aggregated on " + str(len(exchange_counts)) + " ranks, max " +
+              str(max(exchange_counts.values())) + " interface vertices per exchange rank")
+
+def report_exchange_time(comm, label, seconds):
+    """Print on rank 0 the min/mean/max over the ranks of a time spent exchanging data, and the slowest rank."""
+    times = numpy.array(comm.gather(seconds, root=0) if comm is not None else [seconds])
+    if comm is not None and comm.Get_rank() != 0:
+        return
+
+    print(label + " exchange time [s]: min/mean/max " + "{:.4g}/{:.4g}/{:.4g}".format(times.min(), times.mean(), times.max()) +
+          " (slowest rank " + str(int(times.argmax())) + ")")
+
+def create_interface(participant, config, comm, nExchange, nVertex):
+    """Return the preCICE interface of this rank, aggregated on nExchange ranks if 0 < nExchange < number of ranks."""
+    if comm is None:
+        return precice.Interface(participant, config, 0, 1)
+    if nExchange <= 0 or nExchange >= comm.Get_size():
+        return precice.Interface(participant, config, comm.Get_rank(), comm.Get_size())
+    return AggregatedInterface(participant, config, comm, nExchange, nVertex)
+
+# -------------------------------------------------------------------
+#  Classes
+# -------------------------------------------------------------------
+
+class AggregatedInterface:
+    """preCICE interface of a rank, with the exchange aggregated on a subset of the ranks.
+
+    The ranks are split into nExchange groups of consecutive ranks. The exchange rank of each group creates the
+    preCICE interface on a communicator of the exchange ranks only, gathers the vertices, connectivity and write
+    data of its group, and scatters the read data back. The coupling state returned by preCICE (time step limit,
+    coupling status, required actions) is broadcast to the group once per call that changes it.
+
+    Provides the calls of precice.Interface made by the run scripts and CouplingLoop. The vertex IDs returned to
+    the ranks are their local vertex positions, the preCICE IDs are only known to the exchange ranks.
+    """
+
+    def __init__(self, participant, config, comm, nExchange, nVertex):
+        from mpi4py import MPI
+
+        rank, size = comm.Get_rank(), comm.Get_size()
+        self.group = comm.Split(rank * nExchange // size, rank)
+        self.counts = numpy.array(self.group.allgather(nVertex))
+        self.offsets = numpy.concatenate([[0], numpy.cumsum(self.counts)])
+        self.nVertex = nVertex
+        self.nVertex_exchange = int(self.counts.sum())
+
+        # The exchange rank of the group is the one with the fewest vertices of its own (the first one on ties)
+        self.root = int(numpy.argmin(self.counts))
+        self.is_exchange = (self.group.Get_rank() == self.root)
+        self.exchange = comm.Split(0 if self.is_exchange else MPI.UNDEFINED, rank)
+
+        self.interface = None
+        if self.is_exchange:
+            self.interface = precice.Interface(participant, config, self.exchange.Get_rank(), self.exchange.Get_size(), self.exchange)
+
+        self.actions = (precice.action_write_initial_data(), precice.action_write_iteration_checkpoint(),
+                        precice.action_read_iteration_checkpoint())
+        self.state = {"ongoing": True, "read_available": False, "window_complete": False, "actions": {}}
+        self.vertex_ids = None
+        self.elements = []
+
+    def _bcast(self, value):
+        """Broadcast a value of the exchange rank to its group."""
+        return self.group.bcast(value, root=self.root)
+
+    def _sync(self, value=None):
+        """Broadcast a value returned by preCICE with the coupling state to the group, and return the value."""
+        state = None
+        if self.is_exchange:
+            state = {"ongoing": self.interface.is_coupling_ongoing(),
+                     "read_available": self.interface.is_read_data_available(),
+                     "window_complete": self.interface.is_time_window_complete(),
+                     "actions": {action: self.interface.is_action_required(action) for action in self.actions}}
+        value, self.state = self._bcast((value, state))
+        return value
+
+    def _gather(self, array, shape):
+        """Gather the rows of an array of the ranks of the group on the exchange rank (None on the other ranks)."""
+        cols = int(numpy.prod(shape))
+        send = numpy.ascontiguousarray(array, dtype=numpy.float64).ravel()
+        if not self.is_exchange:
+            self.group.Gatherv(send, None, root=self.root)
+            return None
+
+        gathered = numpy.empty((self.nVertex_exchange,) + tuple(shape))
+        self.group.Gatherv(send, [gathered, (self.counts * cols).tolist()], root=self.root)
+        return gathered
+
+    def _scatter(self, array, shape):
+        """Scatter the rows of an array of the exchange rank to the ranks of the group."""
+        cols = int(numpy.prod(shape))
+        local = numpy.empty((self.nVertex,) + tuple(shape))
+        send = None
+        if self.is_exchange:
+            send = [numpy.ascontiguousarray(array, dtype=numpy.float64), (self.counts * cols).tolist()]
+        self.group.Scatterv(send, local, root=self.root)
+        return local
+
+    # Configuration
+
+    def get_dimensions(self):
+        self.nDim = self._bcast(self.interface.get_dimensions() if self.is_exchange else None)
+        return self.nDim
+
+    def get_mesh_id(self, mesh_name):
+        return self._bcast(self.interface.get_mesh_id(mesh_name) if self.is_exchange else None)
+
+    def get_data_id(self, data_name, mesh_id):
+        return self._bcast(self.interface.get_data_id(data_name, mesh_id) if self.is_exchange else None)
+
+    def set_mesh_vertices(self, mesh_id, positions):
+        gathered = self._gather(positions, (self.nDim,))
+        if self.is_exchange:
+            self.vertex_ids = numpy.asarray(self.interface.set_mesh_vertices(mesh_id, gathered))
+        return numpy.arange(self.nVertex)
+
+    def is_mesh_connectivity_required(self, mesh_id):
+        return self._bcast(self.interface.is_mesh_connectivity_required(mesh_id) if self.is_exchange else None)
+
+    # Elements are given in local vertex positions, and registered by the exchange rank at initialization, with the
+    # bulk or per-element calls of the preCICE bindings
+
+    def set_mesh_edges(self, mesh_id, vertices):
+        self.elements.append((mesh_id, "edges", numpy.asarray(vertices)))
+
+    def set_mesh_triangles(self, mesh_id, vertices):
+        self.elements.append((mesh_id, "triangles", numpy.asarray(vertices)))
+
+    def set_mesh_quads(self, mesh_id, vertices):
+        self.elements.append((mesh_id, "quads", numpy.asarray(vertices)))
+
+    def _set_elements(self):
+        """Register the elements of the group with preCICE, in preCICE vertex IDs, with set_mesh_elements per mesh and type."""
+        group_elements = self.group.gather(self.elements, root=self.root)
+        self.elements = []
+        if not self.is_exchange:
+            return
+
+        blocks = {}
+        for iRank, elements in enumerate(group_elements):
+            for mesh_id, kind, positions in elements:
+                blocks.setdefault((mesh_id, kind), []).append(self.vertex_ids[self.offsets[iRank] + positions])
+
+        for (mesh_id, kind), ids in blocks.items():
+            set_mesh_elements(self.interface, mesh_id, kind, numpy.concatenate(ids))
+
+    # Coupling
+
+    def initialize(self):
+        self._set_elements()
+        return self._sync(self.interface.initialize() if self.is_exchange else None)
+
+    def initialize_data(self):
+        if self.is_exchange:
+            self.interface.initialize_data()
+        self._sync()
+
+    def is_action_required(self, action):
+        return self.state["actions"].get(action, False)
+
+    def mark_action_fulfilled(self, action):
+        if self.is_exchange:
+            self.interface.mark_action_fulfilled(action)
+        self.state["actions"][action] = False
+
+    def is_coupling_ongoing(self):
+        return self.state["ongoing"]
+
+    def is_read_data_available(self):
+        return self.state["read_available"]
+
+    def is_time_window_complete(self):
+        return self.state["window_complete"]
+
+    def is_write_data_required(self, computed_timestep_length):
+        return self._bcast(self.interface.is_write_data_required(computed_timestep_length) if self.is_exchange else None)
+
+    def read_block_vector_data(self, data_id, vertex_ids):
+        values = self.interface.read_block_vector_data(data_id, self.vertex_ids) if self.is_exchange else None
+        return self._scatter(values, (self.nDim,))
+
+    def read_block_scalar_data(self, data_id, vertex_ids):
+        values = self.interface.read_block_scalar_data(data_id, self.vertex_ids) if self.is_exchange else None
+        return self._scatter(values, ())
+
+    def write_block_vector_data(self, data_id, vertex_ids, values):
+        gathered = self._gather(values, (self.nDim,))
+        if self.is_exchange:
+            self.interface.write_block_vector_data(data_id, self.vertex_ids, gathered)
+
+    def write_block_scalar_data(self, data_id, vertex_ids, values):
+        gathered = self._gather(values, ())
+        if self.is_exchange:
+            self.interface.write_block_scalar_data(data_id, self.vertex_ids, gathered)
+
+    def advance(self, computed_timestep_length):
+        return self._sync(self.interface.advance(computed_timestep_length) if self.is_exchange else None)
+
+    def finalize(self):
+        if self.is_exchange:
+            self.interface.finalize()
+            self.exchange.Free()
+        self.group.Free()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+
+## \file SU2_preCICE_recorder.py
+#  \brief Streaming recorder of the interface data exchanged by the SU2 preCICE run scripts.
+#  \author Joseph Signorelli
+#
+# InterfaceRecorder snapshots the data set on and read from the coupled markers at each accepted time window
+# (optionally at each coupling iteration and substep) and appends them to a per-rank binary file from a
+# background thread, so the coupling loop only pays for a copy of the arrays. Each rank writes:
+#   PREFIX_RANK.json     layout of the records (queued with the first record),
+#   PREFIX_RANK.npy      coordinates of the interface vertices of the rank,
+#   PREFIX_RANK.dat      fixed-size float64 records: time, TimeIter, coupling_iter, accepted, read data, write data.
+# load_recording() maps the records back into NumPy arrays without reading the whole file.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import json
+import queue
+import threading
+import numpy
+
+# Fields at the start of each record
+RECORD_FIELDS = ("time", "TimeIter", "coupling_iter", "accepted")
+
+# Records written to disk per chunk, at most
+CHUNK_RECORDS = 64
+
+# -------------------------------------------------------------------
+#  Functions
+# -------------------------------------------------------------------
+
+def load_recording(prefix, rank=0):
+    """Return the recording of a rank as a dict of arrays: coords, the record fields, and the read and write data.
+
+    The data arrays are views of a read-only memory map of the record file, indexed by record first.
+    """
+    filename = prefix + "_" + str(rank)
+    with open(filename + ".json") as json_file:
+        layout = json.load(json_file)
+
+    read_size = int(numpy.prod(layout["read_shape"]))
+    write_size = int(numpy.prod(layout["write_shape"]))
+    records = numpy.memmap(filename + ".dat", dtype=numpy.float64, mode="r")
+    records = records.reshape(-1, len(RECORD_FIELDS) + read_size + write_size)
+
+    recording = {"coords": numpy.load(filename + ".npy"), "read_name": layout["read"], "write_name": layout["write"]}
+    for iField, field in enumerate(RECORD_FIELDS):
+        recording[field] = records[:, iField]
+    start = len(RECORD_FIELDS)
+    recording["read"] = records[:, start:start + read_size].reshape([-1] + layout["read_shape"])
+    recording["write"] = records[:, start + read_size:].reshape([-1] + layout["write_shape"])
+
+    return recording
+
+# -------------------------------------------------------------------
+#  Classes
+# -------------------------------------------------------------------
+
+class InterfaceRecorder:
+    """Per-rank recorder of the interface data, streamed to disk by a background thread.
+
+    record() copies the arrays into a queue and returns; the writer thread writes the layout queued with the first
+    record, and appends the queued records in chunks of up to CHUNK_RECORDS. close() waits for all records to be written.
+    """
+
+    def __init__(self, prefix, rank, coords, read_name, write_name, every_iteration=False):
+        self.filename = prefix + "_" + str(rank)
+        self.read_name = read_name
+        self.write_name = write_name
+        self.every_iteration = every_iteration
+        self.layout_queued = False
+        self.records = 0
+
+        numpy.save(self.filename + ".npy", coords)
+        self.file = open(self.filename + ".dat", "wb")
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self._write_records, daemon=True)
+        self.writer.start()
+
+    def record(self, time, TimeIter, coupling_iter, accepted, read_data, write_data):
+        """Queue a snapshot of the interface data; iterates that are not accepted are only kept with every_iteration."""
+        if not (accepted or self.every_iteration):
+            return
+
+        # The layout is a dict in the queue, written by the writer thread like the records
+        if not self.layout_queued:
+            self.queue.put({"read": self.read_name, "read_shape": list(read_data.shape),
+                            "write": self.write_name, "write_shape": list(write_data.shape), "fields": RECORD_FIELDS})
+            self.layout_queued = True
+
+        # The arrays are reused by the coupling loop, so the record is a copy
+        self.queue.put(numpy.concatenate([[time, TimeIter, coupling_iter, float(accepted)],
+                                          numpy.ravel(read_data), numpy.ravel(write_data)]))
+        self.records += 1
+
+    def _write_records(self):
+        """Write the queued layout and append the queued records to the file until close() queues None."""
+        while True:
+            chunk = [self.queue.get()]
+            while isinstance(chunk[-1], numpy.ndarray) and len(chunk) < CHUNK_RECORDS and not self.queue.empty():
+                chunk.append(self.queue.get())
+
+            # A chunk of records ends at the layout or at None
+            last = chunk[-1]
+            if not isinstance(last, numpy.ndarray):
+                chunk.pop()
+            if chunk:
+                self.file.write(numpy.concatenate(chunk).tobytes())
+                self.file.flush()
+            if isinstance(last, dict):
+                with open(self.filename + ".json", "w") as json_file:
+                    json.dump(last, json_file, indent=2)
+            elif last is None:
+                return
+
+    def close(self):
+        """Write the remaining records and close the file. Returns the number of records."""
+        self.queue.put(None)
+        self.writer.join()
+        self.file.close()
+        return self.records
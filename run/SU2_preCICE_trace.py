@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+## \file SU2_preCICE_trace.py
+#  \brief Record and replay of the preCICE inputs of the SU2 preCICE run scripts, to run SU2 without the partner.
+#  \author Joseph Signorelli
+#
+# The coupling loop only depends on preCICE through the values its calls return: the read data, the time window
+# sizes, the required actions (checkpoints) and the coupling status (convergence, end of the windows).
+# TracingInterface records these values, in call order, to a compact per-rank binary trace PREFIX_RANK.trace:
+#   8 bytes     TRACE_ID,
+#   per call    uint8 call, uint8 argument (action), then a float64 value, or a uint64 size and float64 values.
+# ReplayInterface serves them back to the same script, with the same options and mesh partition, so SU2 follows the
+# coupling history of the recorded run with no partner solver or preCICE present.
+#
+# Without preCICE installed, this module stands in for it in the run scripts: it provides the action names.
+
+# ----------------------------------------------------------------------
+#  Imports
+# ----------------------------------------------------------------------
+
+import struct
+import numpy
+
+TRACE_ID = b"SU2PTRC1"
+
+# Calls whose return values are recorded, in the order of their codes
+CALLS = ("get_dimensions", "is_mesh_connectivity_required", "initialize", "is_action_required", "is_coupling_ongoing",
+         "is_read_data_available", "is_time_window_complete", "is_write_data_required", "advance",
+         "read_block_vector_data", "read_block_scalar_data")
+
+RECORD = struct.Struct("<BBd")      # call, argument, value
+ARRAY = struct.Struct("<BBQ")       # call, argument, number of values that follow
+
+# -------------------------------------------------------------------
+#  Actions
+# -------------------------------------------------------------------
+
+# Names of the actions of the preCICE v2 bindings
+def action_write_initial_data():
+    return "write-initial-data"
+
+def action_write_iteration_checkpoint():
+    return "write-iteration-checkpoint"
+
+def action_read_iteration_checkpoint():
+    return "read-iteration-checkpoint"
+
+ACTIONS = (action_write_initial_data(), action_write_iteration_checkpoint(), action_read_iteration_checkpoint())
+
+# -------------------------------------------------------------------
+#  Classes
+# -------------------------------------------------------------------
+
+class TracingInterface:
+    """preCICE interface that records the values returned by the wrapped interface to the trace of a rank.
+
+    Calls that return nothing the coupling loop depends on (mesh setup, writes, fulfilled actions) are passed on
+    unrecorded.
+    """
+
+    def __init__(self, interface, prefix, rank):
+        self.interface = interface
+        self.file = open(prefix + "_" + str(rank) + ".trace", "wb")
+        self.file.write(TRACE_ID)
+
+    def __getattr__(self, name):
+        return getattr(self.interface, name)
+
+    def _record(self, call, value, argument=0):
+        self.file.write(RECORD.pack(CALLS.index(call), argument, float(value)))
+        return value
+
+    def _record_array(self, call, values):
+        values = numpy.asarray(values, dtype=numpy.float64)
+        self.file.write(ARRAY.pack(CALLS.index(call), 0, values.size))
+        self.file.write(values.tobytes())
+        return values
+
+    def get_dimensions(self):
+        return self._record("get_dimensions", self.interface.get_dimensions())
+
+    def is_mesh_connectivity_required(self, mesh_id):
+        return self._record("is_mesh_connectivity_required", self.interface.is_mesh_connectivity_required(mesh_id))
+
+    def initialize(self):
+        return self._record("initialize", self.interface.initialize())
+
+    def is_action_required(self, action):
+        return self._record("is_action_required", self.interface.is_action_required(action), ACTIONS.index(action))
+
+    def is_coupling_ongoing(self):
+        return self._record("is_coupling_ongoing", self.interface.is_coupling_ongoing())
+
+    def is_read_data_available(self):
+        return self._record("is_read_data_available", self.interface.is_read_data_available())
+
+    def is_time_window_complete(self):
+        return self._record("is_time_window_complete", self.interface.is_time_window_complete())
+
+    def is_write_data_required(self, computed_timestep_length):
+        return self._record("is_write_data_required", self.interface.is_write_data_required(computed_timestep_length))
+
+    def advance(self, computed_timestep_length):
+        return self._record("advance", self.interface.advance(computed_timestep_length))
+
+    def read_block_vector_data(self, data_id, vertex_ids):
+        return self._record_array("read_block_vector_data", self.interface.read_block_vector_data(data_id, vertex_ids))
+
+    def read_block_scalar_data(self, data_id, vertex_ids):
+        return self._record_array("read_block_scalar_data", self.interface.read_block_scalar_data(data_id, vertex_ids))
+
+    def finalize(self):
+        self.file.close()
+        self.interface.finalize()
+
+class ReplayInterface:
+    """preCICE interface that returns the values recorded in the trace of a rank, in the order they were recorded.
+
+    A call that does not match the next record (different options, mesh partition or number of vertices than the
+    recorded run) raises a RuntimeError.
+    """
+
+    def __init__(self, prefix, rank):
+        self.filename = prefix + "_" + str(rank) + ".trace"
+        with open(self.filename, "rb") as trace_file:
+            self.trace = trace_file.read()
+        if not self.trace.startswith(TRACE_ID):
+            raise RuntimeError(self.filename + " is not a coupling trace")
+        self.position = len(TRACE_ID)
+        self.nDim = None
+
+    def _next(self, call, argument=0, record=RECORD):
+        """Return the value (or the number of values) of the next record, which must be of the given call."""
+        if self.position + record.size > len(self.trace):
+            raise RuntimeError("The coupling trace " + self.filename + " ended before the call " + call)
+        code, recorded_argument, value = record.unpack_from(self.trace, self.position)
+        if code != CALLS.index(call) or recorded_argument != argument:
+            raise RuntimeError("The call " + call + " does not match the coupling trace " + self.filename + ", which has " +
+                               CALLS[code] + " next: replay with the options and mesh partition of the recorded run")
+        self.position += record.size
+        return value
+
+    def _next_array(self, call, nVertex, shape):
+        size = self._next(call, record=ARRAY)
+        if size != nVertex * int(numpy.prod(shape)):
+            raise RuntimeError("The " + call + " record of the coupling trace " + self.filename + " does not match the interface vertices of this rank")
+        # A writable copy, as preCICE returns
+        values = numpy.frombuffer(self.trace, dtype=numpy.float64, count=size, offset=self.position).copy()
+        self.position += 8 * size
+        return values.reshape((nVertex,) + tuple(shape))
+
+    # Configuration
+
+    def get_dimensions(self):
+        self.nDim = int(self._next("get_dimensions"))
+        return self.nDim
+
+    def get_mesh_id(self, mesh_name):
+        return 0
+
+    def get_data_id(self, data_name, mesh_id):
+        return data_name
+
+    def set_mesh_vertices(self, mesh_id, positions):
+        return numpy.arange(len(positions))
+
+    def is_mesh_connectivity_required(self, mesh_id):
+        return bool(self._next("is_mesh_connectivity_required"))
+
+    def set_mesh_edge(self, mesh_id, first, second):
+        return 0
+
+    def set_mesh_triangle_with_edges(self, mesh_id, first, second, third):
+        pass
+
+    def set_mesh_quad_with_edges(self, mesh_id, first, second, third, fourth):
+        pass
+
+    # Coupling
+
+    def initialize(self):
+        return self._next("initialize")
+
+    def initialize_data(self):
+        pass
+
+    def is_action_required(self, action):
+        return bool(self._next("is_action_required", ACTIONS.index(action)))
+
+    def mark_action_fulfilled(self, action):
+        pass
+
+    def is_coupling_ongoing(self):
+        return bool(self._next("is_coupling_ongoing"))
+
+    def is_read_data_available(self):
+        return bool(self._next("is_read_data_available"))
+
+    def is_time_window_complete(self):
+        return bool(self._next("is_time_window_complete"))
+
+    def is_write_data_required(self, computed_timestep_length):
+        return bool(self._next("is_write_data_required"))
+
+    def read_block_vector_data(self, data_id, vertex_ids):
+        return self._next_array("read_block_vector_data", len(vertex_ids), (self.nDim,))
+
+    def read_block_scalar_data(self, data_id, vertex_ids):
+        return self._next_array("read_block_scalar_data", len(vertex_ids), ())
+
+    def write_block_vector_data(self, data_id, vertex_ids, values):
+        pass
+
+    def write_block_scalar_data(self, data_id, vertex_ids, values):
+        pass
+
+    def advance(self, computed_timestep_length):
+        return self._next("advance")
+
+    def finalize(self):
+        if self.position < len(self.trace):
+            print("Warning: the replay ended before the end of the coupling trace " + self.filename)